@@ -0,0 +1,85 @@
+"""
+Throughput of the thread-pool crawl engine against the Scrapy engine.
+
+Crawls the same site with both engines over HTTP, running the same page
+checks, and reports pages per second, downloads, browser renders and wall
+time. Pages that need JavaScript are rendered in a pooled browser by both.
+Both obey robots.txt; ``--rate`` caps requests per second per host for both
+(the thread engine's ``HostThrottle`` rate, Scrapy's ``DOWNLOAD_DELAY``) and
+defaults to no fixed cap, leaving each engine's adaptive throttling in charge.
+
+    python benchmarks/engines.py https://www.alojamiento.io/ --max-links 200 --max-workers 10
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+from selenium import webdriver
+
+from src.crawler import CrawlEngine, get_checks
+from src.driver_pool import DriverPool
+from src.throttle import HostThrottle
+# Importing the test modules registers their page checks with the crawl engine
+from src.tests import test_h1, test_html_tags, test_images, test_urls  # noqa: F401
+
+ENGINES = ('threads', 'scrapy')
+
+
+def run(engine_name, url, checks, max_workers, max_depth, max_links, rate=None):
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless")
+    # Browsers are launched only for pages that need rendering
+    pool = DriverPool(options, size=max_workers)
+    common = dict(max_workers=max_workers, max_depth=max_depth, max_links=max_links, keep_results=False)
+    if engine_name == 'scrapy':
+        from src.scrapy_engine import ScrapyEngine
+        engine = ScrapyEngine(url, get_checks(checks), pool, settings={'DOWNLOAD_DELAY': 1 / rate if rate else 0}, **common)
+    else:
+        throttle = HostThrottle(rate=rate, max_concurrency=max_workers)
+        engine = CrawlEngine(url, get_checks(checks), pool, fetch_mode='http', measure_savings=False, throttle=throttle, **common)
+    results = []
+    engine.on_result = lambda *row: results.append(row)
+    started = time.perf_counter()
+    try:
+        engine.run()
+    finally:
+        pool.close()
+    wall_time = time.perf_counter() - started
+    return {
+        'engine': engine_name,
+        'pages': engine.stats['pages'],
+        'results': len(results),
+        'downloads': engine.stats['http_fetches'],
+        'browser_renders': engine.stats['navigations'],
+        'browsers_launched': pool.launched,
+        'wall_time_s': wall_time,
+        'pages_per_s': engine.stats['pages'] / wall_time if wall_time else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the thread-pool and Scrapy crawl engines")
+    parser.add_argument('url', help="Start page")
+    parser.add_argument('--max-links', type=int, default=200)
+    parser.add_argument('--max-depth', type=int, default=5)
+    parser.add_argument('--max-workers', type=int, default=10)
+    parser.add_argument('--rate', type=float, help="Requests per second per host, no fixed cap if omitted")
+    parser.add_argument('--checks', nargs='+', help="Check names to run, all if omitted")
+    parser.add_argument('--engines', nargs='+', default=list(ENGINES), choices=ENGINES)
+    parser.add_argument('--json', help="Also write the measurements to this JSON file")
+    args = parser.parse_args()
+
+    report = [run(name, args.url, args.checks, args.max_workers, args.max_depth, args.max_links, args.rate) for name in args.engines]
+    print(pd.DataFrame(report).to_string(index=False, float_format=lambda value: f"{value:,.4g}"))
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump({'url': args.url, 'max_links': args.max_links, 'results': report}, handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
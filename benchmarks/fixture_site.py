@@ -0,0 +1,274 @@
+"""
+Synthetic vacation-rental site for offline benchmarks.
+
+Generates static pages shaped like alojamiento.io and serves them from a local
+HTTP server, so crawl performance can be measured without touching the live
+site:
+
+- a home page and paginated listing pages linking to the properties
+- property pages with ``window.ScriptData``, a ``#js-currency-sort-footer``
+  dropdown whose options update the ``div.price`` from JavaScript, header
+  sequences (some skipping a level), images with and without alt text, and
+  links to similar properties
+- broken links and missing images (404s) on a share of the pages
+
+The same ``seed`` always produces the same site.
+
+    python benchmarks/fixture_site.py --properties 500 --serve --port 8000
+"""
+import argparse
+import functools
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+CITIES = ('Barcelona', 'Madrid', 'Valencia', 'Sevilla', 'Malaga', 'Bilbao', 'Granada', 'Alicante')
+KINDS = ('Apartamento', 'Casa', 'Villa', 'Estudio', 'Loft', 'Atico')
+
+# code, symbol, country, rate against EUR
+CURRENCIES = (
+    ('EUR', '€', 'ES', 1.0), ('USD', '$', 'US', 1.08), ('GBP', '£', 'GB', 0.85), ('CHF', 'CHF', 'CH', 0.95),
+    ('JPY', '¥', 'JP', 162.0), ('MXN', 'MX$', 'MX', 19.6), ('BRL', 'R$', 'BR', 5.9), ('SEK', 'kr', 'SE', 11.4),
+)
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<script>window.ScriptData = {script_data};</script>
+</head>
+<body>
+<nav><a href="/">Inicio</a> {nav}</nav>
+{body}
+{currency}
+<footer><a href="/">Fixture Rentals</a> <a href="/about/">Sobre nosotros</a></footer>
+</body>
+</html>
+"""
+
+# Prices change a moment after the click, as they do when a site fetches rates
+CURRENCY_TEMPLATE = """<div id="js-currency-sort-footer" class="currency-dropdown">
+<span class="selected">EUR</span>
+<ul class="select-ul" style="display:none">{options}</ul>
+</div>
+<script>
+(function () {{
+    var rates = {rates}, base = {base_price};
+    var dropdown = document.getElementById('js-currency-sort-footer');
+    var list = dropdown.querySelector('.select-ul');
+    dropdown.addEventListener('click', function (event) {{
+        var option = event.target.closest('li');
+        if (!option) {{
+            list.style.display = list.style.display === 'none' ? 'block' : 'none';
+            return;
+        }}
+        var code = option.getAttribute('data-currency');
+        dropdown.querySelector('.selected').textContent = code;
+        document.cookie = 'currency=' + code + '; path=/';
+        setTimeout(function () {{
+            var rate = rates[code];
+            document.querySelector('.price').textContent = rate[0] + ' ' + Math.round(base * rate[1]);
+        }}, 50);
+    }});
+}})();
+</script>"""
+
+
+def _script_data(page_url: str, site_name: str) -> str:
+    return json.dumps({
+        'staticFile': page_url,
+        'stsConfig': {'EnabledFeeds': 'fixture-campaign-1'},
+        'config': {'SiteName': site_name},
+        'userInfo': {'Browser': 'Chrome', 'CountryCode': 'ES', 'IP': '127.0.0.1'},
+    })
+
+
+def _currency_dropdown(base_price: int) -> str:
+    options = ''.join(
+        f'<li data-currency="{code}" data-currency-country="{country}"><div class="option"><p>{code} {symbol}</p></div></li>'
+        for code, symbol, country, _ in CURRENCIES
+    )
+    rates = json.dumps({code: [symbol, rate] for code, symbol, _, rate in CURRENCIES}, ensure_ascii=False)
+    return CURRENCY_TEMPLATE.format(options=options, rates=rates, base_price=base_price)
+
+
+def _write(directory: str, path: str, html: str):
+    target = os.path.join(directory, path.strip('/'), 'index.html')
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, 'w', encoding='utf-8') as handle:
+        handle.write(html)
+
+
+def generate_site(directory: str, properties: int = 200, per_page: int = 20, broken_link_rate: float = 0.1, missing_alt_rate: float = 0.3, seed: int = 7, site_name: str = 'Fixture Rentals') -> dict:
+    """
+    Write the fixture site to ``directory``.
+
+    Args:
+        directory (str): Output folder, the server's document root
+        properties (int): Number of property pages
+        per_page (int): Properties per listing page
+        broken_link_rate (float): Share of property pages with a link to a missing page
+            and an image that does not exist
+        missing_alt_rate (float): Share of images without alt text
+        seed (int): Random seed; the same seed gives the same site
+        site_name (str): ``config.SiteName`` in ``window.ScriptData``
+
+    Returns:
+        dict: Page counts and the path of one property page, for the benchmarks
+    """
+    rng = random.Random(seed)
+    os.makedirs(os.path.join(directory, 'images'), exist_ok=True)
+    for index in range(8):
+        with open(os.path.join(directory, 'images', f'photo-{index}.svg'), 'w') as handle:
+            handle.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="320" height="200"><rect width="320" height="200" fill="#{index}{index}8"/></svg>')
+
+    paths = []
+    for index in range(properties):
+        city, kind = rng.choice(CITIES), rng.choice(KINDS)
+        paths.append((f'/property/{kind.lower()}-{city.lower()}-{index}/BC-{100000 + index}/', f'{kind} en {city} {index}', city))
+    listings = max(1, -(-properties // per_page))
+    broken = 0
+
+    for index, (path, name, city) in enumerate(paths):
+        price = rng.randint(40, 400)
+        images = []
+        for number in range(4):
+            alt = '' if rng.random() < missing_alt_rate else f' alt="{name} foto {number + 1}"'
+            images.append(f'<img src="/images/photo-{rng.randrange(8)}.svg" width="320" height="200"{alt}>')
+        similar = ''.join(f'<li><a href="{paths[other][0]}">{paths[other][1]}</a></li>' for other in rng.sample(range(properties), min(4, properties)))
+        extra = ''
+        if rng.random() < broken_link_rate:
+            broken += 1
+            extra = f'<p><a href="/property/retirado-{index}/">Anuncio retirado</a> <img src="/images/missing-{index}.jpg" alt="Sin foto"></p>'
+        # Every seventh property skips a heading level, for the header sequence check
+        details = '<h3>Detalles</h3>' if index % 7 == 0 else '<h2>Detalles</h2><h3>Habitaciones</h3>'
+        body = (
+            f'<h1>{name}</h1>\n<div class="price">€ {price}</div>\n<div class="price-note">por noche</div>\n'
+            f'{details}\n<p>{"Alojamiento luminoso cerca del centro. " * 12}</p>\n{"".join(images)}\n'
+            f'<h2>Alojamientos similares</h2><ul>{similar}</ul>\n{extra}\n'
+            f'<a href="/listings/{index // per_page + 1}/">Volver a {city}</a>'
+        )
+        _write(directory, path, PAGE_TEMPLATE.format(
+            title=name, script_data=_script_data(path, site_name), nav='<a href="/listings/1/">Alojamientos</a>',
+            body=body, currency=_currency_dropdown(price)
+        ))
+
+    for page in range(1, listings + 1):
+        items = paths[(page - 1) * per_page:page * per_page]
+        pager = ''.join(f'<a href="/listings/{number}/">{number}</a> ' for number in range(max(1, page - 2), min(listings, page + 2) + 1))
+        body = (
+            f'<h1>Alojamientos - pagina {page}</h1>\n<ul>'
+            + ''.join(f'<li><a href="{path}">{name}</a> <img src="/images/photo-{i % 8}.svg" alt="{name}"></li>' for i, (path, name, _) in enumerate(items))
+            + f'</ul>\n<div class="pager">{pager}</div>'
+        )
+        _write(directory, f'/listings/{page}/', PAGE_TEMPLATE.format(
+            title=f'Alojamientos {page}', script_data=_script_data(f'/listings/{page}/', site_name), nav='', body=body, currency=''
+        ))
+
+    home = (
+        '<h1>Alquileres vacacionales</h1>\n<h2>Destinos</h2><ul>'
+        + ''.join(f'<li><a href="/listings/{page}/">Pagina {page}</a></li>' for page in range(1, min(listings, 10) + 1))
+        + '</ul>\n<h2>Destacados</h2><ul>'
+        + ''.join(f'<li><a href="{path}">{name}</a></li>' for path, name, _ in paths[:8])
+        + '</ul>'
+    )
+    _write(directory, '/', PAGE_TEMPLATE.format(title=site_name, script_data=_script_data('/', site_name), nav='', body=home, currency=_currency_dropdown(100)))
+    _write(directory, '/about/', PAGE_TEMPLATE.format(
+        title='Sobre nosotros', script_data=_script_data('/about/', site_name), nav='', body='<h1>Sobre nosotros</h1><p>Sitio de pruebas.</p>', currency=''
+    ))
+    with open(os.path.join(directory, 'robots.txt'), 'w') as handle:
+        handle.write('User-agent: *\nDisallow: /admin/\n')
+
+    return {
+        'properties': properties,
+        'listing_pages': listings,
+        'pages': properties + listings + 2,
+        'broken_pages': broken,
+        'property_path': paths[0][0],
+        'seed': seed,
+    }
+
+
+class _FixtureHandler(SimpleHTTPRequestHandler):
+    # Keep-alive, like a production server
+    protocol_version = 'HTTP/1.1'
+
+    def __init__(self, *args, server_state=None, **kwargs):
+        self.server_state = server_state
+        super().__init__(*args, **kwargs)
+
+    def send_response(self, code, message=None):
+        self.server_state.record(code)
+        super().send_response(code, message)
+
+    def do_GET(self):
+        if self.server_state.latency:
+            time.sleep(self.server_state.latency)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    def __init__(self, directory: str, host: str = '127.0.0.1', port: int = 0, latency_ms: float = 0):
+        """
+        Serve ``directory`` over HTTP on a background thread.
+
+        Args:
+            directory (str): Document root, e.g. from :func:`generate_site`
+            host (str): Interface to listen on
+            port (int): Port, a free one if 0
+            latency_ms (float): Delay added to every response, to mimic a remote server
+        """
+        self.latency = latency_ms / 1000
+        self.statuses = Counter()
+        self._lock = threading.Lock()
+        handler = functools.partial(_FixtureHandler, directory=directory, server_state=self)
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://{host}:{self.httpd.server_address[1]}/"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='fixture-server', daemon=True)
+        self._thread.start()
+
+    def record(self, code: int):
+        with self._lock:
+            self.statuses[int(code)] += 1
+
+    def requests(self) -> int:
+        with self._lock:
+            return sum(self.statuses.values())
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate (and serve) the synthetic benchmark site")
+    parser.add_argument('--directory', default='test_results/fixture_site')
+    parser.add_argument('--properties', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--serve', action='store_true', help="Serve the site until interrupted")
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    args = parser.parse_args()
+
+    info = generate_site(args.directory, properties=args.properties, seed=args.seed)
+    print(f"[SUCCESS] Generated {info['pages']} pages in {args.directory}")
+    if args.serve:
+        server = FixtureServer(args.directory, port=args.port, latency_ms=args.latency_ms)
+        print(f"Serving on {server.url} (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Memory benchmark of result representations.
+
+Builds the same synthetic crawl results (H1, header sequence, image alt and
+status-code rows for N pages) as:
+
+- a list of tuples with the old comment strings (URL inside the comment, one
+  identical row per image without alt), as the engine used to collect them
+- a list of dicts, as ``VacationRentalTester`` stores them
+- a ``ResultTable`` with the current comment strings
+
+and reports the Python heap used (tracemalloc) and the size of the
+DataFrame each converts to.
+
+    python benchmarks/result_memory.py --pages 100000
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+
+from src.report import normalize_results
+from src.results import ResultTable
+
+IMAGES_PER_PAGE = 12
+MISSING_ALT_PER_PAGE = 3
+
+
+def _page_url(i):
+    return f"https://www.alojamiento.io/property/apartamento-{i}/BC-{100000 + i}/"
+
+
+def legacy_rows(pages):
+    """Rows as the checks reported them before the compact format."""
+    for i in range(pages):
+        url = _page_url(i)
+        yield (url, "H1 Tag Existence", "Pass", f"Found 1 H1 tag(s) on {url}")
+        yield (url, "H1 Tag Count", "Pass", f"Total H1 tags: 1 on {url}")
+        yield (url, "H1 Tag Content", "Pass", f"H1 Text: Apartamento {i} on {url}")
+        yield (url, "Header Sequence", "Valid", "All headers are in correct order.")
+        yield (url, "URL Status Code", "Pass", "Status code: 200")
+        for _ in range(MISSING_ALT_PER_PAGE):
+            yield (url, "Image Alt Attribute", "Fail", "Missing alt attribute")
+
+
+def compact_rows(pages):
+    """The same results as the checks report them now."""
+    for i in range(pages):
+        url = _page_url(i)
+        yield (url, "H1 Tag Existence", "Pass", "Found 1 H1 tag(s)")
+        yield (url, "H1 Tag Count", "Pass", "Total H1 tags: 1")
+        yield (url, "H1 Tag Content", "Pass", f"H1 Text: Apartamento {i}")
+        yield (url, "Header Sequence", "Valid", "All headers are in correct order.")
+        yield (url, "URL Status Code", "Pass", "Status code: 200")
+        yield (url, "Image Alt Attribute", "Fail", f"Missing alt attribute on {MISSING_ALT_PER_PAGE} of {IMAGES_PER_PAGE} images")
+
+
+def _measure(build):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    container = build()
+    elapsed = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return container, current, elapsed
+
+
+def run(pages):
+    cases = {
+        'list of tuples (legacy comments)': lambda: list(legacy_rows(pages)),
+        'list of dicts (legacy comments)': lambda: [
+            {'page_url': url, 'testcase': test, 'passed': status in ("Pass", "Valid"), 'comments': comments}
+            for url, test, status, comments in legacy_rows(pages)
+        ],
+        'list of tuples (compact comments)': lambda: list(compact_rows(pages)),
+        'ResultTable (compact comments)': lambda: _table(compact_rows(pages)),
+    }
+
+    report = []
+    for name, build in cases.items():
+        container, heap, elapsed = _measure(build)
+        if isinstance(container, ResultTable):
+            frame = container.to_dataframe()
+        else:
+            frame = pd.DataFrame(container)
+        report.append({
+            'representation': name,
+            'rows': len(container),
+            'heap_mb': heap / 1024 / 1024,
+            'bytes_per_row': heap / len(container),
+            'build_s': elapsed,
+            'dataframe_mb': frame.memory_usage(deep=True).sum() / 1024 / 1024,
+            'normalized_dataframe_mb': normalize_results(container).memory_usage(deep=True).sum() / 1024 / 1024,
+        })
+        del container, frame
+    return report
+
+
+def _table(rows):
+    table = ResultTable()
+    table.extend(rows)
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the memory use of result representations")
+    parser.add_argument('--pages', type=int, default=50000, help="Synthetic pages to generate results for")
+    parser.add_argument('--json', help="Also write the measurements to this JSON file")
+    args = parser.parse_args()
+
+    report = run(args.pages)
+    print(pd.DataFrame(report).to_string(index=False, float_format=lambda value: f"{value:,.2f}"))
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump({'pages': args.pages, 'results': report}, handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Memory and throughput benchmark of the seen-set backends (``src/seen.py``).
+
+Adds N synthetic faceted-search URLs (dates x guests x filters, as the
+search pages of a rental site discover them) to every backend, then looks up
+N/10 URLs that were added and N/10 that were not, and reports:
+
+- the Python heap used (tracemalloc) and the backend's own ``nbytes()``;
+  SQLite's page cache is allocated outside the Python heap, so for ``disk``
+  ``nbytes()`` (the cache limit) is the figure to read
+- adds and lookups per second, measured in a separate pass without tracemalloc
+- the false-positive rate on URLs never added
+
+    python benchmarks/seen_sets.py --urls 1000000 --json seen_sets.json
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+
+from src.seen import SEEN_BACKENDS, make_seen_set
+
+FILTERS = ('pool', 'wifi', 'parking', 'pets', 'kitchen', 'ac', 'balcony', 'sea-view')
+
+
+def faceted_urls(count, offset=0):
+    """Distinct search URLs of the shape link discovery explodes into."""
+    for i in range(offset, offset + count):
+        day, rest = i % 28 + 1, i // 28
+        guests, rest = rest % 8 + 1, rest // 8
+        filters = ','.join(name for bit, name in enumerate(FILTERS) if rest >> bit & 1)
+        yield (
+            f"https://www.alojamiento.io/search?destination=barcelona&checkin=2026-07-{day:02d}"
+            f"&nights={rest // 256 % 14 + 1}&guests={guests}&filters={filters}&page={rest // 3584 + 1}"
+        )
+
+
+def _heap_bytes(backend, count):
+    """Heap held by a backend after adding ``count`` URLs it owns (generated on the fly)."""
+    gc.collect()
+    tracemalloc.start()
+    seen = make_seen_set(backend)
+    for url in faceted_urls(count):
+        seen.add(url)
+    heap, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    nbytes = seen.nbytes()
+    seen.close()
+    return heap, nbytes
+
+
+def run(count, backends):
+    probes = max(1, count // 10)
+    # Generated up front so the timings measure the backends, not string formatting
+    urls = list(faceted_urls(count))
+    present = urls[:probes]
+    absent = list(faceted_urls(probes, offset=count))
+
+    report = []
+    for backend in backends:
+        # Timed without tracemalloc, which slows every allocation down
+        seen = make_seen_set(backend)
+        started = time.perf_counter()
+        for url in urls:
+            seen.add(url)
+        add_time = time.perf_counter() - started
+        started = time.perf_counter()
+        hits = sum(url in seen for url in present)
+        false_positives = sum(url in seen for url in absent)
+        lookup_time = time.perf_counter() - started
+        stored = len(seen)
+        seen.close()
+        del seen
+
+        heap, nbytes = _heap_bytes(backend, count)
+        report.append({
+            'backend': backend,
+            'urls': stored,
+            'heap_mb': heap / 1024 / 1024,
+            'nbytes_mb': nbytes / 1024 / 1024,
+            'bytes_per_url': heap / count,
+            'adds_per_s': count / add_time,
+            'lookups_per_s': 2 * probes / lookup_time,
+            'missed': probes - hits,
+            'false_positive_rate': false_positives / probes,
+        })
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the seen-set backends")
+    parser.add_argument('--urls', type=int, default=200000, help="URLs to add to each backend")
+    parser.add_argument('--backends', nargs='+', default=list(SEEN_BACKENDS), choices=list(SEEN_BACKENDS))
+    parser.add_argument('--json', help="Also write the measurements to this JSON file")
+    args = parser.parse_args()
+
+    report = run(args.urls, args.backends)
+    print(pd.DataFrame(report).to_string(index=False, float_format=lambda value: f"{value:,.4g}"))
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump({'urls': args.urls, 'results': report}, handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
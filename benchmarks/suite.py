@@ -0,0 +1,228 @@
+"""
+Offline benchmark suite: every tester against the synthetic fixture site.
+
+Generates the site (``benchmarks/fixture_site.py``), serves it locally and runs:
+
+- ``run_recursive_tests`` of the H1, header sequence, image alt and URL status testers
+- ``CurrencyFilterTester.run_currency_test`` on a property page
+- ``AlojamientoScraper`` reading ``window.ScriptData`` from a property page
+
+For each it records pages/sec, browser launches, p50/p95 page latency and the
+peak RSS of the process tree (Python, chromedriver and Chrome), and writes them
+as a JSON baseline. ``--compare`` checks a run against an earlier baseline and
+exits non-zero on a regression beyond ``--tolerance``.
+
+    python benchmarks/suite.py --properties 300 --output test_results/benchmark_baseline.json
+    python benchmarks/suite.py --properties 300 --compare test_results/benchmark_baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+from selenium import webdriver
+
+from benchmarks.fixture_site import FixtureServer, generate_site
+from src.driver_pool import DriverPool, _process_tree_rss
+from src.tests import test_h1, test_html_tags, test_images, test_urls
+from src.tests.test_currency import CurrencyFilterTester
+from src.tests.test_scrape import AlojamientoScraper
+
+TESTERS = {
+    'h1': test_h1.H1TagTester,
+    'header_sequence': test_html_tags.VacationRentalTester,
+    'image_alt': test_images.VacationRentalTester,
+    'url_status': test_urls.VacationRentalTester,
+}
+SCENARIOS = (*TESTERS, 'currency', 'scraper')
+
+# Metrics compared against a baseline, and whether higher is better
+COMPARED = {'pages_per_s': True, 'p95_page_s': False, 'peak_rss_mb': False, 'browser_launches': False}
+
+
+class PeakRss:
+    """Samples the RSS of this process and its children (the browsers) on a background thread."""
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, name='rss-sampler', daemon=True)
+
+    def _sample(self):
+        while True:
+            self.peak = max(self.peak, _process_tree_rss(os.getpid()) or 0)
+            if self._stop.wait(self.interval):
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self._stop.set()
+        self._thread.join()
+
+
+def _chrome_options():
+    options = webdriver.ChromeOptions()
+    for argument in ('--headless', '--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu'):
+        options.add_argument(argument)
+    return options
+
+
+def run_tester(name, site_url, output_folder, args):
+    pool = DriverPool(_chrome_options(), size=args.max_workers)
+    tester = TESTERS[name](
+        url=site_url, output_folder=output_folder, headless=True, max_workers=args.max_workers,
+        max_depth=args.max_depth, max_links=args.max_links, driver_pool=pool, fetch_mode=args.fetch_mode
+    )
+    try:
+        tester.run_recursive_tests()
+    finally:
+        pool.close()
+    stats = tester.crawl_stats
+    return {
+        'pages': stats.get('pages', 0),
+        'results': len(tester.results),
+        'browser_launches': pool.launched,
+        'p50_page_s': stats.get('p50_page_s'),
+        'p95_page_s': stats.get('p95_page_s'),
+    }
+
+
+def run_currency(property_url, output_folder, args):
+    tester = CurrencyFilterTester(url=property_url, output_folder=output_folder, log_folder=output_folder, headless=True)
+    started = time.perf_counter()
+    try:
+        results = tester.run_currency_test()
+        launches = 1 if tester._driver is not None else 0
+    finally:
+        tester.close()
+    elapsed = time.perf_counter() - started
+    return {
+        'pages': 1,
+        'results': len(results),
+        'failed': sum(result['status'] == 'fail' for result in results),
+        'browser_launches': launches,
+        'p50_page_s': elapsed,
+        'p95_page_s': elapsed,
+    }
+
+
+def run_scraper(property_url, output_folder, args):
+    started = time.perf_counter()
+    scraper = AlojamientoScraper(property_url, headless=True)
+    try:
+        scraper.fetch_script_data()
+        data = scraper.extract_required_fields()
+    finally:
+        scraper.close()
+    elapsed = time.perf_counter() - started
+    return {
+        'pages': 1,
+        'results': len(data),
+        'failed': int(data.get('SiteName') != 'Fixture Rentals'),
+        'browser_launches': 1,
+        'p50_page_s': elapsed,
+        'p95_page_s': elapsed,
+    }
+
+
+def run_scenario(name, server, property_url, output_folder, args):
+    requests_before = server.requests()
+    with PeakRss() as rss:
+        started = time.perf_counter()
+        if name == 'currency':
+            measured = run_currency(property_url, output_folder, args)
+        elif name == 'scraper':
+            measured = run_scraper(property_url, output_folder, args)
+        else:
+            measured = run_tester(name, server.url, output_folder, args)
+        wall_time = time.perf_counter() - started
+    return {
+        'scenario': name,
+        **measured,
+        'wall_time_s': wall_time,
+        'pages_per_s': measured['pages'] / wall_time if wall_time else 0.0,
+        'peak_rss_mb': rss.peak / 1024 / 1024,
+        'server_requests': server.requests() - requests_before,
+    }
+
+
+def compare(report, baseline, tolerance):
+    """Return the regressions of ``report`` against ``baseline`` beyond ``tolerance`` (a fraction)."""
+    previous = {row['scenario']: row for row in baseline['scenarios']}
+    regressions = []
+    for row in report['scenarios']:
+        before = previous.get(row['scenario'])
+        if before is None:
+            continue
+        for metric, higher_is_better in COMPARED.items():
+            old, new = before.get(metric), row.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (change < -tolerance) if higher_is_better else (change > tolerance):
+                regressions.append(f"{row['scenario']}: {metric} {old:.4g} -> {new:.4g} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every tester against a local synthetic site")
+    parser.add_argument('--scenarios', nargs='+', default=list(SCENARIOS), choices=SCENARIOS)
+    parser.add_argument('--properties', type=int, default=200, help="Property pages in the fixture site")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--latency-ms', type=float, default=20, help="Delay the fixture server adds to every response")
+    parser.add_argument('--max-links', type=int, default=100)
+    parser.add_argument('--max-depth', type=int, default=3)
+    parser.add_argument('--max-workers', type=int, default=4)
+    parser.add_argument('--fetch-mode', choices=('browser', 'http'), default='browser')
+    parser.add_argument('--output', default='test_results/benchmark_suite.json', help="JSON file the measurements are written to")
+    parser.add_argument('--compare', help="Baseline JSON to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed relative regression, e.g. 0.2 for 20%%")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='fixture_site_') as directory:
+        site = generate_site(directory, properties=args.properties, seed=args.seed)
+        server = FixtureServer(directory, latency_ms=args.latency_ms)
+        property_url = server.url.rstrip('/') + site['property_path']
+        output_folder = os.path.join(directory, '_results')
+        try:
+            rows = [run_scenario(name, server, property_url, output_folder, args) for name in args.scenarios]
+        finally:
+            server.close()
+
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'machine': {'platform': platform.platform(), 'python': platform.python_version(), 'cpus': os.cpu_count()},
+        'site': {**site, 'latency_ms': args.latency_ms},
+        'options': {key: getattr(args, key) for key in ('max_links', 'max_depth', 'max_workers', 'fetch_mode')},
+        'scenarios': rows,
+    }
+    print(pd.DataFrame(rows).to_string(index=False, float_format=lambda value: f"{value:,.4g}"))
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as handle:
+        json.dump(report, handle, indent=2)
+    print(f"[SUCCESS] Benchmark results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as handle:
+            regressions = compare(report, json.load(handle), args.tolerance)
+        for regression in regressions:
+            print(f"[WARNING] Regression: {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"[SUCCESS] No regression beyond {args.tolerance:.0%} against {args.compare}")
+
+
+if __name__ == '__main__':
+    main()
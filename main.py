@@ -1,20 +1,33 @@
+import argparse
 import os
 import sys
 
 # Add project root to Python path
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
+from src.throttle import HostThrottle
 from src.utilities import setup_logging
-from src.VacationRentalTester import VacationRentalTester
+from src.VacationRentalTester import ENGINES, VacationRentalTester
 
 def main():
+    parser = argparse.ArgumentParser(description="Run every page check against a vacation rental site")
+    parser.add_argument('--url', default='https://www.alojamiento.io/property/apartamentos-centro-col%c3%b3n/BC-189483/', help="Start page")
+    parser.add_argument('--engine', choices=ENGINES, default='threads', help="Crawl engine: thread pool of browsers, or Scrapy with browser rendering only where needed")
+    parser.add_argument('--rate', type=float, help="Cap requests per second per host; no fixed cap if omitted (the adaptive window still backs off on 429/5xx)")
+    parser.add_argument('--timing', metavar='PATH', help="Time every phase of each page and write the histograms to PATH (.prom for Prometheus text format, .json)")
+    args = parser.parse_args()
+
     # Setup logging
     setup_logging()
     
     # Initialize tester
     tester = VacationRentalTester(
-        url='https://www.alojamiento.io/property/apartamentos-centro-col%c3%b3n/BC-189483/', 
-        headless=False
+        url=args.url, 
+        headless=False,
+        engine=args.engine,
+        timing_export=args.timing,
+        # max_concurrency matches the tester's default max_workers
+        **({'throttle': HostThrottle(rate=args.rate, max_concurrency=10)} if args.rate else {})
     )
     
     # Run all tests
@@ -4,15 +4,24 @@ from urllib.parse import urlparse
 from datetime import datetime
 import pandas as pd
 from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager # Ensure test_h1 is correctly implemented
-from concurrent.futures import ThreadPoolExecutor
 import argparse
-from .tests.test_h1 import H1TagTester
+from .crawler import CrawlEngine, get_checks
+from .driver_pool import DriverPool
+from .link_checker import LinkStatusChecker
+from .report import STATUS_ALIASES, ReportBuilder
+from .sinks import open_sink
+from .throttle import HostThrottle
+from .timing import make_timer
+# Importing the test modules registers their page checks with the crawl engine
+from .tests import test_h1, test_html_tags, test_images, test_urls  # noqa: F401
+
+RESULT_COLUMNS = ['page_url', 'testcase', 'status', 'passed', 'comments', 'source']
+
+ENGINES = ('threads', 'scrapy')
 
 
 class VacationRentalTester:
-    def __init__(self, url='https://www.alojamiento.io/property/apartamentos-centro-col%c3%b3n/BC-189483/', output_folder='test_results', headless=False):
+    def __init__(self, url='https://www.alojamiento.io/property/apartamentos-centro-col%c3%b3n/BC-189483/', output_folder='test_results', headless=False, max_workers=10, max_depth=3, max_links=40, results_stream=None, link_filter=None, engine='threads', timing_export=None, **engine_options):
         self.output_folder = output_folder
         os.makedirs(self.output_folder, exist_ok=True)
 
@@ -22,10 +31,34 @@ class VacationRentalTester:
             self.options.add_argument("--headless")
         self.options.add_argument("--start-maximized")
 
-        # Initialize WebDriver
-        self.driver = None  # Driver initialized on demand
+        # Browsers are pooled and shared by every test; the pool is created on demand
+        self.driver_pool = None
+        self.max_workers = max_workers
+        self.max_depth = max_depth
+        self.max_links = max_links
+        # Per-host rate limits and robots.txt rules shared by the crawl and the link checks
+        throttle = engine_options.pop('throttle', None)
+        self.throttle = throttle or HostThrottle(max_concurrency=max_workers)
+        self._owns_throttle = throttle is None  # closed (its robots.txt session) after each run
+        # Phase timer shared by the crawl and the browser pool; off unless timing or timing_export is given
+        self.timing = make_timer(engine_options.pop('timing', None) or bool(timing_export))
+        # .prom (Prometheus text format) or .json file the phase histograms are written to after each crawl
+        self.timing_export = timing_export
+        self.engine_options = engine_options  # Extra CrawlEngine options, e.g. fetch_mode='http'
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown crawl engine: {engine} (use one of {', '.join(ENGINES)})")
+        # 'threads' is CrawlEngine; 'scrapy' is ScrapyEngine (src/scrapy_engine.py), which takes its own options
+        self.engine = engine
         self.url = url
         self.results = []
+        # Optional .jsonl/.csv/.parquet file results are streamed to instead of kept in memory
+        self.results_stream = results_stream
+        self.sink = None  # Opened on the first crawl when results_stream is set
+        # Optional callable picking the discovered links to status-check, e.g. the ones no other shard checked
+        self.link_filter = link_filter
+        self._engine = None
+        self.page_depths = {}
+        self.crawl_stats = {}  # Engine counters of the last crawl (pages, utilization, load profile savings)
 
         # Extract domain from URL
         try:
@@ -47,58 +80,127 @@ class VacationRentalTester:
             print(f"Error obtaining network info: {e}")
 
     def _initialize_driver(self):
-        if not self.driver:
-            self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=self.options)
+        if not self.driver_pool:
+            self.driver_pool = DriverPool(self.options, size=self.max_workers, timing=self.timing)
+        return self.driver_pool
+
+    def _engine_class(self):
+        if self.engine == 'scrapy':
+            # Imported on demand: importing Twisted installs its reactor for the whole process
+            from .scrapy_engine import ScrapyEngine
+            return ScrapyEngine
+        return CrawlEngine
+
+    def run_checks(self, check_names=None):
+        """
+        Crawl the site once and run the selected page checks on every loaded page.
+
+        When the URL status check is selected, every link and image URL found
+        during the crawl is status-checked afterwards as well.
+
+        Args:
+            check_names (list): Registered check names to run, all checks if None
+        """
+        check_links = check_names is None or "URL Status Code" in check_names
+        if self.results_stream and self.sink is None:
+            self.sink = open_sink(self.results_stream, RESULT_COLUMNS)
+        # Session for the page status probes and link checks of this run, closed when it ends
+        checker = LinkStatusChecker(throttle=self.throttle)
+
+        # Results are converted as workers report them rather than collected by the engine
+        self._engine = engine = self._engine_class()(
+            self.url,
+            test_urls.with_status_checker(get_checks(check_names), checker),
+            self._initialize_driver(),
+            max_workers=self.max_workers,
+            max_depth=self.max_depth,
+            max_links=self.max_links,
+            throttle=self.throttle,
+            timing=self.timing,
+            **{'collect_links': check_links, 'on_result': self._record_engine_result, 'keep_results': False, **self.engine_options}
+        )
+        try:
+            try:
+                engine.run()
+                self.crawl_stats = engine.stats
+                self.page_depths.update(engine.page_depths)
+            finally:
+                self.driver_pool.close()
+            if self.timing_export:
+                self.timing.export(self.timing_export)
+
+            if check_links:
+                links = engine.discovered_links
+                if self.link_filter:
+                    links = {url: links[url] for url in self.link_filter(list(links))}
+                test_urls.check_discovered_links(
+                    links,
+                    lambda url, testcase, status, comments: self._add_result(testcase, status, comments, page_url=url),
+                    checker=checker
+                )
+        finally:
+            checker.close()
+            if self._owns_throttle:
+                self.throttle.close()
+        if self.sink:
+            self.sink.flush()
+
+    def _record_engine_result(self, page_url, testcase, status, comments):
+        source = 'reused' if page_url in self._engine.reused_urls else 'fresh'
+        self._add_result(testcase, status, comments, page_url=page_url, source=source)
 
     def run_h1_test(self):
         try:
-            self._initialize_driver()
-            tester = H1TagTester(self.driver, self.url)
-            tester.run(self._add_result)
+            self.run_checks(["H1 Tag"])
             print("H1 test completed successfully.")
         except Exception as e:
             print(f"An error occurred during the H1 test: {e}")
-        finally:
-            if self.driver:
-                self.driver.quit()
-                self.driver = None
 
     def run_all_tests(self):
         """
-        Run all available test cases concurrently
+        Run all registered page checks in a single crawl of the site
         """
-        with ThreadPoolExecutor() as executor:
-            # Run multiple tests concurrently
-            future_to_test = {
-                executor.submit(self.run_h1_test): 'H1 Test',
-                # Add other test methods here as needed, e.g.:
-                # executor.submit(self.run_another_test): 'Another Test',
-            }
-
-            for future in future_to_test:
-                try:
-                    future.result()  # Wait for the test to finish
-                    print(f"{future_to_test[future]} completed successfully.")
-                except Exception as e:
-                    print(f"Error in {future_to_test[future]}: {e}")
-
-    def _add_result(self, testcase, passed, comments, page_url=None):
-        self.results.append({
+        try:
+            self.run_checks()
+            print("All tests completed successfully.")
+        except Exception as e:
+            print(f"An error occurred while running the tests: {e}")
+
+    def _add_result(self, testcase, status, comments, page_url=None, source='fresh'):
+        # Checks spell their outcome differently (Valid, Invalid, ...); keep it as Pass/Fail/Error
+        status = STATUS_ALIASES.get(str(status).strip().lower(), status)
+        result = {
             'page_url': page_url or self.url,
             'testcase': testcase,
-            'passed': passed,
-            'comments': comments
-        })
+            'status': status,
+            'passed': status == 'Pass',
+            'comments': comments,
+            'source': source  # 'reused' when an incremental crawl found the page unchanged
+        }
+        if self.sink:
+            self.sink.write(result)
+        else:
+            self.results.append(result)
 
     def generate_report(self):
+        """
+        Write every result to one workbook: summaries by test, URL template and
+        depth, all results in the normalized schema, and the crawl stats.
+        """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        results_df = pd.DataFrame(self.results)
-
-        if results_df.empty:
-            print("No test results to generate reports.")
-            return
+        builder = ReportBuilder(os.path.join(self.output_folder, f'test_results_{timestamp}.xlsx'), depths=self.page_depths)
+        if self.sink:
+            # Streamed results are read back in chunks instead of being loaded at once
+            self.sink.close()
+            builder.add_stream(self.sink.path)
+        else:
+            builder.add(self.results)
+        if self.crawl_stats:
+            builder.add_sheet('Crawl Stats', pd.DataFrame(list(self.crawl_stats.items()), columns=['Metric', 'Value']))
+        if self.timing.enabled and self.timing.histograms:
+            builder.add_sheet('Phase Timings', self.timing.phase_frame())
+            builder.add_sheet('Slowest Pages', self.timing.slowest_frame())
 
-        # Generate main test results report
-        results_filename = os.path.join(self.output_folder, f'test_results_{timestamp}.xlsx')
-        results_df.to_excel(results_filename, index=False)
-        print(f"Test Results Report generated: {results_filename}")
+        results_filename = builder.write()
+        if results_filename:
+            print(f"Test Results Report generated: {results_filename}")
@@ -0,0 +1,425 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from multiprocessing.managers import BaseManager
+from typing import Iterable, List, Optional, Tuple
+
+from .seen import ExactSeenSet
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS frontier (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT UNIQUE NOT NULL,
+    depth INTEGER NOT NULL,
+    state INTEGER NOT NULL DEFAULT 0,
+    leased_by TEXT,
+    lease_expires REAL,
+    counted INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS frontier_state ON frontier (state, seq);
+CREATE TABLE IF NOT EXISTS visited (url TEXT PRIMARY KEY, item TEXT NOT NULL, depth INTEGER);
+CREATE TABLE IF NOT EXISTS links (url TEXT PRIMARY KEY, worker TEXT);
+CREATE TABLE IF NOT EXISTS workers (worker TEXT PRIMARY KEY, stats TEXT, updated_at REAL);
+CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+"""
+
+# Frontier row states
+PENDING, LEASED, DONE = 0, 1, 2
+
+# Running totals kept in the counters table, so leasing never scans the frontier
+COUNTERS = ('pending', 'leased', 'done', 'used')
+
+
+class Coordinator:
+    def __init__(self, path: str, lease_seconds: float = 300.0):
+        """
+        Shared frontier, dedup sets and page budget of a sharded crawl, kept in SQLite.
+
+        Workers in any number of processes lease URLs, report the links they
+        find and claim the pages they test through this object. Every method
+        is one short transaction, so worker processes on the same machine can
+        each open the database directly (WAL mode lets them work concurrently),
+        and workers on other machines reach one instance over TCP through
+        :func:`serve_coordinator` / :func:`connect_coordinator`.
+
+        A lease not completed within ``lease_seconds`` (the worker died or hung)
+        goes back to the queue and the pages claimed under it are released, so
+        another worker tests the page.
+
+        Args:
+            path (str): SQLite database file
+            lease_seconds (float): How long a worker may hold a URL before it is handed out again
+        """
+        self.path = path
+        self.lease_seconds = lease_seconds
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def seed(self, start_url: str, config: dict, reset: bool = False):
+        """
+        Start a sharded crawl of ``start_url``, or join the one already in the database.
+
+        Args:
+            start_url (str): First page of the crawl
+            config (dict): Crawl settings shared by every worker; must include
+                ``max_depth`` and ``max_links``
+            reset (bool): Drop a previous crawl kept in the database
+        """
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            if reset or self._meta('start_url') != start_url:
+                for table in ('meta', 'frontier', 'visited', 'links', 'workers'):
+                    self._conn.execute(f"DELETE FROM {table}")
+                self._conn.execute("INSERT INTO meta VALUES ('start_url', ?)", (start_url,))
+                self._conn.execute("INSERT INTO meta VALUES ('config', ?)", (json.dumps(config),))
+                self._conn.execute("INSERT OR IGNORE INTO frontier (url, depth) VALUES (?, 0)", (start_url,))
+            self._recount()
+
+    def config(self) -> Optional[dict]:
+        """``start_url`` and the settings of the crawl, None if nothing was seeded."""
+        with self._lock:
+            start_url = self._meta('start_url')
+            if start_url is None:
+                return None
+            return {'start_url': start_url, **json.loads(self._meta('config'))}
+
+    # Frontier
+
+    def add(self, items: Iterable[Tuple[str, int]]) -> int:
+        """Queue ``(url, depth)`` pairs not seen by any worker; returns how many were new."""
+        items = list(items)
+        if not items:
+            return 0
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            before = self._conn.total_changes
+            self._conn.executemany("INSERT OR IGNORE INTO frontier (url, depth) VALUES (?, ?)", items)
+            added = self._conn.total_changes - before
+            self._bump(pending=added)
+            return added
+
+    def _expire_leases(self, now: float):
+        expired = [url for url, in self._conn.execute(
+            "SELECT url FROM frontier WHERE state = ? AND lease_expires < ?", (LEASED, now)
+        )]
+        if expired:
+            self._conn.executemany("DELETE FROM visited WHERE item = ?", [(url,) for url in expired])
+            self._conn.executemany("UPDATE frontier SET state = ?, leased_by = NULL WHERE url = ?", [(PENDING, url) for url in expired])
+            self._bump(leased=-len(expired), pending=len(expired))
+
+    def _recount(self):
+        """Rebuild the running counters from the frontier; once per seed, e.g. for a database from before they existed."""
+        counts = dict(self._conn.execute("SELECT state, COUNT(*) FROM frontier GROUP BY state").fetchall())
+        used = self._conn.execute("SELECT COUNT(*) FROM frontier WHERE state = ? AND counted = 1", (DONE,)).fetchone()[0]
+        values = {'pending': counts.get(PENDING, 0), 'leased': counts.get(LEASED, 0), 'done': counts.get(DONE, 0), 'used': used}
+        self._conn.executemany("INSERT OR REPLACE INTO counters VALUES (?, ?)", list(values.items()))
+
+    def _bump(self, **deltas):
+        self._conn.executemany("UPDATE counters SET value = value + ? WHERE name = ?", [(delta, name) for name, delta in deltas.items() if delta])
+
+    def _counters(self) -> dict:
+        values = dict(self._conn.execute("SELECT name, value FROM counters").fetchall())
+        return {name: values.get(name, 0) for name in COUNTERS}
+
+    def _counts(self) -> Tuple[int, int, int]:
+        """(pages counted against the budget, URLs leased, URLs pending)"""
+        counters = self._counters()
+        return counters['used'], counters['leased'], counters['pending']
+
+    def lease(self, worker: str, count: int = 1) -> List[Tuple[str, int]]:
+        """
+        Hand up to ``count`` queued URLs to ``worker``.
+
+        Leased URLs hold a slot of the page budget until they are completed,
+        so the workers together never test more than ``max_links`` pages.
+
+        Returns:
+            list: ``(url, depth)`` pairs, empty if nothing can be leased right now
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._expire_leases(now)
+            max_links = json.loads(self._meta('config') or '{}').get('max_links')
+            if max_links is not None:
+                used, leased, _ = self._counts()
+                count = min(count, max_links - used - leased)
+            if count <= 0:
+                return []
+            items = self._conn.execute(
+                "SELECT url, depth FROM frontier WHERE state = ? ORDER BY seq LIMIT ?", (PENDING, count)
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE frontier SET state = ?, leased_by = ?, lease_expires = ? WHERE url = ?",
+                [(LEASED, worker, now + self.lease_seconds, url) for url, _ in items]
+            )
+            self._bump(pending=-len(items), leased=len(items))
+            return [tuple(item) for item in items]
+
+    def complete(self, worker: str, url: str, counted: bool) -> bool:
+        """
+        Mark a leased URL as done.
+
+        Returns:
+            bool: False if the lease had expired and was handed to another worker
+        """
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            cursor = self._conn.execute(
+                "UPDATE frontier SET state = ?, counted = ?, leased_by = NULL WHERE url = ? AND state = ? AND leased_by = ?",
+                (DONE, int(counted), url, LEASED, worker)
+            )
+            if cursor.rowcount == 0:
+                return False
+            self._bump(leased=-1, done=1, used=int(counted))
+            return True
+
+    def finished(self) -> bool:
+        """True once no URL is leased and nothing is queued or the page budget is spent."""
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._expire_leases(time.time())
+            used, leased, pending = self._counts()
+            max_links = json.loads(self._meta('config') or '{}').get('max_links')
+        return leased == 0 and (pending == 0 or (max_links is not None and used >= max_links))
+
+    # Dedup
+
+    def claim(self, url: str, item: str, depth: int) -> bool:
+        """Atomically claim the final URL of a page for the worker testing frontier URL ``item``."""
+        with self._lock:
+            cursor = self._conn.execute("INSERT OR IGNORE INTO visited (url, item, depth) VALUES (?, ?, ?)", (url, item, depth))
+            return cursor.rowcount > 0
+
+    def claim_links(self, urls: Iterable[str], worker: str = '') -> List[str]:
+        """Return the URLs among ``urls`` no worker has status-checked yet, claiming them."""
+        claimed = []
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            for url in urls:
+                if self._conn.execute("INSERT OR IGNORE INTO links (url, worker) VALUES (?, ?)", (url, worker)).rowcount:
+                    claimed.append(url)
+        return claimed
+
+    # Reporting
+
+    def page_depths(self) -> dict:
+        """Crawl depth of every page tested by any worker, for reports."""
+        with self._lock:
+            return dict(self._conn.execute("SELECT url, depth FROM visited"))
+
+    def report_stats(self, worker: str, stats: dict):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO workers VALUES (?, ?, ?)", (worker, json.dumps(stats, default=str), time.time())
+            )
+
+    def worker_stats(self) -> dict:
+        with self._lock:
+            return {worker: json.loads(stats) for worker, stats in self._conn.execute("SELECT worker, stats FROM workers ORDER BY worker")}
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = self._counters()
+            visited = self._conn.execute("SELECT COUNT(*) FROM visited").fetchone()[0]
+        return {'pending': counters['pending'], 'leased': counters['leased'], 'done': counters['done'], 'pages': visited, 'budget_used': counters['used']}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class SharedFrontier:
+    def __init__(self, coordinator, worker: str, max_depth: Optional[int] = None, lease_batch: int = 1, flush_every: int = 50, poll_interval: float = 1.0):
+        """
+        Frontier of one worker of a sharded crawl, backed by a :class:`Coordinator`.
+
+        Drop-in for :class:`~src.frontier.Frontier` in ``CrawlEngine``: ``pop``
+        leases URLs from the coordinator and ``push`` forwards discoveries in
+        batches (a local seen-set skips the ones this worker already sent).
+        Completed pages are reported through :meth:`task_done`.
+
+        Args:
+            coordinator (Coordinator): Local instance or proxy from :func:`connect_coordinator`
+            worker (str): Unique name of this worker, e.g. ``host:pid``
+            max_depth (int): URLs deeper than this are not forwarded
+            lease_batch (int): URLs leased per round trip; keep small so leases stay spread out
+            flush_every (int): Discovered URLs buffered before they are sent
+            poll_interval (float): Seconds to wait for other workers to queue URLs when idle
+        """
+        self.coordinator = coordinator
+        self.worker = worker
+        self.max_depth = max_depth
+        self.lease_batch = lease_batch
+        self.flush_every = flush_every
+        self.poll_interval = poll_interval
+
+        self._leased = deque()
+        self._outbox: List[Tuple[str, int]] = []
+        self._seen = ExactSeenSet()
+        self._lock = threading.Lock()
+
+        # Counters for reporting
+        self.enqueued = 0
+        self.duplicates = 0
+        self.leases = 0
+        self.lost_leases = 0
+
+    def push(self, url: str, depth: int, priority: int = 0, force: bool = False) -> bool:
+        # The coordinator's queue has no cap, so ``force`` changes nothing here
+        if self.max_depth is not None and depth > self.max_depth:
+            return False
+        with self._lock:
+            if url in self._seen:
+                self.duplicates += 1
+                return False
+            self._seen.add(url)
+            self._outbox.append((url, depth))
+            due = len(self._outbox) >= self.flush_every
+        if due:
+            self.flush()
+        return True
+
+    def flush(self):
+        """Send buffered discoveries to the coordinator."""
+        with self._lock:
+            items, self._outbox = self._outbox, []
+        if items:
+            added = self.coordinator.add(items)
+            with self._lock:
+                self.enqueued += added
+
+    def pop(self) -> Optional[Tuple[str, int]]:
+        self.flush()
+        with self._lock:
+            if self._leased:
+                return self._leased.popleft()
+        items = self.coordinator.lease(self.worker, self.lease_batch)
+        with self._lock:
+            self.leases += len(items)
+            self._leased.extend(items)
+            return self._leased.popleft() if self._leased else None
+
+    def mark_seen(self, url: str) -> bool:
+        with self._lock:
+            if url in self._seen:
+                return False
+            self._seen.add(url)
+            return True
+
+    def task_done(self, url: str, counted: bool):
+        # Links go out first so no other worker sees the crawl as finished without them
+        self.flush()
+        if not self.coordinator.complete(self.worker, url, counted):
+            with self._lock:
+                self.lost_leases += 1
+
+    def wait_for_work(self) -> bool:
+        """Wait while other workers may still queue URLs; False once the whole crawl is finished."""
+        self.flush()
+        if self.coordinator.finished():
+            return False
+        time.sleep(self.poll_interval)
+        return True
+
+    def __contains__(self, url: str) -> bool:
+        with self._lock:
+            return url in self._seen
+
+    def __len__(self) -> int:
+        return len(self._leased)
+
+    def __bool__(self) -> bool:
+        return bool(self._leased)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'pending': len(self._leased),
+                'seen': len(self._seen),
+                'enqueued': self.enqueued,
+                'duplicates': self.duplicates,
+                'leases': self.leases,
+                'lost_leases': self.lost_leases,
+            }
+
+    def nbytes(self) -> int:
+        with self._lock:
+            return self._seen.nbytes()
+
+    def close(self):
+        pass
+
+
+class SharedVisitedSet:
+    def __init__(self, coordinator):
+        """
+        Visited set of a sharded crawl: ``claim`` succeeds in exactly one worker of all shards.
+
+        Args:
+            coordinator (Coordinator): Local instance or proxy
+        """
+        self.coordinator = coordinator
+        self._claimed = ExactSeenSet()  # Pages claimed by this worker
+
+    def claim(self, url: str, item: Optional[str] = None, depth: Optional[int] = None) -> bool:
+        if not self.coordinator.claim(url, item or url, depth):
+            return False
+        self._claimed.add(url)
+        return True
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._claimed
+
+    def __len__(self) -> int:
+        return len(self._claimed)
+
+    def __iter__(self):
+        return iter(self._claimed)
+
+    def nbytes(self) -> int:
+        return self._claimed.nbytes()
+
+    def close(self):
+        pass
+
+
+class CoordinatorManager(BaseManager):
+    """Serves one :class:`Coordinator` to workers on other machines."""
+
+
+def serve_coordinator(coordinator: Coordinator, address: Tuple[str, int], authkey: bytes):
+    """
+    Serve ``coordinator`` over TCP until the process is stopped.
+
+    Args:
+        coordinator (Coordinator): Instance every remote worker shares
+        address (tuple): ``(host, port)`` to listen on, e.g. ``('0.0.0.0', 50000)``
+        authkey (bytes): Shared secret workers must present
+    """
+    CoordinatorManager.register('coordinator', callable=lambda: coordinator)
+    manager = CoordinatorManager(address=address, authkey=authkey)
+    server = manager.get_server()
+    print(f"Coordinator listening on {address[0]}:{address[1]} ({coordinator.path})")
+    server.serve_forever()
+
+
+def connect_coordinator(address: Tuple[str, int], authkey: bytes):
+    """Return a proxy of the coordinator served at ``address``; it has the same methods."""
+    CoordinatorManager.register('coordinator')
+    manager = CoordinatorManager(address=address, authkey=authkey)
+    manager.connect()
+    return manager.coordinator()
@@ -0,0 +1,170 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS frontier (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT UNIQUE NOT NULL,
+    depth INTEGER NOT NULL,
+    done INTEGER NOT NULL DEFAULT 0,
+    counted INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS visited (url TEXT PRIMARY KEY, item TEXT NOT NULL, depth INTEGER);
+CREATE TABLE IF NOT EXISTS results (id INTEGER PRIMARY KEY AUTOINCREMENT, item TEXT, url TEXT, test TEXT, status TEXT, comments TEXT);
+CREATE TABLE IF NOT EXISTS links (url TEXT PRIMARY KEY, source TEXT, kind TEXT, item TEXT);
+"""
+
+
+class CrawlState:
+    def __init__(self, path: str, batch_size: int = 200, flush_interval: float = 2.0):
+        """
+        On-disk journal of a crawl (frontier, visited pages, results) in SQLite.
+
+        Events are buffered in memory and written in one transaction once
+        ``batch_size`` events are pending or ``flush_interval`` seconds have
+        passed, whichever comes first. The database runs in WAL mode so a
+        flush never blocks readers and a crash cannot corrupt it.
+
+        Every row written while testing a page is tagged with the frontier URL
+        (the *item*) being processed. On resume only rows of items marked done
+        are kept, so a page interrupted half-way is simply tested again and a
+        finished page is never re-navigated.
+
+        Args:
+            path (str): SQLite database file
+            batch_size (int): Pending events that trigger a flush
+            flush_interval (float): Maximum seconds between flushes
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        # Journals from before page depths were kept
+        if 'depth' not in {column[1] for column in self._conn.execute("PRAGMA table_info(visited)")}:
+            self._conn.execute("ALTER TABLE visited ADD COLUMN depth INTEGER")
+
+        self._lock = threading.Lock()
+        self._pushes = []
+        self._claims = []
+        self._results = []
+        self._links = []
+        self._done = []
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    # Journaling, called from crawler threads
+
+    def _buffer(self, events: list, event: tuple):
+        with self._lock:
+            events.append(event)
+            self._pending += 1
+            due = self._pending >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def record_push(self, url: str, depth: int):
+        self._buffer(self._pushes, (url, depth))
+
+    def record_claim(self, item: str, url: str, depth: Optional[int] = None):
+        self._buffer(self._claims, (url, item, depth))
+
+    def record_result(self, item: Optional[str], row: tuple):
+        self._buffer(self._results, (item, *row))
+
+    def record_link(self, item: str, url: str, source: str, kind: str):
+        self._buffer(self._links, (url, source, kind, item))
+
+    def record_done(self, item: str, counted: bool):
+        self._buffer(self._done, (int(counted), item))
+
+    def flush(self):
+        """Write every buffered event in a single transaction."""
+        with self._lock:
+            if not self._pending:
+                self._last_flush = time.monotonic()
+                return
+            # Inserts before the updates that refer to them
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany("INSERT OR IGNORE INTO frontier (url, depth) VALUES (?, ?)", self._pushes)
+                self._conn.executemany("INSERT OR IGNORE INTO visited (url, item, depth) VALUES (?, ?, ?)", self._claims)
+                self._conn.executemany("INSERT INTO results (item, url, test, status, comments) VALUES (?, ?, ?, ?, ?)", self._results)
+                self._conn.executemany("INSERT OR IGNORE INTO links (url, source, kind, item) VALUES (?, ?, ?, ?)", self._links)
+                self._conn.executemany("UPDATE frontier SET done = 1, counted = ? WHERE url = ?", self._done)
+            # Cleared in place: _buffer may already hold a reference to one of these lists
+            for events in (self._pushes, self._claims, self._results, self._links, self._done):
+                events.clear()
+            self._pending = 0
+            self._last_flush = time.monotonic()
+
+    # Lifecycle
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str):
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def reset(self, start_url: str, config: Optional[dict] = None):
+        """Forget any previous crawl and start journaling a new one."""
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            for table in ('meta', 'frontier', 'visited', 'results', 'links'):
+                self._conn.execute(f"DELETE FROM {table}")
+            self._set_meta('start_url', start_url)
+            self._set_meta('config', json.dumps(config or {}))
+            self._set_meta('finished', '0')
+
+    def load(self, start_url: str) -> Optional[dict]:
+        """
+        Read back the state of an earlier crawl of ``start_url``.
+
+        Rows written by pages that never finished are discarded first.
+
+        Returns:
+            dict: ``pending`` [(url, depth)] in queue order, ``done`` [url],
+            ``used`` pages counted against the budget, ``visited`` [(url, depth)],
+            ``results`` [row], ``links`` {url: (source, kind)} and ``finished``;
+            None if the database holds no crawl of ``start_url``
+        """
+        with self._lock:
+            if self._meta('start_url') != start_url:
+                return None
+            with self._conn:
+                self._conn.execute("BEGIN")
+                for table in ('visited', 'results', 'links'):
+                    self._conn.execute(f"DELETE FROM {table} WHERE item IS NULL OR item NOT IN (SELECT url FROM frontier WHERE done = 1)")
+
+            conn = self._conn
+            return {
+                'pending': conn.execute("SELECT url, depth FROM frontier WHERE done = 0 ORDER BY seq").fetchall(),
+                'done': [url for url, in conn.execute("SELECT url FROM frontier WHERE done = 1")],
+                'used': conn.execute("SELECT COUNT(*) FROM frontier WHERE done = 1 AND counted = 1").fetchone()[0],
+                'visited': conn.execute("SELECT url, depth FROM visited").fetchall(),
+                'results': [tuple(row) for row in conn.execute("SELECT url, test, status, comments FROM results ORDER BY id")],
+                'links': {url: (source, kind) for url, source, kind in conn.execute("SELECT url, source, kind FROM links")},
+                'finished': self._meta('finished') == '1',
+            }
+
+    def mark_finished(self, stats: Optional[dict] = None):
+        self.flush()
+        with self._lock:
+            self._set_meta('finished', '1')
+            if stats is not None:
+                self._set_meta('stats', json.dumps(stats, default=str))
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,737 @@
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import urljoin, urlparse
+
+import requests
+from selenium.common.exceptions import TimeoutException
+
+from .crawl_state import CrawlState
+from .fetcher import HttpFetcher, RenderPolicy
+from .frontier import Frontier, PageBudget, VisitedSet
+from .incremental import PageCache, content_hash
+from .load_profiles import PROFILES, LoadProfile, ProfileStats, apply_profile, clear_profile, get_profile, page_metrics
+from .pages import BrowserPage, CachedPage, HtmlPage
+from .readiness import ReadinessWaiter
+from .results import ResultTable
+from .seen import make_seen_set
+from .sitemaps import SitemapReader
+from .throttle import HostThrottle
+from .timing import make_timer
+from .urlnorm import UrlNormalizer
+
+# Registry of page checks: name -> callable(page, report)
+CHECKS: Dict[str, Callable] = OrderedDict()
+
+
+def register_check(name: str, profile: str = 'dom'):
+    """
+    Register a page check under ``name``.
+
+    A check is called once per loaded page as ``check(page, report)`` where
+    ``page`` is a :class:`BrowserPage` or :class:`HtmlPage` (read it through
+    ``page.snapshot()``) and ``report(url, test, status, comments)``
+    records a result row. ``profile`` names the load profile (see
+    ``src/load_profiles.py``) with the resources the check needs.
+    """
+    def decorator(func):
+        func.check_name = name
+        func.load_profile = profile
+        CHECKS[name] = func
+        return func
+    return decorator
+
+
+def get_checks(names: Optional[Iterable[str]] = None) -> List[Callable]:
+    """Return the registered checks, optionally limited to ``names``."""
+    if names is None:
+        return list(CHECKS.values())
+    return [CHECKS[name] for name in names]
+
+
+def _legacy_key(url):
+    """Dedup key of the crawler before URL normalization: scheme, host and path, trailing slash dropped."""
+    parsed = urlparse(url.rstrip('/'))
+    return f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+
+
+def _seen_options(options, role):
+    """
+    ``seen_options`` for the frontier's or the visited set's backend.
+
+    The two sets hold different URLs, so a disk ``path`` becomes one file per
+    set (``seen.db`` -> ``seen.frontier.db``); one shared SQLite file would
+    mix them and lock one set out while the other has a batch open.
+    """
+    options = dict(options or {})
+    if options.get('path'):
+        root, extension = os.path.splitext(options['path'])
+        options['path'] = f"{root}.{role}{extension}"
+    return options
+
+
+class CrawlEngine:
+    def __init__(self, start_url: str, checks: Iterable[Callable], driver_pool, max_workers: int = 10, max_depth: int = 3, max_links: int = 40, retries: int = 2, max_pending: Optional[int] = None, fetch_mode: str = 'browser', render_policy: Optional[RenderPolicy] = None, collect_links: bool = False, load_profile=None, measure_savings: bool = True, readiness=None, state_path: Optional[str] = None, resume: bool = False, incremental: Optional[str] = None, on_result: Optional[Callable] = None, keep_results: bool = True, compact_results: bool = False, frontier=None, visited=None, throttle: Optional[HostThrottle] = None, normalizer: Optional[UrlNormalizer] = None, seen_backend: str = 'exact', seen_options: Optional[dict] = None, sitemaps=None, sitemap_since=None, timing=None):
+        """
+        Crawl a site once and run every page check against each loaded page.
+
+        Args:
+            start_url (str): First page of the crawl
+            checks (iterable): Page checks to run, see :func:`register_check`
+            driver_pool (DriverPool): Pool the browsers are borrowed from
+            max_workers (int): Number of pages loaded concurrently
+            max_depth (int): How many link levels to follow from the start page
+            max_links (int): Maximum number of pages to visit
+            retries (int): Attempts per page on navigation timeouts
+            max_pending (int): Cap on queued URLs, defaults to four times ``max_links``
+            fetch_mode (str): ``'browser'`` loads every page in Chrome; ``'http'`` downloads
+                pages over a pooled session and only falls back to a browser when
+                ``render_policy`` says the page needs JavaScript
+            render_policy (RenderPolicy): Rules and heuristics for escalating to a browser
+            collect_links (bool): Record every internal, external and image URL seen on
+                tested pages in ``discovered_links`` (url -> (source page, kind))
+            load_profile (str or LoadProfile): Resources browsers may download for this
+                crawl; defaults to the smallest profile covering every check's needs
+            measure_savings (bool): Load the start page once without blocking to
+                estimate the bytes and time the profile saves
+            readiness (str or ReadinessWaiter): How to decide a browser page is ready,
+                a strategy name from ``src/readiness.py`` or a configured waiter
+            state_path (str): SQLite file the frontier, visited pages and results are
+                journaled to (see ``src/crawl_state.py``), None to keep state in memory only
+            resume (bool): Continue the crawl journaled in ``state_path`` instead of
+                starting over; pages finished before the interruption are not loaded again
+            incremental (str): SQLite file of validators and results kept between runs
+                (see ``src/incremental.py``); pages whose ETag/Last-Modified or content
+                hash show no change are not loaded again and their previous results are reused
+            on_result (callable): Called as ``on_result(url, test, status, comments)`` from the
+                worker threads as each result is reported, e.g. to stream it to a sink
+            keep_results (bool): Also collect results in memory and return them from
+                :meth:`run`; turn off when ``on_result`` persists them
+            compact_results (bool): Collect results in a :class:`ResultTable` (interned,
+                array-backed columns) instead of a list of tuples, for very large crawls
+            frontier (Frontier): Frontier to crawl from instead of a local one, e.g. a
+                :class:`~src.coordinator.SharedFrontier` when the crawl is sharded across processes
+            visited (VisitedSet): Visited set to claim pages in, shared along with ``frontier``
+            throttle (HostThrottle): Per-host rate limits, adaptive concurrency and robots.txt
+                rules every page load waits for; pass the same instance to the link checker
+                to share them. Defaults to one allowing up to ``max_workers`` requests per host
+            normalizer (UrlNormalizer): Canonicalizes every queued link and loaded page URL
+                before the frontier and visited checks (query allow/deny lists, encoding,
+                host and slash variants); the start URL's host is added as canonical host
+            seen_backend (str): How the frontier and visited sets remember URLs (see
+                ``src/seen.py``): ``'exact'`` (Python set), ``'fingerprint'`` (8-byte digests),
+                ``'bloom'`` (scalable Bloom filter) or ``'disk'`` (SQLite); the last three
+                bound memory for crawls discovering millions of URLs
+            seen_options (dict): Options of the backend, e.g. ``{'error_rate': 1e-5}`` for ``'bloom'``;
+                a ``'disk'`` ``path`` gets a ``.frontier`` / ``.visited`` suffix, one file per set
+            sitemaps (bool or iterable): Seed the frontier with the pages listed in sitemaps
+                (see ``src/sitemaps.py``): True reads the ``Sitemap:`` entries of the start
+                host's robots.txt (``/sitemap.xml`` if there are none), or give sitemap URLs.
+                Seeded pages start at depth 0, so ``max_depth=0`` tests only them
+            sitemap_since (datetime or timedelta): Only seed pages whose ``<lastmod>`` is this
+                recent, e.g. ``timedelta(days=7)`` to test the pages changed last week
+            timing (PhaseTimer or bool): Time every phase of each page (queue wait, browser
+                checkout, navigation, readiness wait, HTTP fetch, each check, link extraction)
+                and count retries (see ``src/timing.py``); True for a new timer. Off by default
+        """
+        if fetch_mode not in ('browser', 'http'):
+            raise ValueError(f"Unknown fetch mode: {fetch_mode}")
+
+        self.normalizer = normalizer or UrlNormalizer()
+        self.normalizer.add_canonical_host(urlparse(start_url).hostname or '')
+        self.start_url = self.normalizer.normalize(start_url) or start_url
+        self.start_domain = urlparse(self.start_url).netloc
+        self.checks = list(checks)
+        self.driver_pool = driver_pool
+        self.max_workers = max_workers
+        self.max_depth = max_depth
+        self.max_links = max_links
+        self.retries = retries
+        self.fetch_mode = fetch_mode
+        self.render_policy = render_policy or RenderPolicy()
+        self.page_cache = PageCache(incremental) if incremental else None
+        self.throttle = throttle or HostThrottle(max_concurrency=max_workers)
+        self._owns_throttle = throttle is None
+        self.fetcher = HttpFetcher(pool_size=max_workers, throttle=self.throttle) if fetch_mode == 'http' or self.page_cache else None
+        self.load_profile = get_profile(load_profile) or LoadProfile.union(
+            PROFILES[getattr(check, 'load_profile', 'full')] for check in self.checks
+        )
+        self.profile_stats = ProfileStats(self.load_profile)
+        self.measure_savings = measure_savings
+        self.readiness = readiness if isinstance(readiness, ReadinessWaiter) else ReadinessWaiter(readiness or 'load')
+        self.timing = make_timer(timing)
+        self._queued_at = {}  # URL -> time it was queued, only while timing
+
+        # deque.append is atomic, so workers record results without taking a lock
+        self.results = ResultTable() if compact_results else deque()
+        self.on_result = on_result
+        self.keep_results = keep_results
+        self._restored_results = []
+        self.seen_backend = seen_backend
+        self.visited_urls = visited if visited is not None else VisitedSet(make_seen_set(seen_backend, **_seen_options(seen_options, 'visited')))
+        self.discovered_links = {} if collect_links else None
+        self.budget = PageBudget(max_links)
+        self.frontier = frontier if frontier is not None else Frontier(
+            max_depth=max_depth, max_pending=max_pending or max_links * 4, seen=make_seen_set(seen_backend, **_seen_options(seen_options, 'frontier'))
+        )
+        self.navigations = 0
+        self.http_fetches = 0
+        self.escalations = 0
+        self.revalidations = 0
+        self.not_modified = 0
+        self.duplicates_prevented = 0  # links only recognized as known pages after normalization
+        self.reused_urls = set()  # final URLs whose results were reused from the page cache
+        self.page_depths = {}  # final URL -> crawl depth of every tested page, for reports
+        self.stats = {}
+
+        self._busy_time = 0.0
+        self._page_times = deque()  # seconds per tested page, for latency percentiles
+        self._stats_lock = threading.Lock()
+        self._local = threading.local()  # frontier URL and depth each worker is processing
+
+        self.state = CrawlState(state_path) if state_path else None
+        self.resumed_pages = 0
+        resumed = self._restore(resume) if self.state else False
+        if not self.state:
+            self._push(self.start_url, 0)
+
+        self.sitemap_stats = {}
+        if sitemaps and not resumed:
+            self._seed_from_sitemaps(sitemaps, sitemap_since, max_pending or max_links * 4)
+
+    def _restore(self, resume):
+        """Load the journaled crawl of ``start_url``, or start a fresh journal."""
+        saved = self.state.load(self.start_url) if resume else None
+        if saved is None:
+            if resume:
+                print(f"[WARNING] No saved crawl of {self.start_url} in {self.state.path}; starting over")
+            self.state.reset(self.start_url, {'max_depth': self.max_depth, 'max_links': self.max_links})
+            self._push(self.start_url, 0)
+            return False
+
+        for url in saved['done']:
+            self.frontier.mark_seen(url)
+        # These URLs were queued within the cap before the crawl stopped; a cap
+        # applied again would drop them for good, as they are already seen
+        for url, depth in saved['pending']:
+            self.frontier.push(url, depth, force=True)
+        for url, depth in saved['visited']:
+            self.visited_urls.claim(url)
+            if depth is not None:
+                self.page_depths[url] = depth  # for the report's Summary by Depth
+        self._restored_results = saved['results']  # emitted when the crawl starts
+        if self.discovered_links is not None:
+            self.discovered_links.update(saved['links'])
+        self.budget.used = min(saved['used'], self.max_links)
+        self.resumed_pages = len(saved['done'])
+        print(
+            f"Resuming crawl from {self.state.path}: {self.resumed_pages} pages done, "
+            f"{len(saved['pending'])} queued, {len(saved['results'])} results."
+        )
+        return True
+
+    def _seed_from_sitemaps(self, sitemaps, since, limit):
+        """Queue the start host's pages listed in ``sitemaps``, reading no further than ``limit`` queued URLs."""
+        reader = SitemapReader(self.throttle)
+        seeded = 0
+        try:
+            sitemap_urls = reader.discover(self.start_url) if sitemaps is True else list(sitemaps)
+            for url, _ in reader.urls(sitemap_urls, since):
+                canonical_url = self.normalizer.normalize(url)
+                if canonical_url is None or urlparse(canonical_url).netloc != self.start_domain:
+                    continue
+                if self._push(canonical_url, 0):
+                    seeded += 1
+                # Stop reading once the frontier is full rather than stream the rest for nothing
+                if seeded >= limit or len(self.frontier) >= limit:
+                    break
+        finally:
+            reader.close()
+        self.sitemap_stats = {'sitemap_seeded': seeded, **reader.stats()}
+        print(
+            f"Seeded {seeded} pages from {reader.sitemaps_read} sitemaps"
+            + (f" ({reader.stale} not modified since the cutoff, {reader.undated} undated skipped)" if since else '') + "."
+        )
+
+    def _push(self, url, depth):
+        pushed = self.frontier.push(url, depth)
+        if pushed and self.timing.enabled:
+            self._queued_at[url] = time.perf_counter()
+        if pushed and self.state:
+            self.state.record_push(url, depth)
+        return pushed
+
+    def _claim(self, url):
+        """Claim a final page URL for the current worker."""
+        if not self.visited_urls.claim(url, getattr(self._local, 'item', None), getattr(self._local, 'depth', None)):
+            return False
+        if self.state:
+            self.state.record_claim(self._local.item, url, getattr(self._local, 'depth', None))
+        return True
+
+    def add_result(self, url, test, status, comments):
+        row = (url, test, status, comments)
+        self._emit(row)
+        if self.state:
+            self.state.record_result(getattr(self._local, 'item', None), row)
+
+    def _emit(self, row):
+        if self.keep_results:
+            self.results.append(row)
+        if self.on_result:
+            self.on_result(*row)
+
+    def _wait_for_page_load(self, driver, url=None):
+        """Wait until the page is ready; the time spent is recorded by the readiness waiter."""
+        self.readiness.wait_for_page(driver, label=url)
+
+    def _run_checks(self, page):
+        """Run every check on ``page``; returns the ``(check, url, test, status, comments)`` rows reported."""
+        rows = []
+        for check in self.checks:
+            name = getattr(check, 'check_name', check.__name__)
+
+            def report(url, test, status, comments, name=name):
+                self.add_result(url, test, status, comments)
+                rows.append((name, url, test, status, comments))
+
+            try:
+                with self.timing.phase(f'check:{name}'):
+                    check(page, report)
+            except Exception as e:
+                print(f"[ERROR] URL: {page.url} - Error during {name} check: {e}")
+                report(page.url, name, "Error", str(e))
+        return rows
+
+    def _queue_links(self, page):
+        """Queue new links from the current page, staying within the same domain."""
+        snapshot = page.snapshot()
+        discovered = self.discovered_links
+        for href in snapshot.hrefs:
+            if href and not href.startswith(('javascript:', '#')):
+                absolute_url = urljoin(page.url, href)
+                canonical_url = self.normalizer.normalize(absolute_url)
+                if canonical_url is None:
+                    continue  # mailto:, tel:, malformed
+                internal = urlparse(canonical_url).netloc == self.start_domain
+                if discovered is not None:
+                    self._discover(absolute_url.split('#')[0], page.url, 'internal' if internal else 'external')
+
+                if internal:
+                    pushed = self._push(canonical_url, page.depth + 1)
+                    self._count_prevented(absolute_url, canonical_url, duplicate=not pushed and canonical_url in self.frontier)
+
+        if discovered is not None:
+            for image in snapshot.images:
+                src = image.get('src')
+                if src and urlparse(src).scheme in ('http', 'https'):
+                    self._discover(src, page.url, 'image')
+
+    def _count_prevented(self, absolute_url, canonical_url, duplicate):
+        """
+        Count links only recognized as known pages thanks to normalization.
+
+        A link counts if it is a duplicate of a known page but its key under the
+        old scheme+host+path dedup differs from the page's, i.e. the old dedup
+        would not have matched them. No per-link state is kept, so a variant
+        linked from several pages counts each time; the figure is an upper bound.
+        """
+        if not duplicate or _legacy_key(absolute_url) == _legacy_key(canonical_url):
+            return
+        with self._stats_lock:
+            self.duplicates_prevented += 1
+
+    def _discover(self, url, source, kind):
+        # dict.setdefault is atomic, so concurrent workers keep the first source
+        entry = (source, kind)
+        if self.discovered_links.setdefault(url, entry) is entry and self.state:
+            self.state.record_link(self._local.item, url, source, kind)
+
+    def _test_page(self, page):
+        print(f"Testing URL: {page.url} (Depth: {page.depth})")
+        self.page_depths[page.url] = page.depth
+        rows = self._run_checks(page)
+        with self.timing.phase('link_extraction'):
+            self._queue_links(page)
+
+        validators = self._local.validators
+        if validators and not any(row[3] == "Error" for row in rows):
+            self.page_cache.store(getattr(self._local, 'item', page.url), page.url, validators, self._check_names(), page.snapshot(), rows)
+
+    def _check_names(self):
+        return {getattr(check, 'check_name', check.__name__) for check in self.checks}
+
+    def _revalidate(self, url, depth):
+        """
+        Ask the server whether ``url`` changed since it was last tested, reusing its results if not.
+
+        A conditional GET answered with 304, or a 200 whose content hash matches
+        the stored one, counts as unchanged. Otherwise the response is kept so
+        the page is not downloaded twice, along with the validators to store
+        once the page has been tested.
+
+        Returns:
+            bool: Same as :meth:`process_page` if cached results were reused, None if the page must be tested
+        """
+        cached = self.page_cache.get(url)
+        if cached is not None and not self._check_names() <= cached.checks:
+            cached = None  # Some selected checks never ran on this page
+
+        try:
+            with self._stats_lock:
+                self.revalidations += 1
+            with self.timing.phase('http_fetch'):
+                result = self.fetcher.fetch(url, headers=cached.conditional_headers() if cached else None)
+        except requests.exceptions.RequestException:
+            return None  # The regular path reports the failure
+
+        if result.status_code == 304 and cached is not None:
+            with self._stats_lock:
+                self.not_modified += 1
+            return self._reuse(cached, depth)
+        if result.status_code != 200 or not result.is_html:
+            return None
+
+        digest = content_hash(result.content, result.url)
+        if cached is not None and digest == cached.content_hash:
+            self.page_cache.refresh_validators(url, result.headers.get('ETag'), result.headers.get('Last-Modified'))
+            return self._reuse(cached, depth)
+
+        self._local.prefetched = result
+        self._local.validators = (result.headers.get('ETag'), result.headers.get('Last-Modified'), digest)
+        return None
+
+    def _reuse(self, cached, depth):
+        """Report the stored results of an unchanged page and queue its stored links."""
+        if not self._claim(cached.final_url):
+            return False
+        print(f"Reusing results for unchanged URL: {cached.final_url} (Depth: {depth})")
+        self.reused_urls.add(cached.final_url)
+        self.page_depths[cached.final_url] = depth
+        names = self._check_names()
+        for check_name, *row in cached.results:
+            if check_name in names:
+                self.add_result(*row)
+        self._queue_links(CachedPage(cached.snapshot, cached.final_url, depth))
+        return True
+
+    def process_page(self, url, depth):
+        """
+        Load a page once, run every check on it and queue its links.
+
+        Returns:
+            bool: True if the page counts against ``max_links`` (tested or failed to load)
+        """
+        if depth > self.max_depth:
+            return False
+        if not self.throttle.allowed(url):
+            print(f"[WARNING] Skipping {url}: disallowed by robots.txt")
+            return False
+
+        self._local.prefetched = None
+        self._local.validators = None
+        if self.page_cache is not None:
+            reused = self._revalidate(url, depth)
+            if reused is not None:
+                return reused
+
+        if self.fetch_mode == 'http' and self.render_policy.mode_for(url) != 'browser':
+            counted = self._process_over_http(url, depth)
+            if counted is not None:
+                return counted
+            with self._stats_lock:
+                self.escalations += 1
+
+        return self._process_in_browser(url, depth)
+
+    def _process_over_http(self, url, depth):
+        """
+        Fetch and test a page without a browser.
+
+        Returns:
+            bool: Same as :meth:`process_page`, or None if the page needs rendering
+        """
+        try:
+            result = self._local.prefetched
+            if result is None:
+                with self._stats_lock:
+                    self.http_fetches += 1
+                with self.timing.phase('http_fetch'):
+                    result = self.fetcher.fetch(url)
+        except requests.exceptions.RequestException as e:
+            print(f"[ERROR] URL: {url} - HTTP fetch failed: {e}")
+            self.add_result(url, "Page Load", "Fail", str(e))
+            return True
+
+        final_url = self.normalizer.normalize(result.url) or result.url
+        if urlparse(final_url).netloc != self.start_domain or not result.is_html:
+            return False
+
+        page = HtmlPage(result.content, final_url, depth, status_code=result.status_code)
+        if self.render_policy.needs_rendering(page):
+            return None
+
+        if not self._claim(final_url):
+            return False
+        self._test_page(page)
+        return True
+
+    def _apply_load_profile(self, driver, profile):
+        try:
+            if profile.blocked_urls():
+                apply_profile(driver, profile)
+            else:
+                clear_profile(driver)
+        except Exception as e:
+            # Non-Chromium drivers have no CDP; load everything
+            print(f"[WARNING] Could not apply load profile '{profile.name}': {e}")
+
+    def _record_page_metrics(self, driver):
+        try:
+            metrics = page_metrics(driver)
+        except Exception:
+            return
+        with self._stats_lock:
+            self.profile_stats.add(metrics)
+
+    def _measure_baseline(self):
+        """Load the start page with nothing blocked to get a reference for the savings report."""
+        driver = self.driver_pool.checkout()
+        try:
+            self._apply_load_profile(driver, PROFILES['full'])
+            with self._stats_lock:
+                self.navigations += 1
+            self.readiness.install(driver)
+            driver.get(self.start_url)
+            self._wait_for_page_load(driver)
+            self.profile_stats.baseline = page_metrics(driver)
+        except Exception as e:
+            print(f"[WARNING] Could not measure baseline page load: {e}")
+        finally:
+            self.driver_pool.checkin(driver)
+
+    def _process_in_browser(self, url, depth):
+        # Includes launching a browser when none is idle (also timed as 'browser_launch' by a timed pool)
+        with self.timing.phase('driver_checkout'):
+            driver = self.driver_pool.checkout()
+        try:
+            self._apply_load_profile(driver, self.load_profile)
+            self.readiness.install(driver)
+            for attempt in range(self.retries):
+                try:
+                    with self._stats_lock:
+                        self.navigations += 1
+                    with self.throttle.request(url):
+                        with self.timing.phase('navigate'):
+                            driver.get(url)
+                        with self.timing.phase('page_load_wait'):
+                            self._wait_for_page_load(driver, url)
+                    self._record_page_metrics(driver)
+
+                    # Capture final redirected URL and claim it atomically so no
+                    # other worker tests the same page
+                    final_url = self.normalizer.normalize(driver.current_url) or driver.current_url
+                    final_url_parsed = urlparse(final_url)
+                    if final_url_parsed.netloc != self.start_domain or not self._claim(final_url):
+                        return False
+
+                    self._test_page(BrowserPage(driver, final_url, depth))
+                    return True
+                except TimeoutException as e:
+                    if attempt < self.retries - 1:
+                        print(f"[WARNING] Timeout on {url}, retrying ({attempt + 1}/{self.retries})...")
+                        self.timing.count('retries')
+                        time.sleep(1)  # Wait before retrying
+                    else:
+                        print(f"[ERROR] URL: {url} - Timeout after {self.retries} attempts.")
+                        self.timing.count('page_load_timeouts')
+                        self.add_result(url, "Page Load", "Fail", str(e))
+                        return True
+
+        except Exception as e:
+            print(f"Error testing URL {url}: {e}")
+        finally:
+            self.driver_pool.checkin(driver)
+        return False
+
+    def _run_page(self, url, depth):
+        """Process a page whose budget slot is already reserved, then settle the slot."""
+        started = time.perf_counter()
+        counted = False
+        interrupted = False
+        self._local.item = url
+        self._local.depth = depth
+        if self.timing.enabled:
+            self.timing.start_page()
+            queued_at = self._queued_at.pop(url, None)
+            if queued_at is not None:
+                self.timing.record('queue_wait', started - queued_at)
+        try:
+            counted = self.process_page(url, depth)
+        except (KeyboardInterrupt, SystemExit):
+            # Leave the page pending in the journal so a resumed crawl tests it again
+            interrupted = True
+            raise
+        finally:
+            if counted:
+                self.budget.commit()
+            else:
+                self.budget.release()
+            if not interrupted:
+                self.frontier.task_done(url, counted)
+                if self.state:
+                    self.state.record_done(url, counted)
+            elapsed = time.perf_counter() - started
+            self.timing.end_page(url, elapsed)
+            if counted:
+                self._page_times.append(elapsed)
+            with self._stats_lock:
+                self._busy_time += elapsed
+
+    def _schedule(self, executor, in_flight):
+        """Fill every free worker slot from the frontier without overrunning the page budget."""
+        while len(in_flight) < self.max_workers and self.budget.acquire():
+            item = self.frontier.pop()
+            if item is None:
+                self.budget.release()
+                return
+            url, depth = item
+            in_flight[executor.submit(self._run_page, url, depth)] = item
+
+    def _latency_summary(self):
+        times = sorted(self._page_times)
+        if not times:
+            return {}
+        return {
+            'p50_page_s': times[len(times) // 2],
+            'p95_page_s': times[min(len(times) - 1, int(len(times) * 0.95))],
+        }
+
+    def run(self):
+        """
+        Crawl pages with a streaming scheduler.
+
+        A worker slot is refilled from the frontier as soon as its page finishes,
+        so one slow page never holds back the others. The crawl stops once no page
+        is in flight and the frontier is drained or ``max_links`` is reached.
+
+        The frontier and ``visited_urls`` are closed when this returns, even on
+        an error, so a disk seen-set releases its file; ``page_depths`` keeps
+        the tested page URLs.
+        """
+        if self.measure_savings and self.fetch_mode == 'browser' and self.load_profile.blocked_urls() and not self.resumed_pages:
+            self._measure_baseline()
+
+        for row in self._restored_results:
+            self._emit(row)
+        self._restored_results = []
+
+        started = time.perf_counter()
+        in_flight = {}
+        crawled = False
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                try:
+                    while True:
+                        self._schedule(executor, in_flight)
+                        if not in_flight:
+                            # A shared frontier may still receive URLs from other workers
+                            if self.frontier.wait_for_work():
+                                continue
+                            break
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            url, depth = in_flight.pop(future)
+                            try:
+                                future.result()
+                            except Exception as e:
+                                print(f"Error processing {url}: {e}")
+                except KeyboardInterrupt:
+                    # Pages already loading are finished and journaled; queued ones stay pending
+                    for future in in_flight:
+                        future.cancel()
+                    if self.state:
+                        print(f"[WARNING] Crawl interrupted; run again with resume=True to continue from {self.state.path}")
+                    raise
+            crawled = True
+        finally:
+            if self.fetcher:
+                self.fetcher.close()
+            if self._owns_throttle:
+                self.throttle.close()
+            if self.state and not crawled:
+                # Write the buffered batch and release the journal; it is marked finished only on success
+                self.state.close()
+            if self.page_cache:
+                self.page_cache.close()
+            # Read for the stats below before closing, so a failed crawl does not leak them
+            seen_urls = self.frontier.stats()['seen']
+            seen_bytes = self.frontier.nbytes() + self.visited_urls.nbytes()
+            pages = len(self.visited_urls)
+            self.frontier.close()
+            self.visited_urls.close()
+
+        wall_time = time.perf_counter() - started
+        self.stats = {
+            'pages': pages,
+            'resumed_pages': self.resumed_pages,
+            'navigations': self.navigations,
+            'http_fetches': self.http_fetches,
+            'escalations': self.escalations,
+            'reused_pages': len(self.reused_urls),
+            'duplicate_navigations_prevented': self.duplicates_prevented,
+            'seen_backend': self.seen_backend,
+            'seen_urls': seen_urls,
+            'seen_memory_mb': seen_bytes / 1024 / 1024,
+            'revalidations': self.revalidations,
+            'not_modified': self.not_modified,
+            'wall_time': wall_time,
+            'busy_time': self._busy_time,
+            'worker_utilization': self._busy_time / (wall_time * self.max_workers) if wall_time else 0.0,
+            **self._latency_summary(),
+            **self.profile_stats.summary(),
+            **self.readiness.summary(),
+            **self.throttle.summary(),
+            **self.sitemap_stats,
+            **self.timing.summary(),
+        }
+        print(
+            f"Crawl finished: {self.stats['pages']} pages, {self.navigations} browser navigations, "
+            f"{self.http_fetches} HTTP fetches ({self.escalations} escalated to a browser), "
+            f"{len(self.checks)} checks per page, {wall_time:.1f}s, "
+            f"worker utilization {self.stats['worker_utilization']:.0%}, "
+            f"{self.duplicates_prevented} duplicate navigations prevented by URL normalization."
+        )
+        print(f"Seen set ({self.seen_backend}): {self.stats['seen_urls']} URLs in {self.stats['seen_memory_mb']:.1f} MB.")
+        if self.stats.get('waits'):
+            print(
+                f"Readiness waits ({self.readiness.strategy}): avg {self.stats['avg_wait_s']:.2f}s, "
+                f"p95 {self.stats['p95_wait_s']:.2f}s, {self.stats['wait_timeouts']} timeouts."
+            )
+        if self.page_cache:
+            print(
+                f"Incremental: {len(self.reused_urls)} pages unchanged and reused "
+                f"({self.not_modified} answered 304), {self.stats['pages'] - len(self.reused_urls)} tested."
+            )
+        if self.stats['backoffs'] or self.stats['robots_blocked']:
+            print(
+                f"Throttling: {self.stats['overloaded_responses']} overloaded responses, {self.stats['backoffs']} backoffs, "
+                f"{self.stats['throttle_wait_s']:.1f}s waiting for host slots, {self.stats['robots_blocked']} pages disallowed by robots.txt."
+            )
+        if 'estimated_bytes_saved' in self.stats:
+            print(
+                f"Load profile '{self.load_profile.name}' saved about "
+                f"{self.stats['estimated_bytes_saved'] / 1024 / 1024:.1f} MB and "
+                f"{self.stats['estimated_time_saved_s']:.1f}s of page load time."
+            )
+        if self.state:
+            try:
+                self.state.mark_finished(self.stats)
+            finally:
+                self.state.close()
+        if not isinstance(self.results, ResultTable):
+            self.results = list(self.results)
+        return self.results
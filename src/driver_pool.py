@@ -0,0 +1,275 @@
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+from .load_profiles import clear_profile
+from .timing import make_timer
+
+
+def _process_tree_rss(pid: int) -> Optional[int]:
+    """
+    Return the resident set size in bytes of a process and all its descendants.
+
+    Reads /proc directly so no extra dependency is needed. Returns None on
+    platforms without /proc or if the process has already exited.
+    """
+    if not os.path.isdir('/proc'):
+        return None
+
+    total = 0
+    pending = [pid]
+    seen = set()
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        try:
+            with open(f'/proc/{current}/statm') as statm:
+                total += int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+            for task in os.listdir(f'/proc/{current}/task'):
+                with open(f'/proc/{current}/task/{task}/children') as children:
+                    pending.extend(int(child) for child in children.read().split())
+        except (OSError, ValueError, IndexError):
+            if current == pid:
+                return None
+    return total
+
+
+class _DriverInfo:
+    __slots__ = ('created_at', 'pages_served')
+
+    def __init__(self):
+        self.created_at = time.monotonic()
+        self.pages_served = 0
+
+
+class DriverPool:
+    def __init__(
+        self,
+        options: Optional[webdriver.ChromeOptions] = None,
+        size: int = 4,
+        max_pages_per_driver: int = 50,
+        max_rss_mb: Optional[int] = 1024,
+        checkout_timeout: Optional[float] = None,
+        timing=None
+    ):
+        """
+        Pool of long-lived Chrome WebDriver instances shared between crawler threads.
+
+        Drivers are created lazily up to ``size``, handed out with ``checkout()``
+        and given back with ``checkin()``. On return a browser is reset (cookies,
+        storage, about:blank) and health-checked; it is recycled after
+        ``max_pages_per_driver`` pages or once its process tree exceeds
+        ``max_rss_mb``, and crashed instances are reaped and replaced.
+
+        Args:
+            options (ChromeOptions): Options used for every browser in the pool
+            size (int): Maximum number of live browsers, usually ``max_workers``
+            max_pages_per_driver (int): Pages served before a browser is recycled
+            max_rss_mb (int): RSS ceiling in MB for a browser process tree, None to disable
+            checkout_timeout (float): Seconds to wait for a free browser, None to wait forever
+            timing (PhaseTimer or bool): Timer browser launches are recorded in as
+                ``browser_launch`` (see ``src/timing.py``), off if None
+        """
+        self.options = options or webdriver.ChromeOptions()
+        self.size = size
+        self.max_pages_per_driver = max_pages_per_driver
+        self.max_rss_mb = max_rss_mb
+        self.checkout_timeout = checkout_timeout
+        self.timing = make_timer(timing)
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._info: Dict[int, _DriverInfo] = {}
+        self._driver_path = None
+
+        # Counters surfaced through stats()
+        self.launched = 0
+        self.recycled = 0
+        self.reaped = 0
+
+    def _service(self) -> Service:
+        # ChromeDriverManager().install() resolves the driver over the network,
+        # so do it once per pool rather than once per browser.
+        with self._lock:
+            if self._driver_path is None:
+                self._driver_path = ChromeDriverManager().install()
+            return Service(self._driver_path)
+
+    def _launch(self) -> webdriver.Chrome:
+        with self.timing.phase('browser_launch'):
+            driver = webdriver.Chrome(service=self._service(), options=self.options)
+        with self._lock:
+            self._info[id(driver)] = _DriverInfo()
+            self.launched += 1
+        return driver
+
+    def _discard(self, driver, reaped: bool = False):
+        """Quit a browser and forget about it, killing chromedriver if quit fails."""
+        with self._lock:
+            self._info.pop(id(driver), None)
+            if reaped:
+                self.reaped += 1
+            else:
+                self.recycled += 1
+        try:
+            driver.quit()
+        except Exception:
+            try:
+                driver.service.process.kill()
+            except Exception:
+                pass
+
+    def _is_healthy(self, driver) -> bool:
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _reset(self, driver):
+        """Clear per-page state so the next checkout starts from a clean browser."""
+        clear_profile(driver)
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except WebDriverException:
+            # Storage is not accessible on some origins (e.g. about: or data: pages)
+            pass
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+
+    def _rss_exceeded(self, driver) -> bool:
+        if not self.max_rss_mb:
+            return False
+        try:
+            pid = driver.service.process.pid
+        except AttributeError:
+            return False
+        rss = _process_tree_rss(pid)
+        return rss is not None and rss > self.max_rss_mb * 1024 * 1024
+
+    def checkout(self, timeout: Optional[float] = None) -> webdriver.Chrome:
+        """
+        Borrow a browser from the pool, launching one if none is idle.
+
+        Raises:
+            TimeoutError: If no browser becomes available within the timeout
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No browser available in the pool after {timeout}s")
+
+        try:
+            while True:
+                try:
+                    driver = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._launch()
+                if self._is_healthy(driver):
+                    return driver
+                self._discard(driver, reaped=True)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def checkin(self, driver, discard: bool = False):
+        """
+        Return a browser to the pool after resetting and health-checking it.
+
+        Args:
+            driver: A browser previously obtained from ``checkout()``
+            discard (bool): Quit the browser instead of reusing it
+        """
+        try:
+            info = self._info.get(id(driver))
+            if info is None:
+                # Not ours (or already reaped); make sure it does not leak
+                self._discard(driver, reaped=True)
+                return
+
+            info.pages_served += 1
+            if discard or info.pages_served >= self.max_pages_per_driver or self._rss_exceeded(driver):
+                self._discard(driver)
+                return
+
+            try:
+                self._reset(driver)
+            except Exception:
+                # Not only WebDriverException: a dead chromedriver raises urllib3/requests connection errors
+                self._discard(driver, reaped=True)
+                return
+
+            if not self._is_healthy(driver):
+                self._discard(driver, reaped=True)
+                return
+
+            self._idle.put(driver)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def driver(self):
+        """Context manager wrapper around ``checkout()``/``checkin()``."""
+        driver = self.checkout()
+        try:
+            yield driver
+        finally:
+            self.checkin(driver)
+
+    def reap(self):
+        """Quit every idle browser that no longer responds."""
+        healthy = []
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if self._is_healthy(driver):
+                healthy.append(driver)
+            else:
+                self._discard(driver, reaped=True)
+        for driver in healthy:
+            self._idle.put(driver)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'launched': self.launched,
+                'recycled': self.recycled,
+                'reaped': self.reaped,
+                'live': len(self._info),
+                'idle': self._idle.qsize(),
+            }
+
+    def close(self):
+        """
+        Quit all idle browsers.
+
+        The pool stays usable afterwards; new browsers are launched on demand.
+        """
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._info.pop(id(driver), None)
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
@@ -0,0 +1,133 @@
+import re
+import time
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+)
+
+# Empty mount points left behind by client-side rendered apps
+SPA_ROOT_IDS = ('root', 'app', '__next', '__nuxt')
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a ``Retry-After`` header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class FetchResult:
+    __slots__ = ('url', 'status_code', 'headers', 'content')
+
+    def __init__(self, url, status_code, headers, content):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def is_html(self) -> bool:
+        content_type = self.headers.get('Content-Type', '')
+        return not content_type or 'html' in content_type.lower()
+
+
+class HttpFetcher:
+    def __init__(self, pool_size: int = 10, timeout: float = 15, retries: int = 2, user_agent: str = DEFAULT_USER_AGENT, throttle=None):
+        """
+        Download pages over a pooled, keep-alive HTTP session.
+
+        Args:
+            pool_size (int): Connections kept open per host, usually ``max_workers``
+            timeout (float): Connect/read timeout in seconds
+            retries (int): Retries on connection errors and 502/503/504 responses, and on
+                429 responses when a ``throttle`` is given
+            user_agent (str): User-Agent header sent with every request
+            throttle (HostThrottle): Per-host rate limits and concurrency every request waits for
+        """
+        self.timeout = timeout
+        self.retries = retries
+        self.throttle = throttle
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = user_agent
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=retries, backoff_factor=0.5, status_forcelist=(502, 503, 504), allowed_methods=None)
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def fetch(self, url: str, headers: Optional[dict] = None) -> FetchResult:
+        if self.throttle is None:
+            response = self.session.get(url, timeout=self.timeout, headers=headers)
+        else:
+            for attempt in range(self.retries + 1):
+                with self.throttle.request(url) as outcome:
+                    response = self.session.get(url, timeout=self.timeout, headers=headers)
+                    outcome.status_code = response.status_code
+                    outcome.retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                # The throttle holds the host back for Retry-After before the next attempt
+                if response.status_code != 429 or attempt == self.retries:
+                    break
+        return FetchResult(response.url, response.status_code, response.headers, response.content)
+
+    def close(self):
+        self.session.close()
+
+
+class RenderPolicy:
+    def __init__(self, rules: Optional[Iterable[Tuple[str, str]]] = None, min_text_chars: int = 200):
+        """
+        Decide whether a page fetched over HTTP must be re-loaded in a browser.
+
+        Args:
+            rules (iterable): ``(url_regex, mode)`` pairs where mode is ``'browser'``
+                or ``'http'``; the first matching rule wins over the heuristics
+            min_text_chars (int): Pages without an <h1> and with less visible body
+                text than this are assumed to be rendered client-side
+        """
+        self.rules = [(re.compile(pattern), mode) for pattern, mode in (rules or [])]
+        self.min_text_chars = min_text_chars
+
+    def mode_for(self, url: str) -> Optional[str]:
+        """Return the mode forced by a URL rule, or None if no rule matches."""
+        for pattern, mode in self.rules:
+            if pattern.search(url):
+                return mode
+        return None
+
+    def needs_rendering(self, page) -> bool:
+        """Heuristically decide if an HTTP-parsed page is missing JavaScript-rendered content."""
+        forced = self.mode_for(page.url)
+        if forced is not None:
+            return forced == 'browser'
+
+        tree = page.tree
+        for root_id in SPA_ROOT_IDS:
+            mount = tree.xpath(f'//*[@id="{root_id}"]')
+            if mount and len(mount[0]) == 0 and not (mount[0].text or '').strip():
+                return True
+
+        if not any(level == 1 for level, _ in page.snapshot().headings):
+            text = ' '.join(tree.xpath(
+                '//body//text()[not(ancestor::script) and not(ancestor::style) and not(ancestor::noscript)]'
+            ))
+            if len(' '.join(text.split())) < self.min_text_chars:
+                return True
+
+        noscript = ' '.join(tree.xpath('//noscript//text()')).lower()
+        return 'enable javascript' in noscript
@@ -0,0 +1,233 @@
+import heapq
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from .seen import ExactSeenSet
+
+
+class Frontier:
+    def __init__(self, max_depth: Optional[int] = None, max_pending: Optional[int] = None, seen=None):
+        """
+        Thread-safe crawl frontier with constant-time enqueue, dequeue and dedup.
+
+        URLs are kept in one FIFO deque per priority level (lower values are
+        served first) next to a seen-set, so membership checks never scan the
+        queue. Every URL is enqueued at most once per crawl.
+
+        Args:
+            max_depth (int): URLs deeper than this are rejected, None for no limit
+            max_pending (int): Maximum number of queued URLs; further discoveries
+                are dropped (and not marked as seen) until the queue drains
+            seen: Seen-set backend from ``src/seen.py``, an exact in-memory set if None
+        """
+        self.max_depth = max_depth
+        self.max_pending = max_pending
+
+        self._queues: Dict[int, deque] = {}
+        self._priorities: List[int] = []  # Heap of priority levels with a non-empty queue
+        self._seen = seen if seen is not None else ExactSeenSet()
+        self._pending = 0
+        self._lock = threading.Lock()
+
+        # Counters for reporting
+        self.enqueued = 0
+        self.duplicates = 0
+        self.dropped = 0
+
+    def push(self, url: str, depth: int, priority: int = 0, force: bool = False) -> bool:
+        """
+        Queue ``url`` at ``depth`` unless it was seen before or is out of bounds.
+
+        Args:
+            url (str): URL to queue
+            depth (int): Crawl depth of the URL
+            priority (int): Queue level, lower values are served first
+            force (bool): Queue even if ``max_pending`` is reached, e.g. URLs
+                restored from a journal that were accepted before
+
+        Returns:
+            bool: True if the URL was queued
+        """
+        if self.max_depth is not None and depth > self.max_depth:
+            return False
+
+        with self._lock:
+            if url in self._seen:
+                self.duplicates += 1
+                return False
+            if not force and self.max_pending is not None and self._pending >= self.max_pending:
+                self.dropped += 1
+                return False
+
+            self._seen.add(url)
+            queue = self._queues.get(priority)
+            if queue is None:
+                queue = self._queues[priority] = deque()
+            if not queue:
+                heapq.heappush(self._priorities, priority)
+            queue.append((url, depth))
+            self._pending += 1
+            self.enqueued += 1
+            return True
+
+    def pop(self) -> Optional[Tuple[str, int]]:
+        """Return the next ``(url, depth)`` to crawl, or None if the frontier is empty."""
+        with self._lock:
+            while self._priorities:
+                priority = self._priorities[0]
+                queue = self._queues[priority]
+                if queue:
+                    item = queue.popleft()
+                    self._pending -= 1
+                    if not queue:
+                        heapq.heappop(self._priorities)
+                    return item
+                heapq.heappop(self._priorities)
+            return None
+
+    def mark_seen(self, url: str) -> bool:
+        """
+        Record ``url`` as seen without queueing it (e.g. a redirect target).
+
+        Returns:
+            bool: True if the URL had not been seen before
+        """
+        with self._lock:
+            if url in self._seen:
+                return False
+            self._seen.add(url)
+            return True
+
+    def task_done(self, url: str, counted: bool):
+        """Called once a popped URL has been processed; a local frontier has nothing to settle."""
+
+    def wait_for_work(self) -> bool:
+        """
+        Called when nothing is in flight and :meth:`pop` found no URL.
+
+        A local frontier only grows from pages in flight, so it is drained for
+        good; a shared frontier waits for URLs other workers may still queue.
+
+        Returns:
+            bool: True if the caller should try :meth:`pop` again
+        """
+        return False
+
+    def __contains__(self, url: str) -> bool:
+        with self._lock:
+            return url in self._seen
+
+    def __len__(self) -> int:
+        return self._pending
+
+    def __bool__(self) -> bool:
+        return self._pending > 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'pending': self._pending,
+                'seen': len(self._seen),
+                'enqueued': self.enqueued,
+                'duplicates': self.duplicates,
+                'dropped': self.dropped,
+            }
+
+    def nbytes(self) -> int:
+        with self._lock:
+            return self._seen.nbytes()
+
+    def close(self):
+        self._seen.close()
+
+
+class VisitedSet:
+    def __init__(self, seen=None):
+        """
+        Set of crawled URLs whose check-then-add is a single atomic ``claim``.
+
+        Two workers that land on the same final URL (e.g. after different
+        redirects) can never both claim it.
+
+        Args:
+            seen: Seen-set backend from ``src/seen.py``, an exact in-memory set if None
+        """
+        self._urls = seen if seen is not None else ExactSeenSet()
+        self._lock = threading.Lock()
+
+    def claim(self, url: str, item: Optional[str] = None, depth: Optional[int] = None) -> bool:
+        """
+        Atomically mark ``url`` as visited.
+
+        Args:
+            url (str): Final URL of the page
+            item (str): Frontier URL being processed (used by shared visited sets)
+            depth (int): Crawl depth of the page (used by shared visited sets)
+
+        Returns:
+            bool: True if the caller now owns the URL, False if it was already claimed
+        """
+        with self._lock:
+            if url in self._urls:
+                return False
+            self._urls.add(url)
+            return True
+
+    def __contains__(self, url: str) -> bool:
+        with self._lock:
+            return url in self._urls
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    def __iter__(self):
+        with self._lock:
+            return iter(self._urls)
+
+    def nbytes(self) -> int:
+        with self._lock:
+            return self._urls.nbytes()
+
+    def close(self):
+        with self._lock:
+            self._urls.close()
+
+
+class PageBudget:
+    def __init__(self, limit: int):
+        """
+        Hard cap on the number of pages a crawl may test.
+
+        A slot is reserved before a page is scheduled and then either committed
+        (the page was tested) or released (duplicate, off-site or failed before
+        claiming), so committed pages never exceed ``limit``.
+
+        Args:
+            limit (int): Maximum number of committed pages
+        """
+        self.limit = limit
+        self.used = 0
+        self.reserved = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        """Reserve a page slot; returns False once the budget is exhausted."""
+        with self._lock:
+            if self.used + self.reserved >= self.limit:
+                return False
+            self.reserved += 1
+            return True
+
+    def commit(self):
+        with self._lock:
+            self.reserved -= 1
+            self.used += 1
+
+    def release(self):
+        with self._lock:
+            self.reserved -= 1
+
+    @property
+    def exhausted(self) -> bool:
+        return self.used >= self.limit
@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, List, Optional, Tuple
+
+from .pages import HtmlPage, PageSnapshot
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    final_url TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT,
+    checks TEXT NOT NULL,
+    snapshot TEXT NOT NULL,
+    checked_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (page TEXT NOT NULL, check_name TEXT, url TEXT, test TEXT, status TEXT, comments TEXT);
+CREATE INDEX IF NOT EXISTS results_page ON results (page);
+"""
+
+
+def content_hash(content: bytes, url: str) -> str:
+    """
+    Fingerprint of the parts of a page the checks look at.
+
+    Hashes the headings, links and images of the server HTML rather than the
+    raw bytes, so per-request noise (CSRF tokens, nonces, timestamps in
+    scripts) does not make an unchanged page look modified.
+    """
+    snapshot = HtmlPage(content, url, 0).snapshot()
+    data = json.dumps([snapshot.hrefs, snapshot.headings, snapshot.images], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+class CacheEntry:
+    __slots__ = ('url', 'final_url', 'etag', 'last_modified', 'content_hash', 'checks', 'snapshot', 'results')
+
+    def __init__(self, url, final_url, etag, last_modified, content_hash, checks, snapshot, results):
+        self.url = url
+        self.final_url = final_url
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content_hash = content_hash
+        self.checks = set(checks)
+        self.snapshot = snapshot
+        self.results: List[Tuple[str, str, str, str, str]] = results  # (check, url, test, status, comments)
+
+    def conditional_headers(self) -> dict:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class PageCache:
+    def __init__(self, path: str):
+        """
+        Validators, content hash and check results of every page tested, kept between runs.
+
+        An incremental crawl revalidates each page with a conditional request
+        (``If-None-Match``/``If-Modified-Since``) and compares the content hash;
+        when neither shows a change, the stored results and links are reused
+        instead of loading and checking the page again.
+
+        Args:
+            path (str): SQLite database file, reused across runs
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT final_url, etag, last_modified, content_hash, checks, snapshot FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            results = self._conn.execute(
+                "SELECT check_name, url, test, status, comments FROM results WHERE page = ? ORDER BY rowid", (url,)
+            ).fetchall()
+        final_url, etag, last_modified, digest, checks, snapshot = row
+        data = json.loads(snapshot)
+        snapshot = PageSnapshot(data['hrefs'], [tuple(heading) for heading in data['headings']], data['images'])
+        return CacheEntry(url, final_url, etag, last_modified, digest, json.loads(checks), snapshot, results)
+
+    def store(self, url: str, final_url: str, validators: Tuple[Optional[str], Optional[str], Optional[str]], checks: Iterable[str], snapshot: PageSnapshot, results: Iterable[tuple]):
+        """
+        Replace the cached entry of ``url``.
+
+        Args:
+            url (str): Frontier URL the page was requested as
+            final_url (str): URL after redirects
+            validators (tuple): ``(etag, last_modified, content_hash)``
+            checks (iterable): Names of the checks that ran on the page
+            snapshot (PageSnapshot): What the checks saw, for re-queueing links on reuse
+            results (iterable): ``(check, url, test, status, comments)`` rows
+        """
+        etag, last_modified, digest = validators
+        snapshot_json = json.dumps({'hrefs': snapshot.hrefs, 'headings': snapshot.headings, 'images': snapshot.images}, ensure_ascii=False)
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.execute("DELETE FROM results WHERE page = ?", (url,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, final_url, etag, last_modified, digest, json.dumps(sorted(checks)), snapshot_json, time.time())
+            )
+            self._conn.executemany("INSERT INTO results VALUES (?, ?, ?, ?, ?, ?)", [(url, *row) for row in results])
+
+    def refresh_validators(self, url: str, etag: Optional[str], last_modified: Optional[str]):
+        """Record new validators for a page whose content hash did not change."""
+        with self._lock:
+            self._conn.execute("UPDATE pages SET etag = ?, last_modified = ?, checked_at = ? WHERE url = ?", (etag, last_modified, time.time(), url))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
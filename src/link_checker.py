@@ -0,0 +1,175 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .fetcher import DEFAULT_USER_AGENT, parse_retry_after
+from .throttle import HostThrottle
+
+# Servers that reject or mis-handle HEAD; these statuses trigger a GET retry
+HEAD_FALLBACK_STATUSES = {400, 403, 405, 406, 409, 429, 500, 501, 502, 503}
+
+
+class LinkStatus:
+    __slots__ = ('url', 'status_code', 'final_url', 'redirect_chain', 'method', 'error', 'elapsed', 'retry_after')
+
+    def __init__(self, url, status_code=None, final_url=None, redirect_chain=None, method=None, error=None, elapsed=0.0, retry_after=None):
+        self.url = url
+        self.status_code = status_code
+        self.final_url = final_url
+        self.redirect_chain: List[Tuple[int, str]] = redirect_chain or []
+        self.method = method
+        self.error = error
+        self.elapsed = elapsed
+        self.retry_after = retry_after
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status_code is not None and self.status_code < 400
+
+
+class LinkStatusChecker:
+    def __init__(self, concurrency: int = 64, per_host: int = 8, timeout: float = 10, max_redirects: int = 10, user_agent: str = DEFAULT_USER_AGENT, throttle: Optional[HostThrottle] = None):
+        """
+        Check the HTTP status of many URLs concurrently.
+
+        Requests are scheduled by an asyncio loop that enforces a global
+        concurrency limit and waits for each host's :class:`HostThrottle` slot
+        (rate limit, crawl-delay and adaptive concurrency), and are sent
+        through a keep-alive connection pool. Each URL is tried with HEAD first and falls back to a streamed GET
+        (body not downloaded) when the server rejects HEAD. Redirect chains are
+        recorded.
+
+        Args:
+            concurrency (int): Maximum requests in flight overall
+            per_host (int): Maximum requests in flight per host, when no ``throttle`` is given
+            timeout (float): Connect/read timeout in seconds
+            max_redirects (int): Redirects followed before giving up
+            user_agent (str): User-Agent header sent with every request
+            throttle (HostThrottle): Per-host limits shared with the crawl; links are only
+                status-checked, so robots.txt rules other than its crawl-delay do not apply
+        """
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.throttle = throttle or HostThrottle(max_concurrency=per_host, respect_robots=False, user_agent=user_agent)
+        self._owns_throttle = throttle is None
+
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = user_agent
+        self.session.max_redirects = max_redirects
+        # One host may get as many requests in flight as the throttle's window allows
+        adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=max(per_host, self.throttle.max_concurrency))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def probe(self, url: str) -> LinkStatus:
+        """Blocking HEAD-then-GET probe of a single URL."""
+        started = time.perf_counter()
+        try:
+            method = 'HEAD'
+            response = self.session.head(url, timeout=self.timeout, allow_redirects=True)
+            if response.status_code in HEAD_FALLBACK_STATUSES:
+                response.close()
+                method = 'GET'
+                response = self.session.get(url, timeout=self.timeout, allow_redirects=True, stream=True)
+            response.close()
+            return LinkStatus(
+                url,
+                status_code=response.status_code,
+                final_url=response.url,
+                redirect_chain=[(hop.status_code, hop.url) for hop in response.history],
+                method=method,
+                elapsed=time.perf_counter() - started,
+                retry_after=parse_retry_after(response.headers.get('Retry-After'))
+            )
+        except requests.exceptions.RequestException as e:
+            return LinkStatus(url, error=str(e), elapsed=time.perf_counter() - started)
+
+    def check_one(self, url: str) -> LinkStatus:
+        """Blocking probe that first waits for a slot of the URL's host in the throttle."""
+        with self.throttle.request(url) as outcome:
+            status = self.probe(url)
+            outcome.status_code = status.status_code
+            outcome.retry_after = status.retry_after
+            outcome.error = status.error is not None
+        return status
+
+    async def check_all(self, urls: Iterable[str], on_result=None) -> List[LinkStatus]:
+        """
+        Check every URL, streaming each result to ``on_result`` if given, otherwise returning them.
+
+        A producer task feeds ``urls`` (any iterable, e.g. a generator) into a
+        bounded queue that a fixed number of worker tasks pull from, so pending
+        URLs are never all held at once. With ``on_result`` the results are not
+        collected either and an empty list is returned; only the set of URLs
+        already seen, for skipping repeats, grows with the input. An unexpected
+        error while checking one URL becomes that URL's error result.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        results = []
+
+        async def produce():
+            seen = set()
+            for url in urls:
+                if url in seen:
+                    continue
+                seen.add(url)
+                await queue.put(url)
+            for _ in range(self.concurrency):
+                await queue.put(None)  # one stop marker per worker
+
+        async def worker():
+            while True:
+                url = await queue.get()
+                if url is None:
+                    return
+                try:
+                    # robots.txt of a new host is read in the executor, off the event loop
+                    limiter = await loop.run_in_executor(executor, self.throttle.limiter, url)
+                    await limiter.acquire_async()
+                except Exception as e:
+                    status = LinkStatus(url, error=f"Unexpected error: {e}")
+                else:
+                    status = LinkStatus(url, error="Not checked")
+                    try:
+                        status = await loop.run_in_executor(executor, self.probe, url)
+                    except Exception as e:
+                        status = LinkStatus(url, error=f"Unexpected error: {e}")
+                    finally:
+                        limiter.release(status.elapsed, status.status_code, status.error is not None, status.retry_after)
+                if on_result:
+                    on_result(status)
+                else:
+                    results.append(status)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            await asyncio.gather(produce(), *(worker() for _ in range(self.concurrency)))
+        return results
+
+    def check(self, urls: Iterable[str], on_result=None) -> List[LinkStatus]:
+        """Synchronous wrapper around :meth:`check_all`."""
+        return asyncio.run(self.check_all(urls, on_result=on_result))
+
+    def close(self):
+        self.session.close()
+        if self._owns_throttle:
+            self.throttle.close()
+
+
+def describe(status: LinkStatus, source: Optional[str] = None) -> str:
+    """Human-readable comment for a report row."""
+    if status.error:
+        text = status.error
+    else:
+        text = f"Status code: {status.status_code} ({status.method})"
+        if status.redirect_chain:
+            hops = ' -> '.join(f"{code} {url}" for code, url in status.redirect_chain)
+            text += f" via {hops} -> {status.final_url}"
+    if source:
+        text += f"; linked from {source}"
+    return text
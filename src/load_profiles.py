@@ -0,0 +1,153 @@
+from typing import Iterable, List, Optional, Union
+
+IMAGE_PATTERNS = ('*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.avif*', '*.svg*', '*.ico*')
+FONT_PATTERNS = ('*.woff*', '*.woff2*', '*.ttf*', '*.otf*', '*.eot*')
+MEDIA_PATTERNS = ('*.mp4*', '*.webm*', '*.mp3*', '*.ogg*', '*.m4a*', '*.mov*', '*.m3u8*')
+
+# Analytics, tag managers, ads and session recorders seen on rental sites
+THIRD_PARTY_HOSTS = (
+    'google-analytics.com', 'googletagmanager.com', 'doubleclick.net', 'googlesyndication.com',
+    'googleadservices.com', 'facebook.net', 'connect.facebook.com', 'hotjar.com', 'clarity.ms',
+    'bing.com', 'criteo.com', 'criteo.net', 'taboola.com', 'outbrain.com', 'tiktok.com',
+    'segment.io', 'mixpanel.com', 'newrelic.com', 'nr-data.net', 'intercom.io',
+)
+
+# Reports transferred bytes and load time of the current page. Cross-origin
+# resources without Timing-Allow-Origin report 0 bytes, so totals are a lower bound.
+PAGE_METRICS_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0] || {};
+var resources = performance.getEntriesByType('resource');
+var bytes = nav.transferSize || 0;
+for (var i = 0; i < resources.length; i++) { bytes += resources[i].transferSize || 0; }
+return {
+    bytes: bytes,
+    load_ms: nav.loadEventEnd ? nav.loadEventEnd - nav.startTime : (nav.duration || 0),
+    requests: resources.length + 1
+};
+"""
+
+
+class LoadProfile:
+    def __init__(self, name: str, images: bool = True, fonts: bool = True, media: bool = True, third_party: bool = True, extra_blocked: Iterable[str] = ()):
+        """
+        Set of resource types a browser is allowed to download while loading a page.
+
+        Blocking is done with the Chrome DevTools Protocol (``Network.setBlockedURLs``),
+        so it only applies to Chromium-based drivers.
+
+        Args:
+            name (str): Profile name shown in reports
+            images (bool): Load images
+            fonts (bool): Load web fonts
+            media (bool): Load audio and video
+            third_party (bool): Load analytics/ads/tracking hosts
+            extra_blocked (iterable): Additional URL wildcard patterns to block
+        """
+        self.name = name
+        self.images = images
+        self.fonts = fonts
+        self.media = media
+        self.third_party = third_party
+        self.extra_blocked = tuple(extra_blocked)
+
+    def blocked_urls(self) -> List[str]:
+        patterns = list(self.extra_blocked)
+        if not self.images:
+            patterns.extend(IMAGE_PATTERNS)
+        if not self.fonts:
+            patterns.extend(FONT_PATTERNS)
+        if not self.media:
+            patterns.extend(MEDIA_PATTERNS)
+        if not self.third_party:
+            patterns.extend(f'*{host}*' for host in THIRD_PARTY_HOSTS)
+        return patterns
+
+    @classmethod
+    def union(cls, profiles: Iterable['LoadProfile']) -> 'LoadProfile':
+        """Smallest profile that loads everything any of ``profiles`` needs."""
+        profiles = list(profiles)
+        if not profiles:
+            return PROFILES['full']
+        if len(profiles) == 1:
+            return profiles[0]
+        extra = set(profiles[0].extra_blocked)
+        for profile in profiles[1:]:
+            extra &= set(profile.extra_blocked)
+        return cls(
+            '+'.join(sorted({profile.name for profile in profiles})),
+            images=any(profile.images for profile in profiles),
+            fonts=any(profile.fonts for profile in profiles),
+            media=any(profile.media for profile in profiles),
+            third_party=any(profile.third_party for profile in profiles),
+            extra_blocked=sorted(extra)
+        )
+
+
+PROFILES = {
+    # Everything loads, as a normal browser would
+    'full': LoadProfile('full'),
+    # DOM-only checks (headings, links): no images, fonts, media or trackers
+    'dom': LoadProfile('dom', images=False, fonts=False, media=False, third_party=False),
+    # Checks that inspect rendered images (e.g. dimensions) keep images only
+    'images': LoadProfile('images', images=True, fonts=False, media=False, third_party=False),
+}
+
+
+def get_profile(profile: Union[str, LoadProfile, None]) -> Optional[LoadProfile]:
+    if profile is None or isinstance(profile, LoadProfile):
+        return profile
+    return PROFILES[profile]
+
+
+def apply_profile(driver, profile: LoadProfile):
+    """Install the profile's URL blocklist on a Chromium driver."""
+    patterns = profile.blocked_urls()
+    if patterns == getattr(driver, '_blocked_urls', []):
+        return
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+    driver._blocked_urls = patterns
+
+
+def clear_profile(driver):
+    """Remove any URL blocklist installed by :func:`apply_profile`."""
+    if getattr(driver, '_blocked_urls', None):
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': []})
+        driver._blocked_urls = []
+
+
+def page_metrics(driver) -> dict:
+    return driver.execute_script(PAGE_METRICS_SCRIPT) or {}
+
+
+class ProfileStats:
+    def __init__(self, profile: LoadProfile):
+        """Accumulates per-page transfer size and load time under a load profile."""
+        self.profile = profile
+        self.pages = 0
+        self.bytes = 0
+        self.load_ms = 0.0
+        self.baseline = None  # metrics of one page loaded with the 'full' profile
+
+    def add(self, metrics: dict):
+        self.pages += 1
+        self.bytes += metrics.get('bytes', 0) or 0
+        self.load_ms += metrics.get('load_ms', 0) or 0
+
+    def summary(self) -> dict:
+        summary = {
+            'load_profile': self.profile.name,
+            'profile_pages': self.pages,
+            'avg_page_bytes': self.bytes / self.pages if self.pages else 0,
+            'avg_page_load_ms': self.load_ms / self.pages if self.pages else 0,
+        }
+        if self.baseline and self.pages:
+            saved_bytes = max(self.baseline.get('bytes', 0) - summary['avg_page_bytes'], 0)
+            saved_ms = max(self.baseline.get('load_ms', 0) - summary['avg_page_load_ms'], 0)
+            summary.update({
+                'baseline_page_bytes': self.baseline.get('bytes', 0),
+                'baseline_page_load_ms': self.baseline.get('load_ms', 0),
+                'estimated_bytes_saved': saved_bytes * self.pages,
+                'estimated_time_saved_s': saved_ms * self.pages / 1000,
+            })
+        return summary
@@ -0,0 +1,153 @@
+from typing import List, Optional, Tuple
+from urllib.parse import urljoin
+
+import lxml.html
+
+# Collects everything the page checks and the link extractor need in a single
+# WebDriver round trip instead of one call per element.
+SNAPSHOT_SCRIPT = """
+var map = Array.prototype.map;
+return {
+    hrefs: map.call(document.querySelectorAll('a[href]'), function (a) { return a.href; }),
+    headings: map.call(document.querySelectorAll('h1, h2, h3, h4, h5, h6'), function (h) {
+        return [Number(h.tagName.charAt(1)), (h.innerText || '').trim()];
+    }),
+    images: map.call(document.images, function (img) {
+        return {
+            src: img.currentSrc || img.getAttribute('src'),
+            alt: img.getAttribute('alt'),
+            width: img.naturalWidth,
+            height: img.naturalHeight
+        };
+    })
+};
+"""
+
+
+class PageSnapshot:
+    __slots__ = ('hrefs', 'headings', 'images')
+
+    def __init__(self, hrefs: List[str], headings: List[Tuple[int, str]], images: List[dict]):
+        """
+        Compact view of the parts of a page the checks look at.
+
+        Args:
+            hrefs (list): Absolute href of every anchor in document order
+            headings (list): ``(level, text)`` for every h1-h6 in document order
+            images (list): ``{'src', 'alt', 'width', 'height'}`` for every <img>;
+                ``alt`` is None when the attribute is missing
+        """
+        self.hrefs = hrefs
+        self.headings = headings
+        self.images = images
+
+    @classmethod
+    def from_driver(cls, driver) -> 'PageSnapshot':
+        data = driver.execute_script(SNAPSHOT_SCRIPT) or {}
+        return cls(
+            data.get('hrefs') or [],
+            [(int(level), text) for level, text in data.get('headings') or []],
+            data.get('images') or []
+        )
+
+
+def _int_attribute(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class BrowserPage:
+    def __init__(self, driver, url: str, depth: int):
+        """
+        A page that has already been loaded in a browser, handed to every page check.
+
+        The page is read once through :meth:`snapshot` so several checks can use
+        the same data without further WebDriver round trips.
+
+        Args:
+            driver: WebDriver currently showing the page
+            url (str): Final URL of the page after redirects
+            depth (int): Crawl depth at which the page was reached
+        """
+        self.driver = driver
+        self.url = url
+        self.depth = depth
+        self.status_code = None  # Not exposed by WebDriver
+        self._snapshot = None
+
+    def snapshot(self) -> PageSnapshot:
+        if self._snapshot is None:
+            self._snapshot = PageSnapshot.from_driver(self.driver)
+        return self._snapshot
+
+
+class HtmlPage:
+    def __init__(self, content: bytes, url: str, depth: int, status_code: Optional[int] = None):
+        """
+        A page downloaded over HTTP and parsed with lxml, without a browser.
+
+        Produces the same :class:`PageSnapshot` as :class:`BrowserPage` so page
+        checks run unchanged on server-rendered HTML.
+
+        Args:
+            content (bytes): Raw response body
+            url (str): Final URL of the page after redirects
+            depth (int): Crawl depth at which the page was reached
+            status_code (int): HTTP status of the response
+        """
+        self.driver = None
+        self.url = url
+        self.depth = depth
+        self.status_code = status_code
+        self.tree = lxml.html.fromstring(content or b'<html></html>')
+        self._snapshot = None
+
+    def snapshot(self) -> PageSnapshot:
+        if self._snapshot is None:
+            tree = self.tree
+            base = tree.xpath('//base/@href')
+            base_url = urljoin(self.url, base[0]) if base else self.url
+
+            hrefs = [
+                href if href.startswith(('javascript:', '#')) else urljoin(base_url, href)
+                for href in (raw.strip() for raw in tree.xpath('//a/@href'))
+            ]
+            headings = [
+                (int(header.tag[1]), ' '.join(header.text_content().split()))
+                for header in tree.xpath('//h1 | //h2 | //h3 | //h4 | //h5 | //h6')
+            ]
+            images = [
+                {
+                    'src': urljoin(base_url, image.get('src')) if image.get('src') else None,
+                    'alt': image.get('alt'),
+                    'width': _int_attribute(image.get('width')),
+                    'height': _int_attribute(image.get('height')),
+                }
+                for image in tree.iter('img')
+            ]
+            self._snapshot = PageSnapshot(hrefs, headings, images)
+        return self._snapshot
+
+
+class CachedPage:
+    def __init__(self, snapshot: PageSnapshot, url: str, depth: int):
+        """
+        A page reused from an earlier run without loading it (see ``src/incremental.py``).
+
+        Only carries the stored snapshot, which is enough to queue its links.
+
+        Args:
+            snapshot (PageSnapshot): Snapshot taken when the page was last tested
+            url (str): Final URL of the page when it was last tested
+            depth (int): Crawl depth at which the page was reached
+        """
+        self.driver = None
+        self.url = url
+        self.depth = depth
+        self.status_code = None
+        self._snapshot = snapshot
+
+    def snapshot(self) -> PageSnapshot:
+        return self._snapshot
@@ -0,0 +1,228 @@
+import threading
+import time
+from typing import Optional
+
+# Installed with Page.addScriptToEvaluateOnNewDocument so it runs before any page
+# script: counts fetch/XHR requests in flight for the network-idle wait.
+INFLIGHT_TRACKER_SCRIPT = """
+(function () {
+    if (window.__vrtInflight !== undefined) { return; }
+    window.__vrtInflight = 0;
+    var done = function () { window.__vrtInflight = Math.max(0, window.__vrtInflight - 1); };
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            window.__vrtInflight++;
+            return originalFetch.apply(this, arguments).then(
+                function (response) { done(); return response; },
+                function (error) { done(); throw error; }
+            );
+        };
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        window.__vrtInflight++;
+        this.addEventListener('loadend', done);
+        return originalSend.apply(this, arguments);
+    };
+})();
+"""
+
+# Resolves once the load event has fired, no fetch/XHR is in flight and no new
+# resource has started for idle_ms. arguments: idle_ms, timeout_ms, callback
+NETWORK_IDLE_SCRIPT = """
+var idleMs = arguments[0], timeoutMs = arguments[1], callback = arguments[arguments.length - 1];
+var started = Date.now(), lastCount = -1, quietSince = Date.now();
+function check() {
+    var count = performance.getEntriesByType('resource').length;
+    var inflight = window.__vrtInflight || 0;
+    if (count !== lastCount || inflight > 0 || document.readyState !== 'complete') {
+        lastCount = count;
+        quietSince = Date.now();
+    }
+    if (Date.now() - quietSince >= idleMs) { return callback(true); }
+    if (Date.now() - started >= timeoutMs) { return callback(false); }
+    setTimeout(check, 50);
+}
+check();
+"""
+
+# Resolves on the load event instead of polling document.readyState over WebDriver.
+# arguments: timeout_ms, callback
+LOAD_EVENT_SCRIPT = """
+var timeoutMs = arguments[0], callback = arguments[arguments.length - 1];
+if (document.readyState === 'complete') { return callback(true); }
+var timer = setTimeout(function () { callback(false); }, timeoutMs);
+window.addEventListener('load', function () { clearTimeout(timer); callback(true); });
+"""
+
+# Resolves when the element matching a CSS selector appears (or when a JS predicate
+# becomes true), re-evaluated on DOM mutations. arguments: selector, predicate, timeout_ms, callback
+CONDITION_SCRIPT = """
+var selector = arguments[0], predicate = arguments[1], timeoutMs = arguments[2];
+var callback = arguments[arguments.length - 1];
+var test = predicate ? new Function('return (' + predicate + ');') : function () { return document.querySelector(selector); };
+function ok() { try { return !!test(); } catch (e) { return false; } }
+if (ok()) { return callback(true); }
+var observer = new MutationObserver(function () {
+    if (ok()) { observer.disconnect(); clearTimeout(timer); callback(true); }
+});
+observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+var timer = setTimeout(function () { observer.disconnect(); callback(ok()); }, timeoutMs);
+"""
+
+# Resolves when the text of the element matching a CSS selector differs from the
+# previous value, re-read on every DOM mutation (the element may be replaced).
+# Returns the new text or null on timeout. arguments: selector, previous_text, timeout_ms, callback
+TEXT_CHANGE_SCRIPT = """
+var selector = arguments[0], previous = arguments[1], timeoutMs = arguments[2];
+var callback = arguments[arguments.length - 1];
+function current() { var el = document.querySelector(selector); return el ? el.textContent.trim() : null; }
+var text = current();
+if (text !== null && text !== previous) { return callback(text); }
+var observer = new MutationObserver(function () {
+    var value = current();
+    if (value !== null && value !== previous) { observer.disconnect(); clearTimeout(timer); callback(value); }
+});
+observer.observe(document.body || document.documentElement, {childList: true, subtree: true, characterData: true});
+var timer = setTimeout(function () { observer.disconnect(); callback(null); }, timeoutMs);
+"""
+
+STRATEGIES = ('load', 'network_idle', 'selector', 'predicate')
+
+
+class ReadinessWaiter:
+    def __init__(self, strategy: str = 'load', timeout: float = 15, idle_ms: int = 500, selector: Optional[str] = None, predicate: Optional[str] = None):
+        """
+        Wait for a page to be ready on concrete in-page signals instead of polling or sleeping.
+
+        Strategies:
+            ``load``: the window load event
+            ``network_idle``: load fired, no fetch/XHR in flight and no new
+                resource for ``idle_ms`` (the request counter is installed through
+                CDP before page scripts run)
+            ``selector``: an element matching the CSS ``selector`` exists
+            ``predicate``: the JS expression ``predicate`` is truthy
+
+        Every wait is timed so the latency the waits add can be reported.
+
+        Args:
+            strategy (str): One of ``STRATEGIES``
+            timeout (float): Maximum seconds to wait per page
+            idle_ms (int): Quiet period for ``network_idle``
+            selector (str): CSS selector for the ``selector`` strategy
+            predicate (str): JavaScript expression for the ``predicate`` strategy
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown readiness strategy: {strategy}")
+        if strategy == 'selector' and not selector:
+            raise ValueError("The 'selector' strategy needs a selector")
+        if strategy == 'predicate' and not predicate:
+            raise ValueError("The 'predicate' strategy needs a predicate")
+
+        self.strategy = strategy
+        self.timeout = timeout
+        self.idle_ms = idle_ms
+        self.selector = selector
+        self.predicate = predicate
+
+        self._lock = threading.Lock()
+        self.wait_times = []  # (label, seconds) for every wait, label is usually the page URL
+        self.timeouts = 0
+
+    def _prepare(self, driver):
+        # Async scripts are bounded by the driver's script timeout; make sure our own
+        # timeout fires first. Done once per browser.
+        if getattr(driver, '_readiness_timeout', None) != self.timeout:
+            driver.set_script_timeout(self.timeout + 5)
+            driver._readiness_timeout = self.timeout
+
+    def install(self, driver):
+        """Install the fetch/XHR tracker used by ``network_idle`` (Chromium only)."""
+        if self.strategy != 'network_idle' or getattr(driver, '_inflight_tracker', False):
+            return
+        try:
+            driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': INFLIGHT_TRACKER_SCRIPT})
+        except Exception as e:
+            # Without the tracker, idleness falls back to resource timing only
+            print(f"[WARNING] Could not install network tracker: {e}")
+        driver._inflight_tracker = True
+
+    def _record(self, started: float, ready: bool, label: Optional[str] = None) -> float:
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.wait_times.append((label, elapsed))
+            if not ready:
+                self.timeouts += 1
+        return elapsed
+
+    def wait_for_page(self, driver, label: Optional[str] = None) -> float:
+        """
+        Block until the current page is ready according to the strategy.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        started = time.perf_counter()
+        timeout_ms = int(self.timeout * 1000)
+        ready = False
+        try:
+            self._prepare(driver)
+            if self.strategy == 'network_idle':
+                ready = driver.execute_async_script(NETWORK_IDLE_SCRIPT, self.idle_ms, timeout_ms)
+            elif self.strategy == 'load':
+                ready = driver.execute_async_script(LOAD_EVENT_SCRIPT, timeout_ms)
+            else:
+                ready = driver.execute_async_script(CONDITION_SCRIPT, self.selector, self.predicate, timeout_ms)
+            if not ready:
+                print(f"[WARNING] Page not ready after {self.timeout}s ({self.strategy})")
+        except Exception as e:
+            print(f"[WARNING] Page load timeout: {e}")
+        return self._record(started, bool(ready), label)
+
+    def wait_for_condition(self, driver, selector: Optional[str] = None, predicate: Optional[str] = None, timeout: Optional[float] = None, label: Optional[str] = None) -> bool:
+        """Block until ``selector`` matches or ``predicate`` is truthy; returns whether it did."""
+        timeout = self.timeout if timeout is None else timeout
+        started = time.perf_counter()
+        ready = False
+        try:
+            self._prepare(driver)
+            ready = bool(driver.execute_async_script(CONDITION_SCRIPT, selector, predicate, int(timeout * 1000)))
+        except Exception as e:
+            print(f"[WARNING] Condition wait failed: {e}")
+        self._record(started, ready, label)
+        return ready
+
+    def wait_for_text_change(self, driver, selector: str, previous_text: Optional[str], timeout: Optional[float] = None, label: Optional[str] = None) -> Optional[str]:
+        """
+        Block until the text of ``selector`` differs from ``previous_text``.
+
+        Returns:
+            str: The new text, or None if it did not change within the timeout
+        """
+        timeout = self.timeout if timeout is None else timeout
+        started = time.perf_counter()
+        text = None
+        try:
+            self._prepare(driver)
+            text = driver.execute_async_script(TEXT_CHANGE_SCRIPT, selector, previous_text, int(timeout * 1000))
+        except Exception as e:
+            print(f"[WARNING] Text change wait failed: {e}")
+        self._record(started, text is not None, label)
+        return text
+
+    def summary(self) -> dict:
+        with self._lock:
+            waits = sorted(seconds for _, seconds in self.wait_times)
+            timeouts = self.timeouts
+        if not waits:
+            return {'readiness_strategy': self.strategy, 'waits': 0}
+        return {
+            'readiness_strategy': self.strategy,
+            'waits': len(waits),
+            'wait_timeouts': timeouts,
+            'total_wait_s': sum(waits),
+            'avg_wait_s': sum(waits) / len(waits),
+            'p95_wait_s': waits[min(len(waits) - 1, int(len(waits) * 0.95))],
+            'max_wait_s': waits[-1],
+        }
@@ -0,0 +1,196 @@
+import os
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from .sinks import read_rows, write_excel
+
+# Normalized schema shared by every report sheet
+COLUMNS = ['page_url', 'test', 'status', 'passed', 'comments', 'depth', 'template', 'source']
+
+# Column names used by the individual testers, mapped to the normalized schema
+COLUMN_ALIASES = {
+    'URL': 'page_url', 'url': 'page_url',
+    'Test Type': 'test', 'Test': 'test', 'testcase': 'test',
+    'Status': 'status', 'Result': 'status',
+    'Comments': 'comments',
+}
+
+# Status spellings of the different checks, mapped to Pass/Fail/Error
+STATUS_ALIASES = {
+    'pass': 'Pass', 'valid': 'Pass', 'true': 'Pass',
+    'fail': 'Fail', 'invalid': 'Fail', 'false': 'Fail',
+    'error': 'Error',
+}
+
+# (path regex, template) pairs tried before the generic rule
+DEFAULT_TEMPLATE_RULES = (
+    (r'^/property/[^/]+/[^/]+', '/property/{slug}/{id}'),
+)
+
+SUMMARY_STATUSES = ['Pass', 'Fail', 'Error']
+
+CHUNK_ROWS = 50000
+
+
+def url_templates(urls: pd.Series, rules: Sequence[Tuple[str, str]] = DEFAULT_TEMPLATE_RULES) -> pd.Series:
+    """
+    Group URLs into page templates, e.g. every property page into ``/property/{slug}/{id}``.
+
+    Paths matching one of ``rules`` get its template; otherwise every path
+    segment containing a digit becomes ``{id}``. Each distinct URL is only
+    processed once, with vectorized string operations.
+    """
+    codes, uniques = pd.factorize(urls.astype(str))
+    paths = pd.Series(uniques).str.replace(r'^[a-zA-Z][a-zA-Z0-9+.-]*://[^/]*', '', regex=True)
+    paths = paths.str.replace(r'[?#].*$', '', regex=True)
+    templates = paths.str.replace(r'/[^/]*\d[^/]*', '/{id}', regex=True).str.rstrip('/').replace('', '/')
+    for pattern, template in reversed(list(rules)):
+        templates = templates.mask(paths.str.contains(pattern, regex=True), template)
+    return pd.Series(templates.to_numpy()[codes], index=urls.index)
+
+
+def normalize_results(results, depths: Optional[Dict[str, int]] = None, template_rules: Sequence[Tuple[str, str]] = DEFAULT_TEMPLATE_RULES) -> pd.DataFrame:
+    """
+    Bring results from any tester into the normalized schema (``COLUMNS``).
+
+    Accepts ``(url, test, status, comments)`` tuples, dicts with either the
+    engine's or the testers' column names, a DataFrame or a ``ResultTable``. Status values are
+    mapped to Pass/Fail/Error and repeated text columns become categoricals.
+
+    Args:
+        results: Rows to normalize
+        depths (dict): Crawl depth per page URL, from ``CrawlEngine.page_depths``
+        template_rules (sequence): ``(path regex, template)`` pairs, see :func:`url_templates`
+    """
+    if isinstance(results, pd.DataFrame):
+        df = results.copy()
+    elif hasattr(results, 'to_dataframe'):
+        df = results.to_dataframe()
+    else:
+        results = list(results)
+        if results and not isinstance(results[0], dict):
+            df = pd.DataFrame(results, columns=['page_url', 'test', 'status', 'comments'])
+        else:
+            df = pd.DataFrame(results)
+    df = df.rename(columns=COLUMN_ALIASES)
+    if df.empty:
+        return pd.DataFrame(columns=COLUMNS)
+
+    if 'status' in df:
+        raw_status = df['status'].astype(str).str.strip()
+    else:
+        raw_status = df['passed'].astype(str)
+    status = raw_status.str.lower().map(STATUS_ALIASES).fillna(raw_status)
+
+    normalized = pd.DataFrame({
+        'page_url': df['page_url'] if isinstance(df['page_url'].dtype, pd.CategoricalDtype) else df['page_url'].astype(str),
+        'test': df['test'].astype('category'),
+        'status': status.astype('category'),
+        'passed': status.eq('Pass'),
+        'comments': df['comments'] if 'comments' in df else None,
+        'depth': df['page_url'].map(depths).astype('Int64') if depths else pd.Series(pd.NA, index=df.index, dtype='Int64'),
+        'source': (df['source'] if 'source' in df else pd.Series('fresh', index=df.index)).fillna('fresh').astype('category'),
+    })
+    normalized['template'] = url_templates(normalized['page_url'], template_rules).astype('category')
+    return normalized[COLUMNS]
+
+
+def _count_by(df: pd.DataFrame, key: str) -> pd.DataFrame:
+    """Result counts per status for each value of ``key``; additive across chunks."""
+    keys = df[key].astype(object).where(df[key].notna(), 'n/a') if key == 'depth' else df[key]
+    return pd.crosstab(keys, df['status'].astype(str)).rename_axis(index=key, columns=None)
+
+
+def _finish_summary(counts: pd.DataFrame) -> pd.DataFrame:
+    other = sorted(column for column in counts.columns if column not in SUMMARY_STATUSES)
+    counts = counts.reindex(columns=SUMMARY_STATUSES + other).fillna(0).astype('int64')
+    counts.insert(0, 'Results', counts.sum(axis=1))
+    counts['Pass Rate'] = (counts['Pass'] / counts['Results']).round(4)
+    return counts.reset_index()
+
+
+SUMMARIES = (('Summary by Test', 'test'), ('Summary by URL Template', 'template'), ('Summary by Depth', 'depth'))
+
+
+class ReportBuilder:
+    def __init__(self, path: str, depths: Optional[Dict[str, int]] = None, template_rules: Sequence[Tuple[str, str]] = DEFAULT_TEMPLATE_RULES):
+        """
+        Build one workbook from the results of any tester.
+
+        Results are normalized to ``COLUMNS`` and written to an 'All Results'
+        sheet next to pass/fail summaries by test, by URL template and by crawl
+        depth, computed with groupby/crosstab rather than Python loops. Results
+        streamed to a file (see ``src/sinks.py``) are read back in chunks, so a
+        report can be built from more rows than fit in memory.
+
+        Args:
+            path (str): Output .xlsx file
+            depths (dict): Crawl depth per page URL, from ``CrawlEngine.page_depths``
+            template_rules (sequence): ``(path regex, template)`` pairs for the template summary
+        """
+        self.path = path
+        self.depths = depths or {}
+        self.template_rules = template_rules
+        self._frames: List[pd.DataFrame] = []
+        self._streams: List[str] = []
+        self._extra_sheets: List[Tuple[str, pd.DataFrame]] = []
+
+    def add(self, results):
+        """Add in-memory results (tuples, dicts or a DataFrame)."""
+        self._frames.append(normalize_results(results, self.depths, self.template_rules))
+
+    def add_stream(self, path: str):
+        """Add results from a .jsonl/.csv/.parquet file written by a sink."""
+        self._streams.append(path)
+
+    def add_sheet(self, name: str, df: pd.DataFrame, index: bool = False):
+        """Append an extra sheet (e.g. crawl stats) after the result sheets."""
+        self._extra_sheets.append((name, df.reset_index() if index else df))
+
+    def _chunks(self) -> Iterable[pd.DataFrame]:
+        yield from self._frames
+        for path in self._streams:
+            rows = read_rows(path)
+            while True:
+                chunk = list(islice(rows, CHUNK_ROWS))
+                if not chunk:
+                    break
+                yield normalize_results(chunk, self.depths, self.template_rules)
+
+    def summaries(self) -> Dict[str, pd.DataFrame]:
+        totals = {}
+        for chunk in self._chunks():
+            if chunk.empty:
+                continue
+            for name, key in SUMMARIES:
+                counts = _count_by(chunk, key)
+                totals[name] = counts if name not in totals else totals[name].add(counts, fill_value=0)
+        return {name: _finish_summary(counts) for name, counts in totals.items()}
+
+    def dataframe(self) -> pd.DataFrame:
+        """All results in the normalized schema (loads streams into memory)."""
+        chunks = list(self._chunks())
+        return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=COLUMNS)
+
+    def _result_rows(self):
+        for chunk in self._chunks():
+            for row in chunk.itertuples(index=False, name=None):
+                yield [None if pd.isna(value) else value for value in row]
+
+    def write(self) -> Optional[str]:
+        """Write the workbook; returns its path, or None if there were no results."""
+        summaries = self.summaries()
+        if not summaries:
+            print("No test results to generate reports.")
+            return None
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        sheets = [(name, list(df.columns), df.itertuples(index=False, name=None)) for name, df in summaries.items()]
+        sheets.append(('All Results', COLUMNS, self._result_rows()))
+        for name, df in self._extra_sheets:
+            sheets.append((name, list(df.columns), ([None if pd.isna(value) else value for value in row] for row in df.itertuples(index=False, name=None))))
+        write_excel(self.path, sheets)
+        print(f"Report saved to {self.path}")
+        return self.path
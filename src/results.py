@@ -0,0 +1,136 @@
+import threading
+from array import array
+from enum import IntEnum
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .report import STATUS_ALIASES
+
+
+class Status(IntEnum):
+    PASS = 0
+    FAIL = 1
+    ERROR = 2
+
+    @property
+    def label(self) -> str:
+        return self.name.capitalize()
+
+    @classmethod
+    def parse(cls, value) -> 'Status':
+        """Map any status spelling used by the checks (Pass, Valid, Invalid, ...) to a member."""
+        if isinstance(value, cls):
+            return value
+        label = STATUS_ALIASES.get(str(value).strip().lower())
+        if label is None:
+            raise ValueError(f"Unknown result status: {value}")
+        return cls[label.upper()]
+
+
+STATUS_LABELS = [status.label for status in Status]
+
+# Status strings the checks actually report, resolved without going through parse()
+_STATUS_CODES = {label: Status.parse(label) for label in ('Pass', 'Fail', 'Error', 'Valid', 'Invalid')}
+
+
+class Interner:
+    __slots__ = ('values', '_ids')
+
+    def __init__(self):
+        """Assigns a small integer ID to each distinct string; every string is stored once."""
+        self.values: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        value_id = self._ids.get(value)
+        if value_id is None:
+            value_id = self._ids[value] = len(self.values)
+            self.values.append(value)
+        return value_id
+
+    def __getitem__(self, value_id: int) -> str:
+        return self.values[value_id]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class ResultTable:
+    def __init__(self):
+        """
+        Column store for ``(url, test, status, comments)`` results.
+
+        Each row costs a few bytes: URL, test name and comment are kept as IDs
+        in typed arrays pointing into interners, and the status as a one-byte
+        :class:`Status`. Repeated values (the same URL for every check of a
+        page, the same comment on thousands of pages) are stored only once.
+
+        The table behaves like the list of tuples it replaces (``append``,
+        ``len``, iteration) and converts to a categorical DataFrame without
+        materializing a Python string per row.
+        """
+        self.urls = Interner()
+        self.tests = Interner()
+        self.comments = Interner()
+        # Signed types so numpy can read the buffers as category codes directly
+        self._url_ids = array('i')
+        self._test_ids = array('i')
+        self._status = array('b')
+        self._comment_ids = array('i')
+        self._lock = threading.Lock()
+
+    def append(self, row: Tuple[str, str, str, str]):
+        url, test, status, comments = row
+        status = _STATUS_CODES.get(status) if isinstance(status, str) else None
+        if status is None:
+            status = Status.parse(row[2])
+        with self._lock:
+            self._url_ids.append(self.urls.intern(url))
+            self._test_ids.append(self.tests.intern(test))
+            self._status.append(status)
+            self._comment_ids.append(self.comments.intern('' if comments is None else str(comments)))
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def __len__(self) -> int:
+        return len(self._status)
+
+    def __iter__(self) -> Iterator[Tuple[str, str, str, str]]:
+        for i in range(len(self)):
+            yield (
+                self.urls[self._url_ids[i]],
+                self.tests[self._test_ids[i]],
+                STATUS_LABELS[self._status[i]],
+                self.comments[self._comment_ids[i]],
+            )
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns and the interned strings."""
+        arrays = sum(column.buffer_info()[1] * column.itemsize for column in (self._url_ids, self._test_ids, self._status, self._comment_ids))
+        strings = sum(len(value) for interner in (self.urls, self.tests, self.comments) for value in interner.values)
+        return arrays + strings
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Categorical DataFrame with columns page_url, test, status and comments.
+
+        Category codes are taken from the array buffers with ``np.frombuffer``
+        (copied once as plain integers, so the table can keep growing) and each
+        distinct string appears once as a category.
+        """
+        with self._lock:
+            columns = {
+                'page_url': self._categorical(self._url_ids, np.int32, self.urls.values),
+                'test': self._categorical(self._test_ids, np.int32, self.tests.values),
+                'status': self._categorical(self._status, np.int8, STATUS_LABELS),
+                'comments': self._categorical(self._comment_ids, np.int32, self.comments.values),
+            }
+        return pd.DataFrame(columns, copy=False)
+
+    @staticmethod
+    def _categorical(ids: array, dtype, categories: List[str]) -> pd.Categorical:
+        return pd.Categorical.from_codes(np.frombuffer(ids, dtype=dtype).copy(), categories=pd.Index(categories, dtype=object), validate=False)
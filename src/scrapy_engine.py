@@ -0,0 +1,365 @@
+"""
+Crawl engine built on Scrapy: its scheduler, dupefilter, AutoThrottle, robots.txt
+middleware and feed exports instead of the thread pool of ``src/crawler.py``.
+
+Pages are downloaded by Scrapy and the registered page checks run on them as
+spider callbacks; only pages the :class:`~src.fetcher.RenderPolicy` says need
+JavaScript are handed to a pooled Selenium browser, on a separate thread pool
+so the reactor keeps downloading meanwhile. Select it with
+``VacationRentalTester(engine='scrapy')`` or ``python main.py --engine scrapy``.
+"""
+import threading
+import time
+from typing import Callable, Iterable, Optional
+from urllib.parse import urljoin, urlparse
+
+from scrapy import Request, Spider, signals
+from scrapy.crawler import CrawlerRunner
+from scrapy.exceptions import CloseSpider, IgnoreRequest
+from scrapy.http import TextResponse
+from scrapy.utils.defer import maybe_deferred_to_future
+from selenium.common.exceptions import TimeoutException
+from twisted.internet import reactor, threads
+from twisted.python.threadpool import ThreadPool
+
+from .fetcher import DEFAULT_USER_AGENT, RenderPolicy
+from .frontier import PageBudget, VisitedSet
+from .pages import BrowserPage, HtmlPage
+from .readiness import ReadinessWaiter
+from .timing import make_timer
+from .urlnorm import UrlNormalizer
+
+_reactor_thread = None
+_reactor_lock = threading.Lock()
+
+
+def _ensure_reactor():
+    """
+    Run the Twisted reactor on a background thread, once per process.
+
+    A reactor cannot be restarted, so rather than ``CrawlerProcess`` (one
+    crawl per process) every crawl is scheduled onto this long-lived reactor
+    and the calling thread blocks until it finishes.
+    """
+    global _reactor_thread
+    with _reactor_lock:
+        if _reactor_thread is None:
+            _reactor_thread = threading.Thread(
+                target=reactor.run, kwargs={'installSignalHandlers': False}, name='scrapy-reactor', daemon=True
+            )
+            _reactor_thread.start()
+
+
+class CheckSpider(Spider):
+    """Spider whose callbacks are the :class:`ScrapyEngine`'s; it holds no crawl logic itself."""
+
+    name = 'vacation_rental_checks'
+
+    def __init__(self, engine, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.engine = engine
+        engine._spider = self
+        self.allowed_domains = [urlparse(engine.start_url).hostname]
+
+    def start_requests(self):
+        yield self.engine.request(self.engine.start_url)
+
+    async def parse(self, response):
+        async for output in self.engine.parse(response):
+            yield output
+
+    def errback(self, failure):
+        return self.engine.errback(failure)
+
+
+class ScrapyEngine:
+    def __init__(self, start_url: str, checks: Iterable[Callable], driver_pool, max_workers: int = 10, max_depth: int = 3, max_links: int = 40, retries: int = 2, render_policy: Optional[RenderPolicy] = None, collect_links: bool = False, readiness=None, on_result: Optional[Callable] = None, keep_results: bool = True, normalizer: Optional[UrlNormalizer] = None, respect_robots: bool = True, autothrottle: bool = True, feeds: Optional[dict] = None, settings: Optional[dict] = None, throttle=None, timing=None):
+        """
+        Crawl a site with Scrapy and run every page check against each downloaded page.
+
+        Drop-in for :class:`~src.crawler.CrawlEngine` in the testers: same checks,
+        results, ``discovered_links``, ``page_depths`` and ``stats``.
+
+        Args:
+            start_url (str): First page of the crawl
+            checks (iterable): Page checks to run, see :func:`~src.crawler.register_check`
+            driver_pool (DriverPool): Pool browsers are borrowed from for pages that need rendering
+            max_workers (int): Concurrent downloads (``CONCURRENT_REQUESTS``) and browser renders
+            max_depth (int): How many link levels to follow from the start page (``DEPTH_LIMIT``)
+            max_links (int): Maximum number of pages to test; the spider closes once reached
+            retries (int): Retries of failed downloads (``RETRY_TIMES``) and browser timeouts
+            render_policy (RenderPolicy): Rules and heuristics for escalating a page to a browser
+            collect_links (bool): Record every internal, external and image URL seen on
+                tested pages in ``discovered_links`` (url -> (source page, kind))
+            readiness (str or ReadinessWaiter): How to decide a rendered page is ready
+            on_result (callable): Called as ``on_result(url, test, status, comments)`` for
+                every result, from the reactor thread
+            keep_results (bool): Also collect results in memory and return them from :meth:`run`
+            normalizer (UrlNormalizer): Canonicalizes links before they are scheduled, so
+                Scrapy's dupefilter sees one spelling per page
+            respect_robots (bool): Obey robots.txt (``ROBOTSTXT_OBEY``, parsed with Protego)
+            autothrottle (bool): Adapt the per-host download delay to the server's latency
+            feeds (dict): Scrapy ``FEEDS`` the results are exported to as well, e.g.
+                ``{'results.jsonl': {'format': 'jsonlines'}}``
+            settings (dict): Further Scrapy settings, overriding the ones derived above
+            throttle (HostThrottle): Accepted for compatibility with ``CrawlEngine``; only its
+                fixed ``rate`` is used (as ``DOWNLOAD_DELAY``), AutoThrottle and Scrapy's
+                robots.txt middleware take the place of the rest
+            timing (PhaseTimer or bool): Time the download, browser checkout, navigation,
+                readiness wait, each check and link extraction of every page (see
+                ``src/timing.py``); True for a new timer. Off by default
+        """
+        self.normalizer = normalizer or UrlNormalizer()
+        self.normalizer.add_canonical_host(urlparse(start_url).hostname or '')
+        self.start_url = self.normalizer.normalize(start_url) or start_url
+        self.start_domain = urlparse(self.start_url).netloc
+        self.checks = list(checks)
+        self.driver_pool = driver_pool
+        self.max_workers = max_workers
+        self.max_depth = max_depth
+        self.max_links = max_links
+        self.retries = retries
+        self.render_policy = render_policy or RenderPolicy()
+        self.readiness = readiness if isinstance(readiness, ReadinessWaiter) else ReadinessWaiter(readiness or 'load')
+        self.timing = make_timer(timing)
+        self.on_result = on_result
+        self.keep_results = keep_results
+        self.settings = {
+            'BOT_NAME': 'vacation_rental_tester',
+            'USER_AGENT': DEFAULT_USER_AGENT,
+            'ROBOTSTXT_OBEY': respect_robots,
+            'CONCURRENT_REQUESTS': max_workers,
+            'CONCURRENT_REQUESTS_PER_DOMAIN': max_workers,
+            'DOWNLOAD_DELAY': 1 / throttle.rate if throttle is not None and throttle.rate else 0,
+            'DOWNLOAD_TIMEOUT': 15,
+            'AUTOTHROTTLE_ENABLED': autothrottle,
+            'AUTOTHROTTLE_START_DELAY': 0.1,
+            'AUTOTHROTTLE_TARGET_CONCURRENCY': max_workers,
+            'DEPTH_LIMIT': max_depth,
+            # Breadth-first, like the frontier of CrawlEngine
+            'DEPTH_PRIORITY': 1,
+            'SCHEDULER_MEMORY_QUEUE': 'scrapy.squeues.FifoMemoryQueue',
+            'SCHEDULER_DISK_QUEUE': 'scrapy.squeues.PickleFifoDiskQueue',
+            'RETRY_TIMES': retries,
+            # Error pages are tested too; the status check reports them
+            'HTTPERROR_ALLOW_ALL': True,
+            'TELNETCONSOLE_ENABLED': False,
+            'LOG_LEVEL': 'WARNING',
+            # Use whichever reactor is installed; the crawl only awaits Deferreds
+            'TWISTED_REACTOR': None,
+            'FEEDS': feeds or {},
+            **(settings or {}),
+        }
+
+        self.results = []
+        self.visited_urls = VisitedSet()
+        self.budget = PageBudget(max_links)
+        self.discovered_links = {} if collect_links else None
+        self.reused_urls = set()  # Nothing is reused; kept for the testers
+        self.page_depths = {}
+        self.navigations = 0
+        self.escalations = 0
+        self.stats = {}
+        self._stats_lock = threading.Lock()
+        self._render_pool = None
+        self._crawler = None
+        self._spider = None  # Set by CheckSpider, whose methods are the request callbacks
+
+    def request(self, url, depth=None):
+        meta = {} if depth is None else {'depth': depth}
+        return Request(url, callback=self._spider.parse, errback=self._spider.errback, meta=meta)
+
+    def _report(self, rows):
+        def report(url, test, status, comments):
+            rows.append({'url': url, 'test': test, 'status': status, 'comments': comments})
+        return report
+
+    def _test_page(self, page):
+        """Run every check on ``page``; returns the result rows as items."""
+        print(f"Testing URL: {page.url} (Depth: {page.depth})")
+        self.page_depths[page.url] = page.depth
+        rows = []
+        report = self._report(rows)
+        for check in self.checks:
+            name = getattr(check, 'check_name', check.__name__)
+            try:
+                with self.timing.phase(f'check:{name}'):
+                    check(page, report)
+            except Exception as e:
+                print(f"[ERROR] URL: {page.url} - Error during {name} check: {e}")
+                report(page.url, name, "Error", str(e))
+        return rows
+
+    def _claim(self, url):
+        """Reserve a budget slot and claim the final page URL; False if either is taken."""
+        if not self.budget.acquire():
+            return False
+        if not self.visited_urls.claim(url):
+            self.budget.release()
+            return False
+        return True
+
+    def _render(self, url, depth):
+        """
+        Load ``url`` in a pooled browser and test it; runs on the render thread pool.
+
+        Returns:
+            tuple: ``(rows, snapshot, final_url)``, or None if the page was not tested
+        """
+        started = time.perf_counter()
+        self.timing.start_page()
+        with self.timing.phase('driver_checkout'):
+            driver = self.driver_pool.checkout()
+        try:
+            self.readiness.install(driver)
+            for attempt in range(self.retries):
+                try:
+                    with self._stats_lock:
+                        self.navigations += 1
+                    with self.timing.phase('navigate'):
+                        driver.get(url)
+                    with self.timing.phase('page_load_wait'):
+                        self.readiness.wait_for_page(driver, label=url)
+                    final_url = self.normalizer.normalize(driver.current_url) or driver.current_url
+                    if urlparse(final_url).netloc != self.start_domain or not self._claim(final_url):
+                        return None
+                    page = BrowserPage(driver, final_url, depth)
+                    rows = self._test_page(page)
+                    self.budget.commit()
+                    return rows, page.snapshot(), final_url
+                except TimeoutException as e:
+                    if attempt < self.retries - 1:
+                        print(f"[WARNING] Timeout on {url}, retrying ({attempt + 1}/{self.retries})...")
+                        self.timing.count('retries')
+                        time.sleep(1)
+                    else:
+                        print(f"[ERROR] URL: {url} - Timeout after {self.retries} attempts.")
+                        self.timing.count('page_load_timeouts')
+                        return [{'url': url, 'test': "Page Load", 'status': "Fail", 'comments': str(e)}], None, url
+        finally:
+            self.driver_pool.checkin(driver)
+            self.timing.end_page(url, time.perf_counter() - started)
+        return None
+
+    async def parse(self, response):
+        """Test a downloaded page, in a browser if it needs rendering, and schedule its links."""
+        if not isinstance(response, TextResponse) or self.budget.exhausted:
+            return
+        depth = response.meta.get('depth', 0)
+        final_url = self.normalizer.normalize(response.url) or response.url
+        if urlparse(final_url).netloc != self.start_domain:
+            return
+
+        if self.timing.enabled and 'download_latency' in response.meta:
+            self.timing.record('download', response.meta['download_latency'])
+        page = HtmlPage(response.body, final_url, depth, status_code=response.status)
+        started = None  # set for pages tested here; rendered pages are timed on the render thread
+        if self.render_policy.needs_rendering(page):
+            with self._stats_lock:
+                self.escalations += 1
+            rendered = await maybe_deferred_to_future(
+                threads.deferToThreadPool(reactor, self._render_pool, self._render, final_url, depth)
+            )
+            if rendered is None:
+                return
+            rows, snapshot, final_url = rendered
+        else:
+            if not self._claim(final_url):
+                return
+            started = time.perf_counter()
+            self.timing.start_page()
+            rows = self._test_page(page)
+            self.budget.commit()
+            snapshot = page.snapshot()
+
+        with self.timing.phase('link_extraction'):
+            link_requests = [] if snapshot is None else list(self._links(snapshot, final_url, depth))
+        if started is not None:
+            self.timing.end_page(final_url, time.perf_counter() - started)
+        for row in rows:
+            yield row
+        for request in link_requests:
+            yield request
+        if self.budget.exhausted:
+            raise CloseSpider('max_links')
+
+    def _links(self, snapshot, page_url, depth):
+        """Requests for the internal links of a tested page; Scrapy's dupefilter drops repeats."""
+        discovered = self.discovered_links
+        for href in snapshot.hrefs:
+            if not href or href.startswith(('javascript:', '#')):
+                continue
+            absolute_url = urljoin(page_url, href)
+            canonical_url = self.normalizer.normalize(absolute_url)
+            if canonical_url is None:
+                continue
+            internal = urlparse(canonical_url).netloc == self.start_domain
+            if discovered is not None:
+                discovered.setdefault(absolute_url.split('#')[0], (page_url, 'internal' if internal else 'external'))
+            if internal and depth < self.max_depth:
+                yield self.request(canonical_url, depth + 1)
+        if discovered is not None:
+            for image in snapshot.images:
+                src = image.get('src')
+                if src and urlparse(src).scheme in ('http', 'https'):
+                    discovered.setdefault(src, (page_url, 'image'))
+
+    def errback(self, failure):
+        if failure.check(IgnoreRequest):
+            return None  # robots.txt, offsite or depth filters
+        url = failure.request.url
+        print(f"[ERROR] URL: {url} - Download failed: {failure.value}")
+        return {'url': url, 'test': "Page Load", 'status': "Fail", 'comments': str(failure.value)}
+
+    def _item_scraped(self, item, response, spider):
+        row = (item['url'], item['test'], item['status'], item['comments'])
+        if self.keep_results:
+            self.results.append(row)
+        if self.on_result:
+            self.on_result(*row)
+
+    def _crawl(self):
+        """Start the crawl on the reactor thread; returns a Deferred fired when it ends."""
+        runner = CrawlerRunner(self.settings)
+        self._crawler = crawler = runner.create_crawler(CheckSpider)
+        crawler.signals.connect(self._item_scraped, signal=signals.item_scraped)
+        return crawler.crawl(engine=self)
+
+    def run(self):
+        """Crawl until the scheduler is drained or ``max_links`` pages are tested."""
+        _ensure_reactor()
+        self._render_pool = ThreadPool(0, self.max_workers, name='scrapy-render')
+        self._render_pool.start()
+        started = time.perf_counter()
+        try:
+            threads.blockingCallFromThread(reactor, self._crawl)
+        except KeyboardInterrupt:
+            threads.blockingCallFromThread(reactor, self._crawler.stop)
+            raise
+        finally:
+            self._render_pool.stop()
+
+        wall_time = time.perf_counter() - started
+        scrapy_stats = self._crawler.stats.get_stats()
+        self.stats = {
+            'engine': 'scrapy',
+            'pages': len(self.visited_urls),
+            'navigations': self.navigations,
+            'http_fetches': scrapy_stats.get('response_received_count', 0),
+            'escalations': self.escalations,
+            'requests': scrapy_stats.get('downloader/request_count', 0),
+            'duplicates_filtered': scrapy_stats.get('dupefilter/filtered', 0),
+            'retries': scrapy_stats.get('retry/count', 0),
+            'robots_blocked': scrapy_stats.get('robotstxt/forbidden', 0),
+            'finish_reason': scrapy_stats.get('finish_reason'),
+            'wall_time': wall_time,
+            'pages_per_s': len(self.visited_urls) / wall_time if wall_time else 0.0,
+            **self.readiness.summary(),
+            **self.timing.summary(),
+        }
+        print(
+            f"Crawl finished (Scrapy): {self.stats['pages']} pages, {self.stats['http_fetches']} downloads "
+            f"({self.escalations} rendered in a browser), {self.stats['duplicates_filtered']} duplicates filtered, "
+            f"{self.stats['robots_blocked']} disallowed by robots.txt, {wall_time:.1f}s."
+        )
+        return self.results
@@ -0,0 +1,293 @@
+import hashlib
+import math
+import os
+import sqlite3
+import sys
+import tempfile
+from array import array
+from typing import Iterator, Optional
+
+
+def fingerprint(url: str) -> int:
+    """64-bit BLAKE2b digest of ``url``; two distinct URLs collide with probability ~2^-64."""
+    return int.from_bytes(hashlib.blake2b(url.encode('utf-8', 'surrogatepass'), digest_size=8).digest(), 'little')
+
+
+class ExactSeenSet:
+    """Python set of the full URL strings: exact and iterable, but ~100+ bytes per URL."""
+
+    def __init__(self):
+        self._urls = set()
+
+    def add(self, url: str):
+        self._urls.add(url)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._urls
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._urls))
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self._urls) + sum(sys.getsizeof(url) for url in self._urls)
+
+    def close(self):
+        pass
+
+
+class FingerprintSeenSet:
+    def __init__(self, initial_capacity: int = 1024, max_load: float = 0.7):
+        """
+        Set of 8-byte URL fingerprints in an open-addressing hash table.
+
+        The table is one ``array('Q')`` with linear probing, about 12 bytes
+        per URL at the default load factor regardless of URL length. A false
+        "seen" needs a 64-bit collision, negligible even for billions of URLs,
+        but the URLs themselves cannot be listed.
+
+        Args:
+            initial_capacity (int): Slots allocated up front, rounded up to a power of two
+            max_load (float): Fill ratio at which the table doubles
+        """
+        capacity = 1 << max(4, (initial_capacity - 1).bit_length())
+        self.max_load = max_load
+        self._table = array('Q', [0]) * capacity
+        self._mask = capacity - 1
+        self._count = 0
+
+    def _slot(self, digest: int) -> int:
+        table, mask = self._table, self._mask
+        index = digest & mask
+        while True:
+            value = table[index]
+            if value == 0 or value == digest:
+                return index
+            index = (index + 1) & mask
+
+    @staticmethod
+    def _digest(url: str) -> int:
+        return fingerprint(url) or 1  # 0 marks an empty slot
+
+    def add(self, url: str):
+        digest = self._digest(url)
+        index = self._slot(digest)
+        if self._table[index] == 0:
+            self._table[index] = digest
+            self._count += 1
+            if self._count > len(self._table) * self.max_load:
+                self._grow()
+
+    def _grow(self):
+        old = self._table
+        self._table = array('Q', [0]) * (len(old) * 2)
+        self._mask = len(self._table) - 1
+        for digest in old:
+            if digest:
+                self._table[self._slot(digest)] = digest
+
+    def __contains__(self, url: str) -> bool:
+        digest = self._digest(url)
+        return self._table[self._slot(digest)] == digest
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self):
+        raise TypeError("A fingerprint seen-set does not keep the URLs")
+
+    def nbytes(self) -> int:
+        return len(self._table) * self._table.itemsize
+
+    def close(self):
+        pass
+
+
+class _BloomSlice:
+    __slots__ = ('capacity', 'count', 'size', 'hashes', 'bits')
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.count = 0
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def positions(self, h1: int, h2: int):
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hashes)]
+
+    def __contains__(self, hashes) -> bool:
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self.positions(*hashes))
+
+    def add(self, hashes):
+        bits = self.bits
+        for position in self.positions(*hashes):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+
+class BloomSeenSet:
+    def __init__(self, error_rate: float = 1e-4, initial_capacity: int = 100000, growth: int = 2, tightening: float = 0.5):
+        """
+        Scalable Bloom filter (Almeida et al.): constant bits per URL at a chosen false-positive rate.
+
+        Once a filter slice holds ``capacity`` URLs a new one, ``growth`` times
+        larger and with a ``tightening`` times lower error rate, is added, so the
+        overall false-positive rate stays below ``error_rate`` however many URLs
+        arrive. At 1e-4 that is about 2.5 bytes per URL.
+
+        A false positive makes an unseen URL look seen: the frontier skips that
+        link, and a visited check skips testing a page.
+
+        Args:
+            error_rate (float): Upper bound on the false-positive probability
+            initial_capacity (int): URLs the first slice is sized for
+            growth (int): Capacity multiplier of each new slice
+            tightening (float): Error-rate multiplier of each new slice
+        """
+        self.error_rate = error_rate
+        self.growth = growth
+        self.tightening = tightening
+        self._slices = []
+        self._count = 0
+        self._add_slice(initial_capacity)
+
+    def _add_slice(self, capacity: int):
+        # Slice error rates form a geometric series summing to error_rate
+        slice_error = self.error_rate * (1 - self.tightening) * self.tightening ** len(self._slices)
+        self._slices.append(_BloomSlice(capacity, slice_error))
+
+    @staticmethod
+    def _hashes(url: str):
+        digest = hashlib.blake2b(url.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        # Double hashing (Kirsch-Mitzenmacher); an odd step visits distinct positions
+        return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+
+    def add(self, url: str):
+        hashes = self._hashes(url)
+        if any(hashes in bloom for bloom in self._slices):
+            return
+        current = self._slices[-1]
+        if current.count >= current.capacity:
+            self._add_slice(current.capacity * self.growth)
+            current = self._slices[-1]
+        current.add(hashes)
+        self._count += 1
+
+    def __contains__(self, url: str) -> bool:
+        hashes = self._hashes(url)
+        return any(hashes in bloom for bloom in self._slices)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self):
+        raise TypeError("A Bloom filter seen-set does not keep the URLs")
+
+    def nbytes(self) -> int:
+        return sum(len(bloom.bits) for bloom in self._slices)
+
+    def close(self):
+        pass
+
+
+class DiskSeenSet:
+    def __init__(self, path: Optional[str] = None, directory: Optional[str] = None, cache_mb: int = 16, commit_every: int = 10000):
+        """
+        URL fingerprints kept in a SQLite table, so memory stays at the page cache size.
+
+        Lookups hit SQLite's B-tree (mostly from its page cache); inserts are
+        committed in batches. Useful when even a Bloom filter would not fit or
+        no false positives beyond 64-bit collisions are acceptable.
+
+        Args:
+            path (str): Database file; a temporary file (deleted on close) if None
+            directory (str): Where the temporary file is created
+            cache_mb (int): SQLite page cache size
+            commit_every (int): Inserts per transaction
+        """
+        self._temporary = path is None
+        if path is None:
+            handle, path = tempfile.mkstemp(suffix='.seen.db', dir=directory)
+            os.close(handle)
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.commit_every = commit_every
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=OFF")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute(f"PRAGMA cache_size=-{cache_mb * 1024}")
+        self.cache_bytes = cache_mb * 1024 * 1024
+        self._conn.execute("CREATE TABLE IF NOT EXISTS seen (digest INTEGER PRIMARY KEY)")
+        self._count = self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+        self._uncommitted = 0
+
+    @staticmethod
+    def _key(url: str) -> int:
+        digest = fingerprint(url)
+        return digest - (1 << 64) if digest >= 1 << 63 else digest  # SQLite integers are signed
+
+    def add(self, url: str):
+        if not self._uncommitted:
+            self._conn.execute("BEGIN")
+        cursor = self._conn.execute("INSERT OR IGNORE INTO seen (digest) VALUES (?)", (self._key(url),))
+        self._count += cursor.rowcount
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_every:
+            self._conn.execute("COMMIT")
+            self._uncommitted = 0
+
+    def __contains__(self, url: str) -> bool:
+        return self._conn.execute("SELECT 1 FROM seen WHERE digest = ?", (self._key(url),)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self):
+        raise TypeError("A disk seen-set does not keep the URLs")
+
+    def nbytes(self) -> int:
+        """Memory held: the SQLite page cache, which never exceeds the database size."""
+        if self._conn is None:
+            return 0
+        pages, page_size = (self._conn.execute(f"PRAGMA {pragma}").fetchone()[0] for pragma in ('page_count', 'page_size'))
+        return min(self.cache_bytes, pages * page_size)
+
+    def disk_bytes(self) -> int:
+        return os.path.getsize(self.path)
+
+    def close(self):
+        if self._conn is None:
+            return
+        if self._uncommitted:
+            self._conn.execute("COMMIT")
+        self._conn.close()
+        self._conn = None
+        if self._temporary:
+            os.remove(self.path)
+
+
+SEEN_BACKENDS = {
+    'exact': ExactSeenSet,
+    'fingerprint': FingerprintSeenSet,
+    'bloom': BloomSeenSet,
+    'disk': DiskSeenSet,
+}
+
+
+def make_seen_set(backend: str = 'exact', **options):
+    """
+    Create a seen-set backend by name: ``exact``, ``fingerprint``, ``bloom`` or ``disk``.
+
+    Args:
+        backend (str): Backend name from ``SEEN_BACKENDS``
+        **options: Passed to the backend, e.g. ``error_rate`` for ``bloom``
+    """
+    if backend not in SEEN_BACKENDS:
+        raise ValueError(f"Unknown seen-set backend: {backend} (use one of {', '.join(SEEN_BACKENDS)})")
+    return SEEN_BACKENDS[backend](**options)
@@ -0,0 +1,298 @@
+"""
+Sharded crawls: several worker processes, on one machine or many, share one crawl.
+
+Every worker runs a regular ``CrawlEngine`` whose frontier and visited set
+live in a :class:`~src.coordinator.Coordinator`, streams its results to its own
+shard file, and the shards are merged into one report at the end.
+
+One machine, 8 processes (the workers open the SQLite coordinator directly)::
+
+    python -m src.sharding local https://www.alojamiento.io/ --processes 8 --max-links 2000
+
+Several machines (the coordinator is served over TCP)::
+
+    python -m src.sharding serve https://www.alojamiento.io/ --db crawl.db --listen 0.0.0.0:50000 --authkey secret
+    python -m src.sharding work --connect coordinator-host:50000 --authkey secret --processes 8   # on each machine
+    python -m src.sharding merge --db crawl.db test_results/shards/*.jsonl                      # once the shards are collected
+"""
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import socket
+from datetime import datetime
+from urllib.parse import urlparse
+from typing import Iterable, Iterator, Optional
+
+import pandas as pd
+
+from .coordinator import Coordinator, SharedFrontier, SharedVisitedSet, connect_coordinator, serve_coordinator
+from .report import ReportBuilder
+from .sinks import read_rows
+from .urlnorm import UrlNormalizer
+
+SHARD_FOLDER = 'shards'
+
+# Test name of the discovered-link status rows, which the coordinator already deduplicates
+LINK_TEST = "Link Status Code"
+
+
+def seed_url(url: str) -> str:
+    """The start URL as every worker's engine normalizes it, so the first page is not queued twice."""
+    return UrlNormalizer(canonical_hosts=[urlparse(url).hostname or '']).normalize(url) or url
+
+
+def worker_name(index: int) -> str:
+    """Name unique across machines and processes, used for leases and shard files."""
+    return f"{socket.gethostname()}-{os.getpid()}-{index}"
+
+
+def run_worker(coordinator, output_folder: str = 'test_results', worker: Optional[str] = None, headless: bool = True, max_workers: int = 4, lease_batch: int = 1, **engine_options) -> str:
+    """
+    Crawl as one shard until the coordinator has no more work.
+
+    Args:
+        coordinator (Coordinator): Local instance or proxy from ``connect_coordinator``
+        output_folder (str): Folder the shard file is written to (under ``shards/``)
+        worker (str): Unique worker name, generated if None
+        headless (bool): Run the browsers headless
+        max_workers (int): Pages loaded concurrently by this worker
+        lease_batch (int): URLs leased from the coordinator per round trip
+        **engine_options: Extra ``CrawlEngine`` options, e.g. ``fetch_mode='http'``
+
+    Returns:
+        str: Path of the shard's results file
+    """
+    # Imported here so the coordinator can be served without selenium installed
+    from .VacationRentalTester import VacationRentalTester
+
+    config = coordinator.config()
+    if config is None:
+        raise ValueError("The coordinator has no crawl; seed it first")
+    worker = worker or worker_name(0)
+    shard_path = os.path.join(output_folder, SHARD_FOLDER, f'shard-{worker}.jsonl')
+
+    tester = VacationRentalTester(
+        url=config['start_url'],
+        output_folder=output_folder,
+        headless=headless,
+        max_workers=max_workers,
+        max_depth=config['max_depth'],
+        max_links=config['max_links'],
+        results_stream=shard_path,
+        link_filter=lambda urls: coordinator.claim_links(urls, worker),
+        frontier=SharedFrontier(coordinator, worker, max_depth=config['max_depth'], lease_batch=lease_batch),
+        visited=SharedVisitedSet(coordinator),
+        **engine_options
+    )
+    try:
+        tester.run_checks(config.get('checks'))
+    finally:
+        if tester.sink:
+            tester.sink.close()
+    coordinator.report_stats(worker, {**tester.crawl_stats, 'results': tester.sink.rows_written if tester.sink else 0})
+    print(f"[SUCCESS] Shard {worker} finished: {tester.crawl_stats.get('pages', 0)} pages, results in {shard_path}")
+    return shard_path
+
+
+def _worker_main(target, output_folder, index, options):
+    """Entry point of a worker process; ``target`` is a database path or ``(address, authkey)``."""
+    if isinstance(target, str):
+        coordinator = Coordinator(target)
+    else:
+        coordinator = connect_coordinator(*target)
+    try:
+        run_worker(coordinator, output_folder, worker=worker_name(index), **options)
+    finally:
+        if isinstance(coordinator, Coordinator):
+            coordinator.close()
+
+
+def start_workers(target, processes: int, output_folder: str = 'test_results', **options):
+    """
+    Start ``processes`` worker processes and wait for all of them.
+
+    Processes are spawned rather than forked, so none inherits the parent's
+    SQLite connection or threads.
+
+    Args:
+        target: Coordinator database path, or ``(address, authkey)`` of a served coordinator
+        processes (int): Number of worker processes
+        output_folder (str): Folder the shard files are written to
+        **options: Passed to :func:`run_worker`
+    """
+    context = multiprocessing.get_context('spawn')
+    workers = [
+        context.Process(target=_worker_main, args=(target, output_folder, index, options), name=f'shard-{index}')
+        for index in range(processes)
+    ]
+    for process in workers:
+        process.start()
+    try:
+        for process in workers:
+            process.join()
+    except KeyboardInterrupt:
+        for process in workers:
+            process.terminate()
+        raise
+    failed = [process.name for process in workers if process.exitcode]
+    if failed:
+        print(f"[WARNING] Worker processes failed: {', '.join(failed)}; their unfinished leases were not completed")
+
+
+def _deduplicated_rows(shard_paths: Iterable[str]) -> Iterator[dict]:
+    """
+    Rows of every shard, keeping each page's results from one shard only.
+
+    When a slow worker's lease expires the page is leased to another worker
+    and both may test it. The first shard with rows for a ``(page_url, test)``
+    keeps them (a check may report several rows per page); link status rows
+    are already unique, the coordinator hands each link to one worker.
+    """
+    owners = {}
+    for index, path in enumerate(shard_paths):
+        for row in read_rows(path):
+            if row.get('testcase') != LINK_TEST:
+                owner = owners.setdefault((row.get('page_url'), row.get('testcase')), index)
+                if owner != index:
+                    continue
+            yield row
+
+
+def merge_shards(shard_paths: Iterable[str], output_path: str, coordinator=None) -> Optional[str]:
+    """
+    Merge shard results into one report.
+
+    Results of a page tested by two workers (after a lease expired) are kept
+    once; the deduplicated rows are written next to the report as ``.jsonl``.
+
+    Args:
+        shard_paths (iterable): Results files written by the workers
+        output_path (str): Output .xlsx file
+        coordinator (Coordinator): Source of page depths and per-worker stats, optional
+
+    Returns:
+        str: Path of the report, or None if there were no results
+    """
+    builder = ReportBuilder(output_path, depths=coordinator.page_depths() if coordinator else None)
+    merged_path = os.path.splitext(output_path)[0] + '.jsonl'
+    os.makedirs(os.path.dirname(os.path.abspath(merged_path)), exist_ok=True)
+    with open(merged_path, 'w', encoding='utf-8') as merged:
+        for row in _deduplicated_rows(list(shard_paths)):
+            merged.write(json.dumps(row, ensure_ascii=False, default=str) + '\n')
+    builder.add_stream(merged_path)
+    if coordinator:
+        workers = coordinator.worker_stats()
+        if workers:
+            builder.add_sheet('Shard Stats', pd.DataFrame.from_dict(workers, orient='index'), index=True)
+        builder.add_sheet('Crawl Stats', pd.DataFrame(list(coordinator.stats().items()), columns=['Metric', 'Value']))
+    return builder.write()
+
+
+def _report_path(output_folder):
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return os.path.join(output_folder, f'test_results_sharded_{timestamp}.xlsx')
+
+
+def run_sharded(url: str, processes: int = 4, output_folder: str = 'test_results', db_path: Optional[str] = None, max_depth: int = 3, max_links: int = 40, check_names=None, resume: bool = False, **options) -> Optional[str]:
+    """
+    Crawl ``url`` with ``processes`` worker processes on this machine and merge their results.
+
+    Args:
+        url (str): Start page
+        processes (int): Number of worker processes
+        output_folder (str): Folder for the coordinator database, shard files and report
+        db_path (str): Coordinator database, ``<output_folder>/crawl_coordinator.db`` by default
+        max_depth (int): How many link levels to follow from the start page
+        max_links (int): Maximum number of pages tested by all workers together
+        check_names (list): Registered check names to run, all checks if None
+        resume (bool): Continue the crawl kept in ``db_path`` instead of starting over
+        **options: Passed to :func:`run_worker`, e.g. ``max_workers``, ``headless``
+
+    Returns:
+        str: Path of the merged report
+    """
+    db_path = db_path or os.path.join(output_folder, 'crawl_coordinator.db')
+    coordinator = Coordinator(db_path)
+    try:
+        coordinator.seed(seed_url(url), {'max_depth': max_depth, 'max_links': max_links, 'checks': check_names}, reset=not resume)
+        if not resume:
+            for path in glob.glob(os.path.join(output_folder, SHARD_FOLDER, 'shard-*.jsonl')):
+                os.remove(path)  # Left over from an earlier crawl
+        start_workers(db_path, processes, output_folder, **options)
+        shards = sorted(glob.glob(os.path.join(output_folder, SHARD_FOLDER, 'shard-*.jsonl')))
+        return merge_shards(shards, _report_path(output_folder), coordinator)
+    finally:
+        coordinator.close()
+
+
+def _address(value: str):
+    host, _, port = value.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded crawl across processes and machines")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def add_crawl_options(command):
+        command.add_argument('url', help="Start page")
+        command.add_argument('--db', help="Coordinator database")
+        command.add_argument('--max-depth', type=int, default=3)
+        command.add_argument('--max-links', type=int, default=40)
+        command.add_argument('--checks', nargs='+', help="Check names to run, all if omitted")
+        command.add_argument('--resume', action='store_true', help="Continue the crawl kept in the database")
+
+    def add_worker_options(command):
+        command.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+        command.add_argument('--max-workers', type=int, default=4, help="Concurrent pages per process")
+        command.add_argument('--fetch-mode', choices=('browser', 'http'), default='browser')
+        command.add_argument('--output', default='test_results')
+
+    local = commands.add_parser('local', help="Run every worker on this machine")
+    add_crawl_options(local)
+    add_worker_options(local)
+
+    serve = commands.add_parser('serve', help="Serve the coordinator to workers on other machines")
+    add_crawl_options(serve)
+    serve.add_argument('--listen', default='0.0.0.0:50000', help="host:port to listen on")
+    serve.add_argument('--authkey', default=os.environ.get('SHARD_AUTHKEY'), help="Shared secret (or SHARD_AUTHKEY)")
+
+    work = commands.add_parser('work', help="Run workers against a served coordinator")
+    add_worker_options(work)
+    work.add_argument('--connect', required=True, help="host:port of the coordinator")
+    work.add_argument('--authkey', default=os.environ.get('SHARD_AUTHKEY'), help="Shared secret (or SHARD_AUTHKEY)")
+
+    merge = commands.add_parser('merge', help="Merge shard files into one report")
+    merge.add_argument('shards', nargs='+', help="Shard .jsonl files")
+    merge.add_argument('--db', help="Coordinator database, for page depths and worker stats")
+    merge.add_argument('--output', default='test_results')
+
+    args = parser.parse_args()
+    if args.command in ('serve', 'work') and not args.authkey:
+        parser.error("--authkey (or SHARD_AUTHKEY) is required")
+
+    if args.command == 'local':
+        run_sharded(
+            args.url, processes=args.processes, output_folder=args.output, db_path=args.db,
+            max_depth=args.max_depth, max_links=args.max_links, check_names=args.checks, resume=args.resume,
+            max_workers=args.max_workers, fetch_mode=args.fetch_mode
+        )
+    elif args.command == 'serve':
+        coordinator = Coordinator(args.db or 'crawl_coordinator.db')
+        coordinator.seed(seed_url(args.url), {'max_depth': args.max_depth, 'max_links': args.max_links, 'checks': args.checks}, reset=not args.resume)
+        serve_coordinator(coordinator, _address(args.listen), args.authkey.encode())
+    elif args.command == 'work':
+        start_workers((_address(args.connect), args.authkey.encode()), args.processes, args.output, max_workers=args.max_workers, fetch_mode=args.fetch_mode)
+    else:
+        coordinator = Coordinator(args.db) if args.db else None
+        try:
+            merge_shards(args.shards, _report_path(args.output), coordinator)
+        finally:
+            if coordinator:
+                coordinator.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+import csv
+import json
+import os
+import threading
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+class ResultSink:
+    def __init__(self, path: str, columns: Sequence[str], flush_every: int = 100):
+        """
+        Append-only, thread-safe destination for result rows, written as they arrive.
+
+        Subclasses implement ``_write_rows`` and ``_flush``; rows are buffered
+        and handed over every ``flush_every`` rows and on :meth:`close`, so at
+        most that many rows are held in memory.
+
+        Args:
+            path (str): Output file
+            columns (sequence): Column names, in output order
+            flush_every (int): Rows buffered before they are written out
+        """
+        self.path = path
+        self.columns = list(columns)
+        self.flush_every = flush_every
+        self.rows_written = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._buffer: List[tuple] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def write(self, row: dict):
+        """Add one row given as ``{column: value}``; missing columns are left empty."""
+        values = tuple(row.get(column) for column in self.columns)
+        with self._lock:
+            self._buffer.append(values)
+            if len(self._buffer) >= self.flush_every:
+                self._drain()
+
+    def write_many(self, rows: Iterable[dict]):
+        for row in rows:
+            self.write(row)
+
+    def _drain(self):
+        if self._buffer:
+            self._write_rows(self._buffer)
+            self.rows_written += len(self._buffer)
+            self._buffer = []
+        self._flush()
+
+    def flush(self):
+        with self._lock:
+            self._drain()
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._drain()
+            self._close()
+            self._closed = True
+
+    def _write_rows(self, rows: List[tuple]):
+        raise NotImplementedError
+
+    def _flush(self):
+        pass
+
+    def _close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+
+class JsonlSink(ResultSink):
+    """One JSON object per line."""
+
+    def __init__(self, path: str, columns: Sequence[str], flush_every: int = 100):
+        super().__init__(path, columns, flush_every)
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def _write_rows(self, rows):
+        self._file.writelines(
+            json.dumps(dict(zip(self.columns, values)), ensure_ascii=False, default=str) + '\n' for values in rows
+        )
+
+    def _flush(self):
+        self._file.flush()
+
+    def _close(self):
+        self._file.close()
+
+
+class CsvSink(ResultSink):
+    """CSV with a header row."""
+
+    def __init__(self, path: str, columns: Sequence[str], flush_every: int = 100):
+        super().__init__(path, columns, flush_every)
+        self._file = open(path, 'w', encoding='utf-8', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.columns)
+
+    def _write_rows(self, rows):
+        self._writer.writerows(rows)
+
+    def _flush(self):
+        self._file.flush()
+
+    def _close(self):
+        self._file.close()
+
+
+def _import_pyarrow():
+    """pyarrow with its parquet module, or an ImportError naming the package to install."""
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise ImportError("Parquet results need the 'pyarrow' package (in requirements.txt): pip install pyarrow") from e
+    return pyarrow
+
+
+class ParquetSink(ResultSink):
+    """Parquet file written one row group per ``flush_every`` rows (requires pyarrow)."""
+
+    def __init__(self, path: str, columns: Sequence[str], flush_every: int = 10000):
+        pyarrow = _import_pyarrow()
+        super().__init__(path, columns, flush_every)
+        self._pa = pyarrow
+        self._schema = pyarrow.schema([(column, pyarrow.string()) for column in self.columns])
+        self._writer = pyarrow.parquet.ParquetWriter(path, self._schema)
+
+    def _write_rows(self, rows):
+        arrays = [
+            self._pa.array([None if value is None else str(value) for value in column], type=self._pa.string())
+            for column in zip(*rows)
+        ]
+        self._writer.write_table(self._pa.Table.from_arrays(arrays, schema=self._schema))
+
+    def _close(self):
+        self._writer.close()
+
+
+SINKS = {'.jsonl': JsonlSink, '.csv': CsvSink, '.parquet': ParquetSink}
+
+
+def open_sink(path: str, columns: Sequence[str], flush_every: Optional[int] = None) -> ResultSink:
+    """Create the sink matching the extension of ``path`` (.jsonl, .csv or .parquet)."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in SINKS:
+        raise ValueError(f"Unsupported results file type: {extension} (use one of {', '.join(SINKS)})")
+    if flush_every is None:
+        return SINKS[extension](path, columns)
+    return SINKS[extension](path, columns, flush_every)
+
+
+def read_rows(path: str) -> Iterator[dict]:
+    """Stream the rows back from a file written by a sink, one dict at a time."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.jsonl':
+        with open(path, encoding='utf-8') as handle:
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+    elif extension == '.csv':
+        with open(path, encoding='utf-8', newline='') as handle:
+            yield from csv.DictReader(handle)
+    elif extension == '.parquet':
+        pyarrow = _import_pyarrow()
+        for batch in pyarrow.parquet.ParquetFile(path).iter_batches():
+            yield from batch.to_pylist()
+    else:
+        raise ValueError(f"Unsupported results file type: {extension}")
+
+
+def write_excel(path: str, sheets: Iterable[Tuple[str, Sequence[str], Iterable[Sequence]]]):
+    """
+    Write sheets row by row with openpyxl's write-only mode.
+
+    Rows are streamed straight to the file, so memory stays flat regardless of
+    the number of rows (pandas ``to_excel`` builds every cell in memory first).
+
+    Args:
+        path (str): Output .xlsx file
+        sheets (iterable): ``(sheet_name, header, rows)`` triples; rows may be a generator
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    for sheet_name, header, rows in sheets:
+        sheet = workbook.create_sheet(title=sheet_name[:31])
+        sheet.append(list(header))
+        for row in rows:
+            sheet.append(list(row))
+    workbook.save(path)
@@ -0,0 +1,209 @@
+import gzip
+import io
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator, Optional, Tuple, Union
+from urllib.parse import urljoin
+
+import requests
+from lxml import etree
+
+from .fetcher import DEFAULT_USER_AGENT
+from .throttle import RobotsCache
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Sitemap indexes may not nest by the protocol; a little slack, then stop to avoid loops
+MAX_INDEX_DEPTH = 3
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[datetime]:
+    """
+    ``<lastmod>`` as an aware UTC datetime, None if missing or malformed.
+
+    Accepts every W3C Datetime precision the sitemap protocol allows:
+    ``2026``, ``2026-07``, ``2026-07-01`` and full timestamps with a zone
+    (``Z`` or ``+02:00``); a timestamp without a zone is taken as UTC.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        if len(value) == 4:
+            parsed = datetime(int(value), 1, 1)
+        elif len(value) == 7:
+            parsed = datetime(int(value[:4]), int(value[5:]), 1)
+        else:
+            parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _cutoff(since: Union[datetime, timedelta, None]) -> Optional[datetime]:
+    if since is None:
+        return None
+    if isinstance(since, timedelta):
+        return datetime.now(timezone.utc) - since
+    return since if since.tzinfo else since.replace(tzinfo=timezone.utc)
+
+
+class _ResponseBody(io.RawIOBase):
+    """Readable stream over a streamed response's (Content-Encoding decoded) chunks."""
+
+    def __init__(self, response, chunk_size: int = 64 * 1024):
+        self._chunks = response.iter_content(chunk_size)
+        self._buffer = b''
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._buffer:
+            self._buffer = next(self._chunks, None)
+            if self._buffer is None:
+                self._buffer = b''
+                return 0  # end of the body
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+class SitemapReader:
+    def __init__(self, throttle=None, robots: Optional[RobotsCache] = None, user_agent: str = DEFAULT_USER_AGENT, timeout: float = 30):
+        """
+        Stream page URLs out of sitemaps, sitemap indexes and robots.txt ``Sitemap:`` entries.
+
+        Sitemaps are parsed incrementally with ``lxml.etree.iterparse`` straight
+        from the response body (gunzipped on the fly for ``.xml.gz``), and every
+        ``<url>`` element is discarded once read, so a 50,000-URL sitemap never
+        sits in memory and the caller can stop reading as soon as it has enough.
+
+        Args:
+            throttle (HostThrottle): Per-host limits the sitemap downloads wait for
+            robots (RobotsCache): robots.txt cache to read ``Sitemap:`` lines from; the
+                throttle's if it has one, otherwise a private one
+            user_agent (str): User-Agent header sent with every request
+            timeout (float): Connect/read timeout in seconds
+        """
+        self.throttle = throttle
+        self.timeout = timeout
+        self.robots = robots or (throttle.robots if throttle is not None and throttle.robots else RobotsCache(user_agent))
+        self._owns_robots = robots is None and self.robots is not getattr(throttle, 'robots', None)
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = user_agent
+
+        # Counters for reporting
+        self.sitemaps_read = 0
+        self.urls_read = 0
+        self.stale = 0  # entries, or whole sitemaps of an index, last modified before the cutoff
+        self.undated = 0  # entries without a usable <lastmod> while filtering by date
+        self.errors = 0
+
+    def discover(self, site_url: str) -> list:
+        """Sitemaps listed in the site's robots.txt, ``/sitemap.xml`` if it lists none."""
+        sitemaps = self.robots.sitemaps(site_url)
+        return sitemaps or [urljoin(site_url, '/sitemap.xml')]
+
+    def _open(self, url: str):
+        """Response body as a binary stream, gunzipped if the file itself is gzip."""
+        if self.throttle is None:
+            response = self.session.get(url, timeout=self.timeout, stream=True)
+        else:
+            with self.throttle.request(url) as outcome:
+                response = self.session.get(url, timeout=self.timeout, stream=True)
+                outcome.status_code = response.status_code
+        if response.status_code != 200:
+            response.close()
+            print(f"[WARNING] Sitemap {url} returned {response.status_code}, skipping it")
+            return None
+        # Content-Encoding: gzip is undone by requests; a .xml.gz file still starts with the gzip magic
+        body = io.BufferedReader(_ResponseBody(response))
+        if body.peek(2)[:2] == GZIP_MAGIC:
+            body = gzip.GzipFile(fileobj=body)
+        return response, body
+
+    def _entries(self, url: str, body) -> Iterator[Tuple[str, str, Optional[str]]]:
+        """``(kind, loc, lastmod)`` of every ``<url>`` and ``<sitemap>`` element, streamed."""
+        # No entity resolution or network access while parsing, whatever the document says
+        events = etree.iterparse(body, events=('end',), tag=('{*}url', '{*}sitemap'), resolve_entities=False, no_network=True, recover=True)
+        for _, element in events:
+            loc = element.findtext('{*}loc')
+            if loc and loc.strip():
+                kind = 'sitemap' if etree.QName(element).localname == 'sitemap' else 'url'
+                yield kind, urljoin(url, loc.strip()), element.findtext('{*}lastmod')
+            # Drop the element and its already-read siblings so memory stays flat
+            element.clear()
+            parent = element.getparent()
+            while parent is not None and element.getprevious() is not None:
+                del parent[0]
+
+    def _read(self, url: str, cutoff: Optional[datetime], seen: set, depth: int) -> Iterator[Tuple[str, Optional[datetime]]]:
+        if url in seen or depth > MAX_INDEX_DEPTH:
+            return
+        seen.add(url)
+        try:
+            opened = self._open(url)
+        except requests.exceptions.RequestException as e:
+            print(f"[WARNING] Could not fetch sitemap {url}: {e}")
+            self.errors += 1
+            return
+        if opened is None:
+            self.errors += 1
+            return
+        response, body = opened
+        self.sitemaps_read += 1
+        try:
+            for kind, loc, lastmod_text in self._entries(url, body):
+                lastmod = parse_lastmod(lastmod_text)
+                if kind == 'sitemap':
+                    # A child sitemap unchanged since the cutoff cannot list recently changed pages
+                    if cutoff and lastmod and lastmod < cutoff:
+                        self.stale += 1
+                        continue
+                    yield from self._read(loc, cutoff, seen, depth + 1)
+                    continue
+                self.urls_read += 1
+                if cutoff:
+                    if lastmod is None:
+                        self.undated += 1
+                        continue
+                    if lastmod < cutoff:
+                        self.stale += 1
+                        continue
+                yield loc, lastmod
+        except (etree.XMLSyntaxError, OSError, EOFError) as e:
+            print(f"[WARNING] Sitemap {url} is not valid XML, stopped reading it: {e}")
+            self.errors += 1
+        finally:
+            response.close()
+
+    def urls(self, sitemap_urls: Iterable[str], since: Union[datetime, timedelta, None] = None) -> Iterator[Tuple[str, Optional[datetime]]]:
+        """
+        Yield ``(url, lastmod)`` of every page listed in ``sitemap_urls``, following sitemap indexes.
+
+        Args:
+            sitemap_urls (iterable): Sitemap or sitemap index URLs, e.g. from :meth:`discover`
+            since (datetime or timedelta): Only pages whose ``<lastmod>`` is at or after
+                this time (or within this long before now); pages without one are skipped
+        """
+        cutoff = _cutoff(since)
+        seen = set()
+        for sitemap_url in sitemap_urls:
+            yield from self._read(sitemap_url, cutoff, seen, 0)
+
+    def stats(self) -> dict:
+        return {
+            'sitemaps_read': self.sitemaps_read,
+            'sitemap_entries': self.urls_read,
+            'sitemap_stale': self.stale,
+            'sitemap_undated': self.undated,
+            'sitemap_errors': self.errors,
+        }
+
+    def close(self):
+        self.session.close()
+        if self._owns_robots:
+            self.robots.close()
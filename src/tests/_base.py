@@ -0,0 +1,107 @@
+import os
+from urllib.parse import urlparse
+
+from selenium import webdriver
+
+from src.crawler import CrawlEngine
+from src.driver_pool import DriverPool
+from src.report import ReportBuilder
+
+
+class CrawlTester:
+    # Registered page checks run on every crawled page
+    checks = ()
+    # File name of the Excel report, in the output folder
+    report_name = 'test_report.xlsx'
+    # Defaults of the constructor arguments, overridden per tester
+    max_workers = 10
+    max_depth = 3
+    max_links = 40
+    # CrawlEngine options of this tester, e.g. more retries; constructor options take precedence
+    engine_defaults = {}
+
+    def __init__(self, url='https://www.example.com', output_folder='test_results', headless=False, max_workers=None, max_depth=None, max_links=None, driver_pool=None, **engine_options):
+        """
+        Crawl a site from ``url`` and run this tester's ``checks`` on every page.
+
+        Subclasses only declare ``checks``, ``report_name`` and their defaults.
+
+        Args:
+            url (str): Start page of the crawl
+            output_folder (str): Folder the report is written to
+            headless (bool): Run the browsers headless
+            max_workers (int): Pages loaded concurrently
+            max_depth (int): Link depth followed from the start page
+            max_links (int): Pages tested at most
+            driver_pool (DriverPool): Shared browser pool, one is created (and closed) if None
+            **engine_options: Extra CrawlEngine options, e.g. ``fetch_mode='http'``
+        """
+        self.output_folder = output_folder
+        os.makedirs(self.output_folder, exist_ok=True)
+
+        # Setup Chrome options
+        self.options = webdriver.ChromeOptions()
+        if headless:
+            self.options.add_argument("--headless")
+            self.options.add_argument("--disable-gpu")
+            self.options.add_argument("--window-size=1920,1080")
+            self.options.add_argument("--disable-dev-shm-usage")
+            self.options.add_argument("--no-sandbox")
+            self.options.add_argument("--disable-blink-features=AutomationControlled")
+
+        self.options.add_argument("--start-maximized")
+
+        self.start_url = url
+        self.start_domain = urlparse(url).netloc
+        self.results = []
+        self.visited_urls = set()
+        self.crawl_stats = {}  # Engine counters of the last crawl (pages, latency, utilization)
+        self.page_depths = {}
+        if max_workers is not None:
+            self.max_workers = max_workers
+        if max_depth is not None:
+            self.max_depth = max_depth
+        if max_links is not None:
+            self.max_links = max_links
+
+        # Browsers are borrowed from a shared pool instead of launched per page
+        self.driver_pool = driver_pool or DriverPool(self.options, size=self.max_workers)
+        self._owns_pool = driver_pool is None
+
+        self.engine_options = {**self.engine_defaults, **engine_options}
+
+    def _crawl(self, checks) -> CrawlEngine:
+        """Run one crawl with ``checks`` and keep its results, pages and stats."""
+        engine = CrawlEngine(
+            self.start_url,
+            list(checks),
+            self.driver_pool,
+            max_workers=self.max_workers,
+            max_depth=self.max_depth,
+            max_links=self.max_links,
+            **self.engine_options
+        )
+        try:
+            self.results = engine.run()
+            # A plain set: the engine closes its visited set when the crawl ends
+            self.visited_urls = set(engine.page_depths)
+            self.crawl_stats = engine.stats
+            self.page_depths = engine.page_depths
+        finally:
+            if self._owns_pool:
+                self.driver_pool.close()
+        return engine
+
+    def run_recursive_tests(self):
+        """Crawl pages recursively using multithreading."""
+        self._crawl(self.checks)
+
+    def generate_report(self):
+        """Generate an Excel report of the results with pass/fail summaries."""
+        print("Generating test report...")
+        builder = ReportBuilder(os.path.join(self.output_folder, self.report_name), depths=self.page_depths)
+        builder.add(self.results)
+        try:
+            builder.write()
+        except Exception as e:
+            print(f"Error generating report: {e}")
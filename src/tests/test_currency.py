@@ -1,8 +1,13 @@
+import argparse
+import json
 import logging
 import os
+import threading
 import time
 import traceback
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -19,27 +24,147 @@ from selenium.common.exceptions import (
 import sys
 import pandas as pd
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'src')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 from webdriver_manager.chrome import ChromeDriverManager
 
+from src.driver_pool import DriverPool
+from src.readiness import ReadinessWaiter
+from src.report import ReportBuilder
+
+# CSS equivalent of //div[contains(@class, 'price')], used by the MutationObserver waits
+PRICE_SELECTOR = "div[class*='price']"
+OPTION_SELECTOR = "#js-currency-sort-footer .select-ul li"
+
+# Reads every currency option in one round trip: label, data-* attributes and position
+DISCOVER_CURRENCIES_SCRIPT = """
+return Array.prototype.map.call(document.querySelectorAll(arguments[0]), function (li, index) {
+    var label = li.querySelector('.option p');
+    return {index: index, text: (label ? label.textContent : li.textContent).trim(), data: Object.assign({}, li.dataset)};
+});
+"""
+
+# Text of the dropdown's current selection, e.g. "EUR"
+CURRENT_CURRENCY_SCRIPT = """
+var selected = document.querySelector(arguments[0]);
+return selected ? selected.textContent.trim() : null;
+"""
+CURRENT_SELECTOR = "#js-currency-sort-footer .selected"
+
+# Default results/progress file of run_batch, inside the output folder
+BATCH_CHECKPOINT = 'currency_batch_results.jsonl'
+
+# Ways to switch currency without clicking through the dropdown, tried in this order
+DIRECT_SETTERS = ('js', 'cookie', 'url')
+
+
+def _currency_code(option: dict) -> str:
+    """Best guess at the ISO code of a discovered currency option."""
+    data = option.get('data') or {}
+    for key in ('currency', 'currencyCode', 'code', 'value'):
+        if data.get(key):
+            return str(data[key]).upper()
+    text = option.get('text') or ''
+    return text.split()[0].upper() if text.split() else str(option.get('index'))
+
+
+def read_url_list(path: str) -> List[str]:
+    """Read property URLs from a text file, one per line; blank lines and # comments are skipped."""
+    with open(path, encoding='utf-8') as handle:
+        return [line.strip() for line in handle if line.strip() and not line.lstrip().startswith('#')]
+
+
+def load_checkpoint(path: str) -> Dict[str, dict]:
+    """
+    Read a batch checkpoint into ``{page_url: entry}``.
+
+    The last entry of a property wins, and a line cut short by an interrupted
+    write is ignored.
+    """
+    entries = {}
+    if not os.path.exists(path):
+        return entries
+    with open(path, encoding='utf-8') as handle:
+        for line in handle:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            entries[entry['page_url']] = entry
+    return entries
+
+
+def _truncate_partial_line(path: str, chunk_size: int = 64 * 1024):
+    """
+    Cut a line left unfinished by an interrupted write off the end of ``path``.
+
+    Appending after such a line would glue the next entry onto it, and the
+    merged line would be skipped as invalid on the next load.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb+') as handle:
+        end = handle.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(0, position - chunk_size)
+            handle.seek(start)
+            newline = handle.read(position - start).rfind(b'\n')
+            if newline != -1:
+                position = start + newline + 1
+                break
+            position = start
+        if position < end:
+            handle.truncate(position)
+            handle.flush()
+            os.fsync(handle.fileno())
+            print(f"[WARNING] Dropped an incomplete last entry ({end - position} bytes) from {path}")
+
+
+def _with_query_param(url: str, name: str, value: str) -> str:
+    parts = urlparse(url)
+    query = [(key, val) for key, val in parse_qsl(parts.query, keep_blank_values=True) if key != name]
+    query.append((name, value))
+    return urlunparse(parts._replace(query=urlencode(query)))
+
 
 class CurrencyFilterTester:
-    def __init__(self, url: str, output_folder: str = 'test_results', log_folder: str = 'logs', headless: bool = False, timeout: int = 10, retry_attempts: int = 3):
+    def __init__(self, url: str, output_folder: str = 'test_results', log_folder: str = 'logs', headless: bool = False, timeout: int = 10, retry_attempts: int = 3, change_timeout: float = 3,
+                 shards: int = 4, driver_pool: Optional[DriverPool] = None, currency_url_param: Optional[str] = None, currency_cookie: Optional[str] = None, currency_js_setter: Optional[str] = None):
         self.url = url
         self.output_folder = output_folder
         self.log_folder = log_folder
         self.headless = headless
         self.timeout = timeout
         self.retry_attempts = retry_attempts
+        self.change_timeout = change_timeout  # Max seconds to wait for the price to update after a switch
+
+        # Event-driven waits (MutationObserver/selector) instead of fixed sleeps
+        self.readiness = ReadinessWaiter('load', timeout=timeout)
         
         # Configure logging with file handler
         self._setup_logging()
         
         # Test results tracking
         self.test_results: List[dict] = []
-        
-        # Initialize driver
-        self.driver = self._setup_driver()
+        self.price_matrix: List[dict] = []  # One row per (property, currency)
+
+        # Direct currency switching hooks; any left as None is auto-detected or skipped
+        self.shards = shards
+        self.currency_url_param = currency_url_param  # e.g. 'currency' -> ?currency=EUR
+        self.currency_cookie = currency_cookie  # cookie holding the selected currency code
+        self.currency_js_setter = currency_js_setter  # JS called with the code as arguments[0]
+        self._cookie_lock = threading.Lock()  # run_batch detects the cookie from several threads
+
+        # The single-browser test launches its driver on first use; the matrix borrows from a pool
+        self._driver = None
+        self.driver_pool = driver_pool or DriverPool(self._build_options(), size=shards)
+        self._owns_pool = driver_pool is None
+
+    @property
+    def driver(self) -> webdriver.Chrome:
+        if self._driver is None:
+            self._driver = self._setup_driver()
+        return self._driver
 
     def _setup_logging(self):
         # Create log folder if it doesn't exist
@@ -56,17 +181,21 @@ class CurrencyFilterTester:
         )
         self.logger = logging.getLogger(__name__)
 
+    def _build_options(self) -> Options:
+        options = Options()
+        options.add_argument('--start-maximized')
+        options.add_argument('--disable-extensions')
+        options.add_argument('--disable-gpu')
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+
+        if self.headless:
+            options.add_argument('--headless')
+        return options
+
     def _setup_driver(self) -> webdriver.Chrome:
         try:
-            options = Options()
-            options.add_argument('--start-maximized')
-            options.add_argument('--disable-extensions')
-            options.add_argument('--disable-gpu')
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            
-            if self.headless:
-                options.add_argument('--headless')
+            options = self._build_options()
             
             # Use Service and ChromeDriverManager for automatic driver management
             service = Service(ChromeDriverManager().install())
@@ -82,10 +211,11 @@ class CurrencyFilterTester:
             self.logger.error(f"Driver setup failed: {e}")
             raise
 
-    def _safe_find_element(self, locator: tuple, timeout: Optional[int] = None) -> Optional[WebElement]:
+    def _safe_find_element(self, locator: tuple, timeout: Optional[int] = None, driver=None) -> Optional[WebElement]:
         timeout = timeout or self.timeout
+        driver = driver or self.driver
         try:
-            element = WebDriverWait(self.driver, timeout).until(
+            element = WebDriverWait(driver, timeout).until(
                 EC.presence_of_element_located(locator)
             )
             return element
@@ -93,17 +223,17 @@ class CurrencyFilterTester:
             self.logger.warning(f"Element not found: {locator}. Error: {e}")
             return None
 
-    def _safe_click(self, element: WebElement) -> bool:
+    def _safe_click(self, element: WebElement, driver=None) -> bool:
+        driver = driver or self.driver
         interaction_methods = [
             lambda: element.click(),
-            lambda: ActionChains(self.driver).move_to_element(element).click().perform(),
-            lambda: self.driver.execute_script("arguments[0].click();", element)
+            lambda: ActionChains(driver).move_to_element(element).click().perform(),
+            lambda: driver.execute_script("arguments[0].click();", element)
         ]
         
         for method in interaction_methods:
             try:
                 method()
-                time.sleep(0.5)  # Reduce delay for faster interactions
                 return True
             except Exception as e:
                 self.logger.warning(f"Click method failed: {e}")
@@ -115,6 +245,7 @@ class CurrencyFilterTester:
         try:
             # Navigate to URL
             self.driver.get(self.url)
+            self.readiness.wait_for_page(self.driver, label=self.url)
             
             # Temporarily set logging level to suppress logs during interaction
             self.logger.setLevel(logging.CRITICAL)
@@ -144,8 +275,9 @@ class CurrencyFilterTester:
                 self.test_results = results  # Save results to the class variable
                 return results
             
-            # Find currency options using a more dynamic selector
-            options = self.driver.find_elements(By.CSS_SELECTOR, "#js-currency-sort-footer .select-ul li")
+            # Wait for the options to be rendered, then find them
+            self.readiness.wait_for_condition(self.driver, selector=OPTION_SELECTOR, timeout=self.timeout, label="currency options")
+            options = self.driver.find_elements(By.CSS_SELECTOR, OPTION_SELECTOR)
             
             if not options:
                 result = {
@@ -172,6 +304,7 @@ class CurrencyFilterTester:
                 return results
             
             initial_price = initial_price_element.text.strip()
+            displayed_price = initial_price
             
             # Test currency options
             for option in options:
@@ -203,23 +336,26 @@ class CurrencyFilterTester:
                         results.append(result)
                         continue
                     
-                    # Trigger a JavaScript event to simulate the page update
                     self.driver.execute_script("window.scrollTo(0, 0);")  # Scroll to top if needed
-                    time.sleep(1)  # Give some time for page state to adjust
-                    
-                    # Check if the price element is updated
-                    updated_price_element = self._safe_find_element((By.XPATH, "//div[contains(@class, 'price')]"))
-                    if not updated_price_element:
-                        result = {
-                            "page_url": self.url,
-                            "testcase": f"Currency: {currency_details}",
-                            "status": "fail",
-                            "comments": "Price element not found after clicking currency",
-                        }
-                        results.append(result)
-                        continue
-                    
-                    updated_price = updated_price_element.text.strip()
+
+                    # Wait for the price text to change instead of sleeping a fixed time
+                    updated_price = self.readiness.wait_for_text_change(
+                        self.driver, PRICE_SELECTOR, displayed_price, timeout=self.change_timeout, label=currency_details
+                    )
+                    if updated_price is None:
+                        # Unchanged (e.g. re-selecting the current currency); read what is displayed
+                        updated_price_element = self._safe_find_element((By.XPATH, "//div[contains(@class, 'price')]"))
+                        if not updated_price_element:
+                            result = {
+                                "page_url": self.url,
+                                "testcase": f"Currency: {currency_details}",
+                                "status": "fail",
+                                "comments": "Price element not found after clicking currency",
+                            }
+                            results.append(result)
+                            continue
+                        updated_price = updated_price_element.text.strip()
+                    displayed_price = updated_price
                     if updated_price != initial_price:
                         result = {
                             "page_url": self.url,
@@ -262,55 +398,352 @@ class CurrencyFilterTester:
             self.generate_report()  # Generate the report
             raise e
 
-    def generate_report(self):
-        """Generate an Excel report of the results."""
-        print("Generating test report...")
+    def _read_price(self, driver) -> Optional[str]:
+        element = self._safe_find_element((By.XPATH, "//div[contains(@class, 'price')]"), driver=driver)
+        return element.text.strip() if element else None
+
+    def _load_property(self, driver, url: Optional[str] = None):
+        driver.get(url or self.url)
+        self.readiness.wait_for_page(driver, label=url or self.url)
+
+    def discover_currencies(self, driver, url: Optional[str] = None) -> List[dict]:
+        """Return every option of the currency dropdown (index, text, code, data-*) in one round trip."""
+        self._load_property(driver, url)
+        options = driver.execute_script(DISCOVER_CURRENCIES_SCRIPT, OPTION_SELECTOR) or []
+        for option in options:
+            option['code'] = _currency_code(option)
+        return options
+
+    def _set_currency_directly(self, driver, method: str, code: str, url: Optional[str] = None) -> bool:
+        """Switch currency through site state instead of the dropdown; returns False if not configured."""
+        url = url or self.url
+        if method == 'js' and self.currency_js_setter:
+            driver.execute_script(self.currency_js_setter, code)
+        elif method == 'cookie' and self.currency_cookie:
+            driver.add_cookie({'name': self.currency_cookie, 'value': code, 'path': '/'})
+            self._load_property(driver, url)
+        elif method == 'url' and self.currency_url_param:
+            self._load_property(driver, _with_query_param(url, self.currency_url_param, code))
+        else:
+            return False
+        return True
 
-        # Ensure output folder exists
-        os.makedirs(self.output_folder, exist_ok=True)
+    def _set_currency_via_ui(self, driver, index: int) -> bool:
+        dropdown = self._safe_find_element((By.CSS_SELECTOR, "#js-currency-sort-footer"), driver=driver)
+        if not dropdown or not self._safe_click(dropdown, driver=driver):
+            return False
+        self.readiness.wait_for_condition(driver, selector=OPTION_SELECTOR, timeout=self.timeout)
+        options = driver.find_elements(By.CSS_SELECTOR, OPTION_SELECTOR)
+        if index >= len(options):
+            return False
+        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", options[index])
+        return self._safe_click(options[index], driver=driver)
 
-        # Ensure test results are in the correct format for the DataFrame
-        formatted_results = []
-        for result in self.test_results:
-            formatted_results.append({
-                "URL": result["page_url"],
-                "Test": result["testcase"],
-                "Result": result["status"],
-                "Comments": result["comments"]
-            })
+    def _detect_cookie(self, driver, options: List[dict]):
+        """Find a cookie whose value is one of the discovered currency codes."""
+        if self.currency_cookie:
+            return
+        codes = {option['code'] for option in options}
+        for cookie in driver.get_cookies():
+            if str(cookie.get('value', '')).upper() in codes and 'curr' in cookie.get('name', '').lower():
+                with self._cookie_lock:
+                    if not self.currency_cookie:
+                        self.currency_cookie = cookie['name']
+                        self.logger.info(f"Detected currency cookie: {self.currency_cookie}")
+                return
 
-        # Create DataFrame with the formatted results
-        df = pd.DataFrame(formatted_results)
+    def _current_code(self, driver) -> Optional[str]:
+        """Code of the currency the page shows now, from the currency cookie or the dropdown label."""
+        if self.currency_cookie:
+            cookie = driver.get_cookie(self.currency_cookie)
+            if cookie and cookie.get('value'):
+                return str(cookie['value']).upper()
+        text = driver.execute_script(CURRENT_CURRENCY_SCRIPT, CURRENT_SELECTOR) or ''
+        return text.split()[0].upper() if text.split() else None
 
-        # Debugging: Print the DataFrame to check the contents before saving to Excel
-        print("\nDataFrame content:\n", df)
+    def _choose_method(self, driver, url: str, options: List[dict], base_price: Optional[str]) -> str:
+        """
+        Probe the direct setters on one currency and return the first that changes the price.
 
-        # Define the report file path
-        report_file = os.path.join(self.output_folder, "currency_filter_test_report.xlsx")
+        The probe is a currency other than the one shown, since switching to
+        the current one would not change the price. Falls back to ``'ui'``
+        (clicking the dropdown) when no direct method works.
+        """
+        current = self._current_code(driver)
+        candidates = [option for option in options if option['code'] != current]
+        if len(options) < 2 or not candidates:
+            return 'ui'
+        # Without a known selection, skip the first option, usually the default
+        probe = candidates[0] if current else options[1]
+        for method in DIRECT_SETTERS:
+            try:
+                if not self._set_currency_directly(driver, method, probe['code'], url):
+                    continue
+                price = self.readiness.wait_for_text_change(driver, PRICE_SELECTOR, base_price, timeout=self.change_timeout)
+                if price is not None:
+                    return method
+            except Exception as e:
+                self.logger.warning(f"Currency setter '{method}' failed: {e}")
+            self._load_property(driver, url)
+        return 'ui'
+
+    def _run_shard(self, url: str, shard: List[dict], method: str, driver=None) -> List[dict]:
+        """
+        Switch through ``shard`` currencies in one browser and read the price for each.
+
+        Args:
+            url (str): Property page
+            shard (list): Discovered currency options to switch through
+            method (str): Direct setter from :meth:`_choose_method`, or ``'ui'``
+            driver: Browser already showing ``url``, kept by the caller; a
+                pooled browser is borrowed and loaded if None
+        """
+        rows = []
+        borrowed = driver is None
+        if borrowed:
+            driver = self.driver_pool.checkout()
+        try:
+            if borrowed:
+                self._load_property(driver, url)
+            displayed_price = self._read_price(driver)
+            current = self._current_code(driver)
+            for option in shard:
+                row = {'page_url': url, 'currency': option['text'], 'code': option['code'], 'method': method, 'price': None}
+                try:
+                    if option['code'] == current:
+                        # Already shown, so the price would never change; read it as is
+                        price = self._read_price(driver)
+                        if price is None:
+                            row.update(status='fail', comments='Price element not found')
+                        else:
+                            row.update(price=price, status='pass', comments=f"Currency {option['text']} price: {price}")
+                        rows.append(row)
+                        continue
+                    if method == 'ui':
+                        switched = self._set_currency_via_ui(driver, option['index'])
+                    else:
+                        switched = self._set_currency_directly(driver, method, option['code'], url)
+                    if not switched:
+                        row.update(status='fail', comments='Currency could not be selected')
+                        rows.append(row)
+                        continue
+                    current = option['code']
+
+                    price = self.readiness.wait_for_text_change(
+                        driver, PRICE_SELECTOR, displayed_price, timeout=self.change_timeout, label=f"{url} {option['code']}"
+                    )
+                    if price is None:
+                        price = self._read_price(driver)
+                    if price is None:
+                        row.update(status='fail', comments='Price element not found after switching currency')
+                    else:
+                        displayed_price = price
+                        row.update(price=price, status='pass', comments=f"Currency {option['text']} price: {price}")
+                except Exception as e:
+                    current = None  # the page may be left half switched
+                    row.update(status='fail', comments=f"Error occurred: {e}")
+                rows.append(row)
+        finally:
+            if borrowed:
+                self.driver_pool.checkin(driver)
+        return rows
+
+    def _matrix_rows(self, url: str, shards: Optional[int] = None) -> List[dict]:
+        """
+        Discover the currencies of ``url`` and read the price for each, without storing the rows.
+
+        The browser that discovered the currencies keeps the loaded page and
+        runs the first shard, so the property is not loaded a second time.
+        """
+        driver = self.driver_pool.checkout()
+        try:
+            options = self.discover_currencies(driver, url)
+            if not options:
+                return [{'page_url': url, 'currency': None, 'code': None, 'method': None, 'price': None,
+                         'status': 'fail', 'comments': 'Currency options not found'}]
+            self._detect_cookie(driver, options)
+            method = self._choose_method(driver, url, options, self._read_price(driver))
+
+            # The discovery browser stays checked out, so the other shards can use only size - 1 browsers
+            shard_count = max(1, min(shards or self.shards, len(options), self.driver_pool.size))
+            if shard_count == 1:
+                return self._run_shard(url, options, method, driver)
+
+            print(f"Testing {len(options)} currencies on {url} across {shard_count} browsers (method: {method})")
+            shard_options = [options[i::shard_count] for i in range(shard_count)]
+            with ThreadPoolExecutor(max_workers=shard_count - 1) as executor:
+                futures = [executor.submit(self._run_shard, url, shard, method) for shard in shard_options[1:]]
+                rows = self._run_shard(url, shard_options[0], method, driver)
+                for future in futures:
+                    rows.extend(future.result())
+        finally:
+            self.driver_pool.checkin(driver)
+        rows.sort(key=lambda row: row['currency'] or '')
+        return rows
+
+    def _store_rows(self, rows: List[dict]):
+        self.price_matrix.extend(rows)
+        self.test_results.extend(
+            {
+                "page_url": row['page_url'],
+                "testcase": f"Currency: {row['currency']} ({row['code']})" if row['currency'] else "Currency Filter",
+                "status": row['status'],
+                "comments": row['comments'],
+            }
+            for row in rows
+        )
+
+    def run_currency_matrix(self, url: Optional[str] = None) -> List[dict]:
+        """
+        Build the price-per-currency matrix of a property using several browsers.
+
+        The currency list is discovered once, split into ``shards`` slices and each
+        slice is switched through in its own pooled browser. A direct setter
+        (JS hook, cookie or URL parameter) is used when one is configured or
+        detected and verified on one currency; otherwise options are clicked.
+
+        Returns:
+            list: One row per currency with page_url, currency, code, method, price, status, comments
+        """
+        rows = self._matrix_rows(url or self.url)
+        self._store_rows(rows)
+        return rows
+
+    def run_batch(self, urls: Iterable[str], checkpoint_file: Optional[str] = None, resume: bool = True, max_browsers: Optional[int] = None) -> dict:
+        """
+        Validate currency switching on many properties, one browser per property.
+
+        Up to ``max_browsers`` properties run at once. Each finished property is
+        appended as one JSON line to ``checkpoint_file`` and flushed to disk, so
+        results stream out as they arrive and an interrupted run resumes with the
+        properties that are not in the file yet. Properties that failed with an
+        unexpected error are retried on resume.
 
-        # Save the report to Excel
+        Rows are not kept in memory; call :meth:`load_batch_results` before
+        :meth:`generate_report` to build the report from the checkpoint.
+
+        Args:
+            urls (iterable): Property URLs, e.g. from :func:`read_url_list`
+            checkpoint_file (str): JSONL results/progress file, defaults to the output folder
+            resume (bool): Skip properties already in the checkpoint; False starts over
+            max_browsers (int): Concurrent properties, defaults to the pool size
+
+        Returns:
+            dict: Counts of total, resumed, completed and errored properties and elapsed seconds
+        """
+        checkpoint_file = checkpoint_file or os.path.join(self.output_folder, BATCH_CHECKPOINT)
+        os.makedirs(os.path.dirname(checkpoint_file) or '.', exist_ok=True)
+        self.checkpoint_file = checkpoint_file
+
+        urls = list(dict.fromkeys(url.strip() for url in urls if url and url.strip()))
+        if resume:
+            _truncate_partial_line(checkpoint_file)
+        done = {url for url, entry in load_checkpoint(checkpoint_file).items() if not entry.get('error')} if resume else set()
+        pending = [url for url in urls if url not in done]
+        summary = {'total': len(urls), 'resumed': len(urls) - len(pending), 'completed': 0, 'errors': 0}
+        print(f"Batch: {len(pending)} properties to test, {summary['resumed']} already done")
+
+        started = time.perf_counter()
+        workers = max(1, min(max_browsers or self.driver_pool.size, len(pending) or 1))
+        with open(checkpoint_file, 'a' if resume else 'w', encoding='utf-8') as checkpoint:
+            executor = ThreadPoolExecutor(max_workers=workers)
+            try:
+                futures = {executor.submit(self._matrix_rows, url, 1): url for url in pending}
+                for future in as_completed(futures):
+                    url = futures[future]
+                    try:
+                        entry = {'page_url': url, 'rows': future.result()}
+                    except Exception as e:
+                        self.logger.error(f"Currency batch failed for {url}: {e}")
+                        entry = {'page_url': url, 'error': str(e), 'rows': []}
+                        summary['errors'] += 1
+                    checkpoint.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                    checkpoint.flush()
+                    os.fsync(checkpoint.fileno())
+                    summary['completed'] += 1
+                    if summary['completed'] % 50 == 0:
+                        print(f"Batch progress: {summary['completed']}/{len(pending)}")
+            except KeyboardInterrupt:
+                print(f"[WARNING] Batch interrupted; rerun with resume=True to continue from {checkpoint_file}")
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise
+            finally:
+                executor.shutdown(wait=True)
+
+        summary['elapsed_s'] = time.perf_counter() - started
+        print(f"Batch finished: {summary}")
+        return summary
+
+    def load_batch_results(self, checkpoint_file: Optional[str] = None):
+        """Load the rows written by :meth:`run_batch` into the report tables."""
+        checkpoint_file = checkpoint_file or getattr(self, 'checkpoint_file', None) or os.path.join(self.output_folder, BATCH_CHECKPOINT)
+        for url, entry in load_checkpoint(checkpoint_file).items():
+            if entry.get('error'):
+                self._store_rows([{'page_url': url, 'currency': None, 'code': None, 'method': None, 'price': None,
+                                   'status': 'fail', 'comments': f"Error occurred: {entry['error']}"}])
+            else:
+                self._store_rows(entry['rows'])
+
+    def price_matrix_dataframe(self) -> pd.DataFrame:
+        """Pivot the collected prices into one row per property and one column per currency."""
+        df = pd.DataFrame(self.price_matrix)
+        if df.empty:
+            return df
+        return df.pivot_table(index='page_url', columns='code', values='price', aggfunc='first')
+
+    def close(self):
+        if self._driver is not None:
+            self._driver.quit()
+            self._driver = None
+        if self._owns_pool:
+            self.driver_pool.close()
+
+    def generate_report(self):
+        """Generate an Excel report of the results, with the price matrix on its own sheet when available."""
+        print("Generating test report...")
+        builder = ReportBuilder(os.path.join(self.output_folder, "currency_filter_test_report.xlsx"))
+        builder.add(self.test_results)
+        if self.price_matrix:
+            builder.add_sheet('Price Matrix', self.price_matrix_dataframe(), index=True)
         try:
-            df.to_excel(report_file, index=False)
-            print(f"Report saved to {report_file}")
+            builder.write()
         except Exception as e:
             print(f"Failed to save report: {e}")
 
-    def main(self):
+    def main(self, matrix: bool = True):
         test_url = self.url
         
         try:
-            results = self.run_currency_test()
+            results = self.run_currency_matrix() if matrix else self.run_currency_test()
             
             print("\n--- Test Results ---")
             for result in results:
                 print(result)
+            print(f"Readiness waits: {self.readiness.summary()}")
         
         except Exception as e:
             print(f"Unexpected error: {e}")
             logging.exception(e)
+        finally:
+            self.close()
 
 if __name__ == "__main__":
     test_url = 'https://www.alojamiento.io/property/apartamentos-centro-col%c3%b3n/BC-189483/'
-    tester = CurrencyFilterTester(url=test_url)
-    tester.main()
+    parser = argparse.ArgumentParser(description="Currency filter test")
+    parser.add_argument('--urls', help="File with one property URL per line (batch mode)")
+    parser.add_argument('--browsers', type=int, default=4, help="Concurrent browsers")
+    parser.add_argument('--checkpoint', help="Batch results/progress file (JSONL)")
+    parser.add_argument('--restart', action='store_true', help="Ignore an existing checkpoint and start over")
+    parser.add_argument('--headless', action='store_true')
+    args = parser.parse_args()
+
+    tester = CurrencyFilterTester(url=test_url, headless=args.headless, shards=args.browsers)
+    if args.urls:
+        try:
+            tester.run_batch(read_url_list(args.urls), checkpoint_file=args.checkpoint, resume=not args.restart)
+        finally:
+            tester.close()
+        tester.load_batch_results()
+    else:
+        tester.main()
     tester.generate_report()
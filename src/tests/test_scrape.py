@@ -8,15 +8,20 @@ from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 
 class AlojamientoScraper:
-    def __init__(self, url):
+    def __init__(self, url, headless=False):
         """
         Initialize the web scraper with Chrome WebDriver
+
+        Args:
+            url (str): Property page to scrape
+            headless (bool): Run Chrome without a window, e.g. on a benchmark or CI machine
         """
         # Set up Chrome options
         chrome_options = Options()
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
-        # chrome_options.add_argument("--headless")  # Uncomment this line to run in headless mode
+        if headless:
+            chrome_options.add_argument("--headless")
 
         # Set up the WebDriver
         self.driver = webdriver.Chrome(
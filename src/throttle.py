@@ -0,0 +1,371 @@
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from protego import Protego
+
+from .fetcher import DEFAULT_USER_AGENT
+
+# Responses telling us the host is overloaded
+OVERLOAD_STATUSES = {429, 500, 502, 503, 504}
+
+# How long a caller waits before re-checking a host whose concurrency window is full
+SLOT_POLL_INTERVAL = 0.05
+
+
+def _host(url: str) -> str:
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+class TokenBucket:
+    def __init__(self, rate: Optional[float], burst: float = 1):
+        """
+        Classic token bucket: ``rate`` tokens per second, at most ``burst`` saved up.
+
+        Args:
+            rate (float): Requests per second, None for no limit
+            burst (float): Requests that may be sent back to back after an idle period
+        """
+        self.rate = rate
+        self.capacity = max(1.0, burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def take(self, now: float) -> float:
+        """Take one token; returns 0 on success, else the seconds until one is available."""
+        if not self.rate:
+            return 0.0
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class HostLimiter:
+    def __init__(self, host: str, rate: Optional[float], burst: float, initial_concurrency: float, min_concurrency: int, max_concurrency: int, latency_factor: float = 3.0, decrease_factor: float = 0.5):
+        """
+        Rate limit and adaptive concurrency window of one host.
+
+        Requests first wait for a token (fixed rate, or the robots.txt
+        crawl-delay), then for a slot in the concurrency window. The window is
+        adjusted AIMD-style from every response: it grows by one request per
+        window of successful responses and is cut by ``decrease_factor`` on a
+        429/5xx, a timeout or an HTTP latency above ``latency_factor`` times
+        the fastest seen, at most once per round trip. Browser navigations
+        (no status code) do not feed the latency signal: their time includes
+        rendering and readiness waits, which vary from page to page.
+
+        Args:
+            host (str): ``scheme://netloc``
+            rate (float): Requests per second, None for no limit
+            burst (float): Token bucket size
+            initial_concurrency (float): Starting window
+            min_concurrency (int): The window never shrinks below this
+            max_concurrency (int): The window never grows above this
+            latency_factor (float): Latency inflation over the baseline treated as overload
+            decrease_factor (float): Multiplier applied to the window on overload
+        """
+        self.host = host
+        self.bucket = TokenBucket(rate, burst)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.limit = float(min(max(initial_concurrency, min_concurrency), max_concurrency))
+        self.latency_factor = latency_factor
+        self.decrease_factor = decrease_factor
+
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.base_latency = None
+        self.avg_latency = None
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+        # Counters for reporting
+        self.requests = 0
+        self.overloaded = 0
+        self.errors = 0
+        self.decreases = 0
+        self.wait_time = 0.0
+
+    def _try_acquire(self) -> float:
+        """Take a slot if possible; returns 0 on success, else the seconds to wait."""
+        now = time.monotonic()
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.in_flight >= int(self.limit):
+            return SLOT_POLL_INTERVAL
+        wait = self.bucket.take(now)
+        if wait:
+            return wait
+        self.in_flight += 1
+        self.requests += 1
+        return 0.0
+
+    def acquire(self):
+        started = time.monotonic()
+        with self._cond:
+            while True:
+                wait = self._try_acquire()
+                if not wait:
+                    break
+                self._cond.wait(wait)
+            self.wait_time += time.monotonic() - started
+
+    async def acquire_async(self):
+        started = time.monotonic()
+        while True:
+            with self._cond:
+                wait = self._try_acquire()
+                if not wait:
+                    self.wait_time += time.monotonic() - started
+                    return
+            await asyncio.sleep(wait)
+
+    def release(self, latency: float, status_code: Optional[int] = None, error: bool = False, retry_after: Optional[float] = None):
+        """
+        Give the slot back and adapt the window to how the request went.
+
+        Args:
+            latency (float): Seconds the request took
+            status_code (int): HTTP status, None if unknown (browser navigations)
+            error (bool): The request failed or timed out
+            retry_after (float): Seconds the server asked us to wait (``Retry-After``)
+        """
+        now = time.monotonic()
+        with self._cond:
+            self.in_flight -= 1
+            overloaded = error or status_code in OVERLOAD_STATUSES
+            if error:
+                self.errors += 1
+            elif status_code in OVERLOAD_STATUSES:
+                self.overloaded += 1
+            elif status_code is not None:
+                self.avg_latency = latency if self.avg_latency is None else 0.8 * self.avg_latency + 0.2 * latency
+                self.base_latency = latency if self.base_latency is None else min(self.base_latency, latency)
+                overloaded = self.avg_latency > self.latency_factor * max(self.base_latency, 0.05)
+
+            if retry_after:
+                self.paused_until = max(self.paused_until, now + retry_after)
+            if overloaded:
+                # One cut per round trip, so a burst of failures from the same window counts once
+                if now - self._last_decrease >= (self.avg_latency or latency):
+                    self.limit = max(float(self.min_concurrency), self.limit * self.decrease_factor)
+                    self._last_decrease = now
+                    self.decreases += 1
+            else:
+                self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                'host': self.host,
+                'concurrency': round(self.limit, 2),
+                'requests': self.requests,
+                'overloaded_responses': self.overloaded,
+                'errors': self.errors,
+                'backoffs': self.decreases,
+                'avg_latency_s': round(self.avg_latency or 0.0, 3),
+                'wait_s': round(self.wait_time, 2),
+                'rate_per_s': self.bucket.rate,
+            }
+
+
+class RobotsCache:
+    def __init__(self, user_agent: str = DEFAULT_USER_AGENT, timeout: float = 10, ttl: float = 3600):
+        """
+        robots.txt of every host, fetched once, parsed with Protego and kept for ``ttl`` seconds.
+
+        A missing robots.txt (4xx) allows everything. So does one that cannot
+        be fetched (5xx, network error), with a warning, so an unreachable
+        robots.txt does not stop a test run.
+
+        Args:
+            user_agent (str): User-Agent the rules are matched against
+            timeout (float): Timeout for fetching robots.txt
+            ttl (float): Seconds a parsed robots.txt is reused
+        """
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.ttl = ttl
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = user_agent
+        self._entries: Dict[str, tuple] = {}  # host -> (fetched_at, Protego or None)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[Protego]:
+        host = _host(url)
+        entry = self._entries.get(host)
+        if entry and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+        with self._lock:
+            host_lock = self._locks.setdefault(host, threading.Lock())
+        # Per-host lock: concurrent workers wait for one download instead of each fetching robots.txt
+        with host_lock:
+            entry = self._entries.get(host)
+            if entry and time.monotonic() - entry[0] < self.ttl:
+                return entry[1]
+            rules = self._fetch(host)
+            self._entries[host] = (time.monotonic(), rules)
+            return rules
+
+    def _fetch(self, host: str) -> Optional[Protego]:
+        try:
+            response = self.session.get(f"{host}/robots.txt", timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            print(f"[WARNING] Could not fetch {host}/robots.txt, allowing everything: {e}")
+            return None
+        if response.status_code >= 500:
+            print(f"[WARNING] {host}/robots.txt returned {response.status_code}, allowing everything")
+            return None
+        if response.status_code != 200:
+            return None
+        return Protego.parse(response.text)
+
+    def allowed(self, url: str) -> bool:
+        rules = self.get(url)
+        return rules is None or rules.can_fetch(url, self.user_agent)
+
+    def rate(self, url: str) -> Optional[float]:
+        """Requests per second allowed by ``Crawl-delay``/``Request-rate``, None if unrestricted."""
+        rules = self.get(url)
+        if rules is None:
+            return None
+        rates = []
+        delay = rules.crawl_delay(self.user_agent)
+        if delay:
+            rates.append(1 / float(delay))
+        request_rate = rules.request_rate(self.user_agent)
+        if request_rate and request_rate.seconds:
+            rates.append(request_rate.requests / request_rate.seconds)
+        return min(rates) if rates else None
+
+    def sitemaps(self, url: str) -> list:
+        """Sitemap URLs listed in the robots.txt of ``url``'s host."""
+        rules = self.get(url)
+        return list(rules.sitemaps) if rules is not None else []
+
+    def close(self):
+        self.session.close()
+
+
+class RequestOutcome:
+    __slots__ = ('status_code', 'retry_after', 'error')
+
+    def __init__(self):
+        self.status_code = None
+        self.retry_after = None
+        self.error = False
+
+
+class HostThrottle:
+    def __init__(self, rate: Optional[float] = None, burst: Optional[float] = None, initial_concurrency: Optional[float] = None, min_concurrency: int = 1, max_concurrency: int = 8, respect_robots: bool = True, user_agent: str = DEFAULT_USER_AGENT, latency_factor: float = 3.0):
+        """
+        Per-host politeness shared by the crawl engine, the HTTP fetcher and the link checker.
+
+        Every request to a host goes through that host's :class:`HostLimiter`
+        (token bucket plus adaptive concurrency window), so the crawl slows
+        down as soon as a site starts answering slowly or with 429/5xx, and
+        speeds up again once it copes. robots.txt is read through a
+        :class:`RobotsCache`: its ``Crawl-delay``/``Request-rate`` lowers the
+        host's rate, and the crawler skips disallowed pages.
+
+        Args:
+            rate (float): Requests per second per host, None (the default) for no fixed limit;
+                robots.txt crawl-delay and the adaptive window still apply
+            burst (float): Token bucket size, defaults to ``max_concurrency``
+            initial_concurrency (float): Starting concurrency window per host, ``max_concurrency``
+                if None; the window only shrinks once the host shows signs of overload
+            min_concurrency (int): Smallest window per host
+            max_concurrency (int): Largest window per host, usually ``max_workers``
+            respect_robots (bool): Skip pages disallowed by robots.txt and honour its crawl-delay
+            user_agent (str): User-Agent robots.txt rules are matched against
+            latency_factor (float): Latency inflation over the baseline treated as overload
+        """
+        self.rate = rate
+        self.burst = burst or max_concurrency
+        self.initial_concurrency = max_concurrency if initial_concurrency is None else initial_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.latency_factor = latency_factor
+        self.robots = RobotsCache(user_agent) if respect_robots else None
+
+        self.robots_blocked = 0
+        self._limiters: Dict[str, HostLimiter] = {}
+        self._lock = threading.Lock()
+
+    def limiter(self, url: str) -> HostLimiter:
+        host = _host(url)
+        limiter = self._limiters.get(host)
+        if limiter is not None:
+            return limiter
+        # robots.txt is read outside the lock so one slow host does not block the others
+        robots_rate = self.robots.rate(url) if self.robots else None
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                rate, burst = self.rate, self.burst
+                if robots_rate is not None:
+                    rate, burst = min(rate or robots_rate, robots_rate), 1
+                limiter = self._limiters[host] = HostLimiter(
+                    host, rate, burst, self.initial_concurrency, self.min_concurrency, self.max_concurrency, self.latency_factor
+                )
+            return limiter
+
+    def allowed(self, url: str) -> bool:
+        """False if robots.txt disallows crawling ``url``."""
+        if self.robots is None or self.robots.allowed(url):
+            return True
+        with self._lock:
+            self.robots_blocked += 1
+        return False
+
+    @contextmanager
+    def request(self, url: str):
+        """
+        Hold a slot of ``url``'s host for the duration of one request.
+
+        Set ``status_code`` (and ``retry_after``) on the yielded outcome so the
+        window can adapt; an exception counts as a failed request::
+
+            with throttle.request(url) as outcome:
+                response = session.get(url)
+                outcome.status_code = response.status_code
+        """
+        limiter = self.limiter(url)
+        limiter.acquire()
+        outcome = RequestOutcome()
+        started = time.perf_counter()
+        try:
+            yield outcome
+        except BaseException:
+            outcome.error = True
+            raise
+        finally:
+            limiter.release(time.perf_counter() - started, outcome.status_code, outcome.error, outcome.retry_after)
+
+    def host_stats(self) -> list:
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return [limiter.stats() for limiter in limiters]
+
+    def summary(self) -> dict:
+        hosts = self.host_stats()
+        return {
+            'robots_blocked': self.robots_blocked,
+            'overloaded_responses': sum(host['overloaded_responses'] for host in hosts),
+            'backoffs': sum(host['backoffs'] for host in hosts),
+            'throttle_wait_s': round(sum(host['wait_s'] for host in hosts), 2),
+        }
+
+    def close(self):
+        if self.robots:
+            self.robots.close()
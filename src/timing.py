@@ -0,0 +1,262 @@
+import heapq
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+
+# Upper bounds (seconds) of the histogram buckets, from a fast check to a browser launch
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+METRIC_PREFIX = 'vrt'
+
+
+class Histogram:
+    """Fixed-bucket latency histogram; memory does not grow with the number of observations."""
+
+    __slots__ = ('buckets', 'counts', 'count', 'sum', 'max')
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # the last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate the ``q`` quantile by interpolating inside its bucket, like
+        Prometheus' ``histogram_quantile``; capped at the largest observation.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                return min(self.max, lower + (upper - lower) * (rank - seen) / count)
+            seen += count
+        return self.max
+
+    def cumulative(self) -> List[int]:
+        total, cumulative = 0, []
+        for count in self.counts:
+            total += count
+            cumulative.append(total)
+        return cumulative
+
+
+class _Phase:
+    __slots__ = ('timer', 'name', 'started')
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.timer.record(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class PhaseTimer:
+    enabled = True
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, slowest: int = 20):
+        """
+        Per-page timings of every crawl phase, kept as latency histograms.
+
+        The crawl engines time each phase of a page (queue wait, browser
+        checkout and launch, navigation, readiness wait, HTTP fetch, every
+        check, link extraction) with :meth:`phase` or :meth:`record`, and count
+        events such as retries with :meth:`count`. Phases are also added up per
+        page on the worker thread, so the slowest pages can be listed with
+        where their time went.
+
+        Export with :meth:`export` (Prometheus text format or JSON), or add
+        :meth:`phase_frame` and :meth:`slowest_frame` to a report. Pass
+        nothing (or :data:`NULL_TIMER`) to the engines to leave timing off.
+
+        Args:
+            buckets (sequence): Upper bounds of the histogram buckets in seconds
+            slowest (int): Number of slowest pages whose phase breakdown is kept
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.slowest = slowest
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, int] = {}
+        self._slowest_pages = []  # min-heap of (seconds, sequence, url, phases)
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def phase(self, name: str) -> _Phase:
+        """Context manager timing one phase of the current page."""
+        return _Phase(self, name)
+
+    def record(self, name: str, seconds: float):
+        """Record ``seconds`` spent in phase ``name``."""
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram(self.buckets)
+            histogram.observe(seconds)
+        page = getattr(self._local, 'page', None)
+        if page is not None:
+            page[name] = page.get(name, 0.0) + seconds
+
+    def count(self, name: str, amount: int = 1):
+        """Count an event, e.g. a navigation retry."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def start_page(self):
+        """Start adding up the phases recorded on this thread for one page."""
+        self._local.page = {}
+
+    def end_page(self, url: str, seconds: float):
+        """Record the page's total time and keep its breakdown if it is among the slowest."""
+        phases, self._local.page = getattr(self._local, 'page', None) or {}, None
+        self.record('page', seconds)
+        with self._lock:
+            self._sequence += 1
+            entry = (seconds, self._sequence, url, phases)
+            if len(self._slowest_pages) < self.slowest:
+                heapq.heappush(self._slowest_pages, entry)
+            elif seconds > self._slowest_pages[0][0]:
+                heapq.heapreplace(self._slowest_pages, entry)
+
+    def summary(self) -> dict:
+        """Counters for the engine stats; the phase histograms go to their own sheet or export."""
+        with self._lock:
+            page = self.histograms.get('page')
+            return {'timed_pages': page.count if page else 0, **{f'timed_{name}': value for name, value in self.counters.items()}}
+
+    def phase_frame(self) -> pd.DataFrame:
+        """One row per phase: count, total, mean, p50/p95/p99 (estimated from the buckets) and max."""
+        with self._lock:
+            pages = self.histograms['page'].count if 'page' in self.histograms else 0
+            rows = [
+                {
+                    'Phase': name,
+                    'Count': histogram.count,
+                    'Total (s)': histogram.sum,
+                    'Per Page (s)': histogram.sum / pages if pages else None,
+                    'Mean (s)': histogram.sum / histogram.count,
+                    'p50 (s)': histogram.quantile(0.5),
+                    'p95 (s)': histogram.quantile(0.95),
+                    'p99 (s)': histogram.quantile(0.99),
+                    'Max (s)': histogram.max,
+                }
+                for name, histogram in self.histograms.items()
+            ]
+        return pd.DataFrame(rows).sort_values('Total (s)', ascending=False, ignore_index=True) if rows else pd.DataFrame()
+
+    def slowest_frame(self) -> pd.DataFrame:
+        """The slowest pages, slowest first, with the seconds spent in each phase."""
+        with self._lock:
+            pages = sorted(self._slowest_pages, reverse=True)
+        return pd.DataFrame([{'page_url': url, 'page (s)': seconds, **{f'{name} (s)': value for name, value in phases.items()}} for seconds, _, url, phases in pages])
+
+    def to_json(self) -> dict:
+        with self._lock:
+            return {
+                'buckets': list(self.buckets),
+                'phases': {
+                    name: {'count': histogram.count, 'sum': histogram.sum, 'max': histogram.max, 'counts': histogram.counts}
+                    for name, histogram in self.histograms.items()
+                },
+                'counters': dict(self.counters),
+                'slowest_pages': [
+                    {'url': url, 'seconds': seconds, 'phases': phases} for seconds, _, url, phases in sorted(self._slowest_pages, reverse=True)
+                ],
+            }
+
+    def to_prometheus(self) -> str:
+        """Histograms and counters in the Prometheus text exposition format."""
+        lines = [
+            f'# HELP {METRIC_PREFIX}_phase_seconds Time spent in each phase of a crawled page.',
+            f'# TYPE {METRIC_PREFIX}_phase_seconds histogram',
+        ]
+        with self._lock:
+            for name, histogram in self.histograms.items():
+                label = name.replace('\\', '\\\\').replace('"', '\\"')
+                bounds = [repr(float(bound)) for bound in histogram.buckets] + ['+Inf']
+                for bound, count in zip(bounds, histogram.cumulative()):
+                    lines.append(f'{METRIC_PREFIX}_phase_seconds_bucket{{phase="{label}",le="{bound}"}} {count}')
+                lines.append(f'{METRIC_PREFIX}_phase_seconds_sum{{phase="{label}"}} {histogram.sum!r}')
+                lines.append(f'{METRIC_PREFIX}_phase_seconds_count{{phase="{label}"}} {histogram.count}')
+            if self.counters:
+                lines.append(f'# HELP {METRIC_PREFIX}_crawl_events_total Events counted during the crawl, e.g. retries.')
+                lines.append(f'# TYPE {METRIC_PREFIX}_crawl_events_total counter')
+                lines.extend(f'{METRIC_PREFIX}_crawl_events_total{{event="{name}"}} {value}' for name, value in self.counters.items())
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path: str) -> str:
+        """
+        Write the timings to ``path``: JSON for ``.json``, otherwise Prometheus text
+        format (e.g. ``.prom`` for the node exporter's textfile collector).
+
+        The file is replaced atomically, so a scraper never reads a partial file.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temporary = f"{path}.tmp"
+        with open(temporary, 'w') as handle:
+            if path.endswith('.json'):
+                json.dump(self.to_json(), handle, indent=2)
+            else:
+                handle.write(self.to_prometheus())
+        os.replace(temporary, path)
+        print(f"Phase timings written to {path}")
+        return path
+
+
+class NullTimer:
+    """Timer used when timing is off: every call is a no-op and nothing is allocated per phase."""
+
+    enabled = False
+    _phase = nullcontext()
+
+    def phase(self, name: str):
+        return self._phase
+
+    def record(self, name: str, seconds: float):
+        pass
+
+    def count(self, name: str, amount: int = 1):
+        pass
+
+    def start_page(self):
+        pass
+
+    def end_page(self, url: str, seconds: float):
+        pass
+
+    def summary(self) -> dict:
+        return {}
+
+
+NULL_TIMER = NullTimer()
+
+
+def make_timer(timing):
+    """``timing`` as a timer: a :class:`PhaseTimer` as is, a new one for True, :data:`NULL_TIMER` for None/False."""
+    if isinstance(timing, (PhaseTimer, NullTimer)):
+        return timing
+    return PhaseTimer() if timing else NULL_TIMER
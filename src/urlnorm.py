@@ -0,0 +1,136 @@
+from fnmatch import fnmatchcase
+from typing import Iterable, Optional
+from urllib.parse import parse_qsl, quote, unquote, urljoin, urlsplit
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# Query parameters that select different content and are kept by default
+DEFAULT_KEEP_PARAMS = ('page',)
+
+# Tracking and session parameters, dropped when every other parameter is kept
+DEFAULT_DROP_PARAMS = (
+    'utm_*', 'gclid', 'gclsrc', 'dclid', 'fbclid', 'msclkid', 'yclid', 'mc_cid', 'mc_eid',
+    '_ga', '_gl', 'igshid', 'ref', 'ref_src', 'sessionid', 'sid', 'phpsessid', 'jsessionid',
+)
+
+# RFC 3986 characters allowed unescaped in a path segment and in a query name or value
+PATH_SAFE = "!$&'()*+,;=:@-._~"
+QUERY_SAFE = "!$'()*,;:@/?-._~"
+
+
+def _requote(text: str, safe: str) -> str:
+    """Decode escapes and re-encode, so equivalent spellings (``%c3%b3``, ``%C3%B3``, ``ó``) become one."""
+    return quote(unquote(text), safe=safe)
+
+
+def _remove_dot_segments(segments):
+    output = []
+    for segment in segments:
+        if segment == '..':
+            if output:
+                output.pop()
+        elif segment != '.':
+            output.append(segment)
+    return output
+
+
+class UrlNormalizer:
+    def __init__(self, keep_params: Optional[Iterable[str]] = DEFAULT_KEEP_PARAMS, drop_params: Iterable[str] = DEFAULT_DROP_PARAMS, canonical_hosts: Iterable[str] = (), strip_trailing_slash: bool = True, sort_query: bool = True):
+        """
+        Reduce the spellings of a URL to one canonical form, used as its dedup key and for navigation.
+
+        - scheme and host are lowercased, internationalized hosts IDNA-encoded
+          and default ports (``:80``, ``:443``) dropped
+        - ``www.`` variants of a host in ``canonical_hosts`` are mapped to that host
+        - percent-encoding is normalized (``col%c3%b3n``, ``col%C3%B3n`` and
+          ``colón`` are the same path), ``.``/``..`` segments are resolved and a
+          trailing slash is dropped
+        - the fragment is removed, query parameters are filtered and sorted
+
+        Args:
+            keep_params (iterable): Allow-list of query parameter names (glob patterns
+                such as ``filter_*`` allowed); every other parameter is dropped.
+                None keeps every parameter not in ``drop_params``
+            drop_params (iterable): Deny-list of parameter names, used when ``keep_params`` is None
+            canonical_hosts (iterable): Preferred spelling of hosts reachable with and without ``www.``
+            strip_trailing_slash (bool): Treat ``/path/`` and ``/path`` as the same page
+            sort_query (bool): Treat parameters in any order as the same page
+        """
+        self.keep_params = None if keep_params is None else [pattern.lower() for pattern in keep_params]
+        self.drop_params = [pattern.lower() for pattern in drop_params]
+        self.strip_trailing_slash = strip_trailing_slash
+        self.sort_query = sort_query
+        self._host_aliases = {}
+        for host in canonical_hosts:
+            self.add_canonical_host(host)
+
+    def add_canonical_host(self, host: str):
+        """Map ``host`` and its ``www.``/bare counterpart to ``host``."""
+        host = host.lower()
+        bare = host[4:] if host.startswith('www.') else host
+        self._host_aliases[bare] = host
+        self._host_aliases['www.' + bare] = host
+
+    def _keep_param(self, name: str) -> bool:
+        name = name.lower()
+        if self.keep_params is not None:
+            return any(fnmatchcase(name, pattern) for pattern in self.keep_params)
+        return not any(fnmatchcase(name, pattern) for pattern in self.drop_params)
+
+    def _host(self, parts) -> Optional[str]:
+        host = parts.hostname  # lowercased, without userinfo and port
+        if not host:
+            return None
+        if ':' in host:
+            host = f'[{host}]'  # IPv6 literal
+        else:
+            host = unquote(host).rstrip('.')
+            try:
+                host = host.encode('idna').decode('ascii')
+            except UnicodeError:
+                pass
+        host = self._host_aliases.get(host, host)
+        port = parts.port
+        if port is not None and port != DEFAULT_PORTS.get(parts.scheme.lower()):
+            host = f'{host}:{port}'
+        return host
+
+    def _path(self, path: str) -> str:
+        segments = _remove_dot_segments(path.split('/')[1:]) if path.startswith('/') else path.split('/')
+        path = '/' + '/'.join(_requote(segment, PATH_SAFE) for segment in segments)
+        if self.strip_trailing_slash and len(path) > 1:
+            path = path.rstrip('/') or '/'
+        return path
+
+    def _query(self, query: str) -> str:
+        if not query:
+            return ''
+        pairs = [(name, value) for name, value in parse_qsl(query, keep_blank_values=True) if self._keep_param(name)]
+        if self.sort_query:
+            pairs.sort()
+        return '&'.join(f"{quote(name, safe=QUERY_SAFE)}={quote(value, safe=QUERY_SAFE)}" for name, value in pairs)
+
+    def normalize(self, url: str, base: Optional[str] = None) -> Optional[str]:
+        """
+        Canonical form of ``url`` (resolved against ``base`` if given).
+
+        Returns:
+            str: The normalized URL, or None for non-HTTP(S) or malformed URLs
+        """
+        if base:
+            url = urljoin(base, url)
+        try:
+            parts = urlsplit(url.strip())
+            scheme = parts.scheme.lower()
+            if scheme not in DEFAULT_PORTS:
+                return None
+            host = self._host(parts)
+        except ValueError:
+            return None  # e.g. an invalid port
+        if host is None:
+            return None
+        query = self._query(parts.query)
+        return f"{scheme}://{host}{self._path(parts.path)}" + (f"?{query}" if query else '')
+
+    def __call__(self, url: str, base: Optional[str] = None) -> Optional[str]:
+        return self.normalize(url, base)
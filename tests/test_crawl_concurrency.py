@@ -0,0 +1,164 @@
+"""
+Stress tests of the crawl engine's claim and page budget guarantees under many workers.
+
+Pages are served by stub browsers, so no Chrome is needed:
+
+    python -m pytest tests/
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from selenium.common.exceptions import WebDriverException
+
+from src.crawler import CrawlEngine
+from src.frontier import PageBudget, VisitedSet
+from src.throttle import HostThrottle
+
+SITE = 'https://site.test'
+WORKERS = 64
+PAGES = 400
+ALIASES = 50  # pages reached under several URLs that redirect to the same final page
+
+
+def _final_url(url):
+    """Every /alias/N redirects to /page/N % ALIASES, so many workers race for the same final URL."""
+    path = url[len(SITE):]
+    if path.startswith('/alias/'):
+        return f"{SITE}/page/{int(path.rsplit('/', 1)[1]) % ALIASES}"
+    return url
+
+
+class StubDriver:
+    """Just enough of a WebDriver for ``CrawlEngine``: every page links to a few others."""
+
+    def __init__(self, failing):
+        self.failing = failing
+        self.current_url = 'about:blank'
+
+    def get(self, url):
+        time.sleep(0.001)  # let the other workers interleave
+        if url in self.failing:
+            raise WebDriverException(f"stub failure loading {url}")
+        self.current_url = _final_url(url)
+
+    def execute_script(self, script, *args):
+        number = int(self.current_url.rsplit('/', 1)[1]) if self.current_url[-1].isdigit() else 0
+        links = [f"{SITE}/page/{(number * 7 + offset) % PAGES}" for offset in range(1, 6)]
+        links += [f"{SITE}/alias/{(number * 3 + offset) % PAGES}" for offset in range(3)]
+        return {'hrefs': links, 'headings': [], 'images': []}
+
+    def execute_async_script(self, script, *args):
+        return True
+
+    def execute_cdp_cmd(self, command, params):
+        return {}
+
+    def set_script_timeout(self, seconds):
+        pass
+
+
+class StubPool:
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+
+    def checkout(self):
+        return StubDriver(self.failing)
+
+    def checkin(self, driver, discard=False):
+        pass
+
+
+def _crawl(max_links, failing=(), **options):
+    tested = Counter()
+    lock = threading.Lock()
+
+    def count_check(page, report):
+        with lock:
+            tested[page.url] += 1
+        report(page.url, "Stub", "Pass", "")
+
+    engine = CrawlEngine(
+        f"{SITE}/page/0", [count_check], StubPool(failing), max_workers=WORKERS, max_depth=50, max_links=max_links,
+        measure_savings=False, throttle=HostThrottle(rate=None, max_concurrency=WORKERS, respect_robots=False), **options
+    )
+    engine.run()
+    return engine, tested
+
+
+def test_visited_set_claims_each_url_once():
+    visited = VisitedSet()
+    urls = [f"{SITE}/page/{number % 100}" for number in range(5000)]
+    winners = Counter()
+    barrier = threading.Barrier(WORKERS)
+
+    def worker(offset):
+        barrier.wait()
+        for url in urls[offset::WORKERS]:
+            if visited.claim(url):
+                winners[url] += 1  # Counter updates are only racy for the same key, which claim prevents
+
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(WORKERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(winners) == 100
+    assert set(winners.values()) == {1}
+
+
+def test_page_budget_never_overcommits():
+    budget = PageBudget(100)
+    barrier = threading.Barrier(WORKERS)
+
+    def worker(number):
+        barrier.wait()
+        for attempt in range(50):
+            if not budget.acquire():
+                return
+            # Every third page "fails" before it is claimed and gives its slot back
+            if (number + attempt) % 3:
+                budget.commit()
+            else:
+                budget.release()
+
+    threads = [threading.Thread(target=worker, args=(number,)) for number in range(WORKERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert budget.used == 100
+    assert budget.reserved == 0
+    assert not budget.acquire()
+
+
+def test_crawl_tests_each_page_once_within_budget():
+    engine, tested = _crawl(max_links=150)
+    assert tested and set(tested.values()) == {1}
+    assert engine.budget.reserved == 0
+    assert engine.budget.used <= 150
+    assert engine.budget.used == len(tested) == engine.stats['pages']
+
+
+def test_failed_pages_release_their_slot():
+    # Above ALIASES, so no alias redirects onto a failing page
+    failing = {f"{SITE}/page/{number}" for number in range(ALIASES + 1, PAGES, 4)}
+    engine, tested = _crawl(max_links=120, failing=failing)
+    assert set(tested.values()) == {1}
+    assert not set(tested) & failing
+    assert engine.budget.reserved == 0
+    # Failed loads are released, so the budget still fills with pages that were tested
+    assert engine.budget.used == len(tested) == 120
+
+
+def test_disk_seen_sets_with_one_path_use_separate_files(tmp_path):
+    path = tmp_path / 'seen.db'
+    engine, tested = _crawl(max_links=60, seen_backend='disk', seen_options={'path': str(path)})
+    assert set(tested.values()) == {1}
+    assert engine.stats['pages'] == len(tested) == 60
+    assert (tmp_path / 'seen.frontier.db').exists() and (tmp_path / 'seen.visited.db').exists()
+    assert not path.exists()